@@ -1,19 +1,67 @@
-"""Flask application initialization module."""
+"""Flask application initialization module.
+
+Route, command and middleware modules are imported inside ``create_app``
+rather than at package import time, so code that only needs the models or
+extensions (scripts, the async app) does not pay for them. The modules that
+register session and DDL listeners stay eager: every writer needs them.
+"""
 from flask import Flask
 from config import Config
-from app.extensions import db
+from app.extensions import cache, db, events
+import app.changes
+import app.counters
 import app.models
-from app.routes import task_routes, category_routes, frontend_routes
+import app.search
+
+def create_app(test_config=None):
+    """Create and configure the Flask application.
+
+    Args:
+        test_config (dict): Settings applied over ``Config`` before any
+            extension is initialized
+    """
+    # pylint: disable=import-outside-toplevel
+    from app.assets import init_assets
+    from app.commands import register_commands
+    from app.compression import init_compression
+    from app.instrumentation import init_instrumentation
+    from app.jobs import init_jobs
+    from app.json_provider import create_json_provider
+    from app.profiler import init_profiler
+    from app.routing import REPLICA_BIND, init_routing
+    from app.routes import (category_routes, change_routes, event_routes, frontend_routes, job_routes,
+                            stats_routes, task_routes)
+    from app.sqlite_profile import configure_engine_options, install_pragmas
 
-def create_app():
-    """Create and configure the Flask application."""
     flask_app = Flask(__name__)
     flask_app.config.from_object(Config)
+    if test_config:
+        flask_app.config.update(test_config)
+    flask_app.json = create_json_provider(flask_app)
 
+    configure_engine_options(flask_app.config)
     db.init_app(flask_app)
+    with flask_app.app_context():
+        install_pragmas(db.engine, flask_app.config)
+        if REPLICA_BIND in db.engines:
+            install_pragmas(db.engines[REPLICA_BIND], flask_app.config)
+        init_instrumentation(flask_app, db.engines.values())
+    cache.init_app(flask_app)
+    events.init_app(flask_app)
 
     flask_app.register_blueprint(task_routes.bp)
     flask_app.register_blueprint(category_routes.bp)
     flask_app.register_blueprint(frontend_routes.bp)
+    flask_app.register_blueprint(stats_routes.bp)
+    flask_app.register_blueprint(change_routes.bp)
+    flask_app.register_blueprint(event_routes.bp)
+    flask_app.register_blueprint(job_routes.bp)
+
+    init_assets(flask_app)
+    init_compression(flask_app)
+    init_routing(flask_app)
+    register_commands(flask_app)
+    init_profiler(flask_app)
+    init_jobs(flask_app)
 
     return flask_app
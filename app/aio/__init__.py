@@ -0,0 +1,32 @@
+"""Async (ASGI) serving mode.
+
+Quart mirrors the Flask API, so the async blueprints reuse the validation and
+listing helpers of the sync routes while talking to the database through an
+``AsyncSession`` (aiosqlite for SQLite). Requires the packages listed in
+``requirements-async.txt``.
+"""
+from quart import Quart
+from config import Config
+from app.aio import category_routes, task_routes
+from app.aio.db import init_async_db
+from app.json_provider import create_json_provider
+
+def create_asgi_app(test_config=None):
+    """Create and configure the ASGI application.
+
+    Args:
+        test_config (dict): Settings applied over ``Config`` before the
+            database engine is created
+    """
+    asgi_app = Quart(__name__)
+    asgi_app.config.from_object(Config)
+    if test_config:
+        asgi_app.config.update(test_config)
+    asgi_app.json = create_json_provider(asgi_app)
+
+    init_async_db(asgi_app)
+
+    asgi_app.register_blueprint(task_routes.bp)
+    asgi_app.register_blueprint(category_routes.bp)
+
+    return asgi_app
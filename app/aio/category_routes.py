@@ -0,0 +1,97 @@
+"""Async category routes module."""
+from quart import Blueprint, abort, request, jsonify
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm import selectinload
+from app.aio.db import get_session
+from app.conditional import if_match_allows, loaded_state, resource_etag
+from app.counters import COUNTER_COLUMNS
+from app.models.category import Category
+from app.serialization import CATEGORY_FIELDS, select_fields
+from app.validation import parse_category
+
+bp = Blueprint('categories', __name__, url_prefix='/api/categories')
+
+async def _get_category_or_404(category_id, *options):
+    """Load a category or abort with 404."""
+    category = await get_session().get(Category, category_id, options=options)
+    if category is None:
+        abort(404)
+    return category
+
+@bp.route('/', methods=['GET'])
+async def get_categories():
+    """Get all categories."""
+    result = await get_session().execute(select_fields(Category, CATEGORY_FIELDS).order_by(Category.id))
+    return jsonify([dict(row) for row in result.mappings()])
+
+@bp.route('/<int:category_id>', methods=['GET'])
+async def get_category(category_id):
+    """Get a specific category, with the ETag ``If-Match`` writes compare against."""
+    category = await _get_category_or_404(category_id)
+    response = jsonify(category.to_dict())
+    response.set_etag(resource_etag(loaded_state(category, *COUNTER_COLUMNS), request.path))
+    return response
+
+@bp.route('/', methods=['POST'])
+async def create_category():
+    """Create a new category."""
+    fields, error = parse_category(await request.get_json())
+    if error:
+        return jsonify({'error': error}), 400
+
+    session = get_session()
+    category = Category(**fields)
+    try:
+        session.add(category)
+        await session.commit()
+        return jsonify(category.to_dict()), 201
+    except IntegrityError:
+        await session.rollback()
+        return jsonify({'error': 'Category name must be unique'}), 400
+
+@bp.route('/<int:category_id>', methods=['PUT'])
+async def update_category(category_id):
+    """Update a category, honouring ``If-Match`` like the sync route."""
+    category = await _get_category_or_404(category_id)
+    if not if_match_allows(request.if_match, request.path, loaded_state(category, *COUNTER_COLUMNS)):
+        return jsonify({'error': 'Precondition failed'}), 412
+    fields, error = parse_category(await request.get_json(), partial=True)
+    if error:
+        return jsonify({'error': error}), 400
+
+    for key, value in fields.items():
+        setattr(category, key, value)
+
+    session = get_session()
+    try:
+        await session.commit()
+        response = jsonify(category.to_dict())
+        response.set_etag(resource_etag(loaded_state(category, *COUNTER_COLUMNS), request.path))
+        return response
+    except IntegrityError:
+        await session.rollback()
+        return jsonify({'error': 'Category name must be unique'}), 400
+    except StaleDataError:
+        await session.rollback()
+        return jsonify({'error': 'Category was modified concurrently'}), 409
+
+@bp.route('/<int:category_id>', methods=['DELETE'])
+async def delete_category(category_id):
+    """Delete a category, honouring ``If-Match`` like the sync route."""
+    # Tasks are loaded up front: the ORM detaches them on delete and lazy
+    # loading is not available under asyncio
+    category = await _get_category_or_404(category_id, selectinload(Category.tasks))
+    if not if_match_allows(request.if_match, request.path, loaded_state(category, *COUNTER_COLUMNS)):
+        return jsonify({'error': 'Precondition failed'}), 412
+    session = get_session()
+    try:
+        await session.delete(category)
+        await session.commit()
+        return '', 204
+    except IntegrityError:
+        await session.rollback()
+        return jsonify({'error': 'Cannot delete category with associated tasks'}), 400
+    except StaleDataError:
+        await session.rollback()
+        return jsonify({'error': 'Category was modified concurrently'}), 409
@@ -0,0 +1,50 @@
+"""Async database engine and per-request sessions."""
+from quart import current_app, g
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from app.sqlite_profile import configure_engine_options, install_pragmas
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg'
+}
+
+def async_database_url(uri):
+    """Return ``uri`` with its driver switched to the async equivalent."""
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[backend])
+    return url
+
+def init_async_db(asgi_app):
+    """Create the async engine and session factory for ``asgi_app``."""
+    config = asgi_app.config
+    configure_engine_options(config)
+    url = async_database_url(config['SQLALCHEMY_DATABASE_URI'])
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        # Every session must see the same in-memory database
+        options['poolclass'] = StaticPool
+
+    engine = create_async_engine(url, **options)
+    install_pragmas(engine.sync_engine, config)
+    asgi_app.extensions['async_engine'] = engine
+    asgi_app.extensions['async_session'] = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asgi_app.teardown_appcontext
+    async def close_session(_exception):
+        session = g.pop('async_session', None)
+        if session is not None:
+            await session.close()
+
+    @asgi_app.after_serving
+    async def dispose_engine():
+        await engine.dispose()
+
+def get_session():
+    """Return the current request's AsyncSession, opening it on first use."""
+    if 'async_session' not in g:
+        g.async_session = current_app.extensions['async_session']()
+    return g.async_session
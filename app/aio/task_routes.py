@@ -0,0 +1,118 @@
+"""Async task routes module."""
+from quart import Blueprint, abort, current_app, request, jsonify, url_for
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from app.aio.db import get_session
+from app.conditional import if_match_allows, resource_etag
+from app.listing import listing_clauses, next_page_headers, page_limit
+from app.models.category import Category
+from app.models.task import Task
+from app.serialization import TASK_FIELDS, select_fields
+from app.validation import parse_task
+
+bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
+
+async def _get_task_or_404(task_id):
+    """Load a task or abort with 404."""
+    task = await get_session().get(Task, task_id)
+    if task is None:
+        abort(404)
+    return task
+
+async def _category_exists(category_id):
+    """Return True if ``category_id`` is None or an existing category."""
+    if category_id is None:
+        return True
+    found = await get_session().scalar(select(Category.id).where(Category.id == category_id))
+    return found is not None
+
+@bp.route('/', methods=['GET'])
+async def get_tasks():
+    """Get a page of tasks ordered by (created_at, id)."""
+    limit = page_limit(request.args, current_app.config)
+    clauses, error = listing_clauses(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+
+    result = await get_session().execute(
+        select_fields(Task, TASK_FIELDS)
+        .where(*clauses)
+        .order_by(Task.created_at, Task.id)
+        .limit(limit + 1)
+    )
+    tasks = [dict(row) for row in result.mappings()]
+
+    response = jsonify(tasks[:limit])
+    response.headers.update(next_page_headers(tasks, limit, request.args, url_for, endpoint='tasks.get_tasks'))
+    return response
+
+@bp.route('/<int:task_id>', methods=['GET'])
+async def get_task(task_id):
+    """Get a specific task, with the ETag ``If-Match`` writes compare against."""
+    task = await _get_task_or_404(task_id)
+    response = jsonify(task.to_dict())
+    response.set_etag(resource_etag(task.version, request.path))
+    return response
+
+@bp.route('/', methods=['POST'])
+async def create_task():
+    """Create a new task."""
+    fields, error = parse_task(await request.get_json())
+    if error:
+        return jsonify({'error': error}), 400
+    if not await _category_exists(fields['category_id']):
+        return jsonify({'error': 'Invalid category ID'}), 400
+
+    session = get_session()
+    task = Task(**fields)
+    try:
+        session.add(task)
+        await session.commit()
+        return jsonify(task.to_dict()), 201
+    except IntegrityError:
+        await session.rollback()
+        return jsonify({'error': 'Database error'}), 400
+
+@bp.route('/<int:task_id>', methods=['PUT'])
+async def update_task(task_id):
+    """Update a task, honouring ``If-Match`` like the sync route."""
+    task = await _get_task_or_404(task_id)
+    if not if_match_allows(request.if_match, request.path, task.version):
+        return jsonify({'error': 'Precondition failed'}), 412
+    fields, error = parse_task(await request.get_json(), partial=True)
+    if error:
+        return jsonify({'error': error}), 400
+    if not await _category_exists(fields.get('category_id')):
+        return jsonify({'error': 'Invalid category ID'}), 400
+
+    for key, value in fields.items():
+        setattr(task, key, value)
+
+    session = get_session()
+    try:
+        await session.commit()
+        response = jsonify(task.to_dict())
+        response.set_etag(resource_etag(task.version, request.path))
+        return response
+    except IntegrityError:
+        await session.rollback()
+        return jsonify({'error': 'Invalid category ID'}), 400
+    except StaleDataError:
+        await session.rollback()
+        return jsonify({'error': 'Task was modified concurrently'}), 409
+
+@bp.route('/<int:task_id>', methods=['DELETE'])
+async def delete_task(task_id):
+    """Delete a task, honouring ``If-Match`` like the sync route."""
+    task = await _get_task_or_404(task_id)
+    if not if_match_allows(request.if_match, request.path, task.version):
+        return jsonify({'error': 'Precondition failed'}), 412
+    session = get_session()
+    try:
+        await session.delete(task)
+        await session.commit()
+    except StaleDataError:
+        await session.rollback()
+        return jsonify({'error': 'Task was modified concurrently'}), 409
+    return '', 204
@@ -0,0 +1,130 @@
+"""Content-hashed static assets with precompressed variants.
+
+At startup every file in the static folder is hashed and copied to
+``ASSETS_BUILD_DIR`` as ``<name>.<hash>.<ext>``, next to ``.gz`` (and
+``.br`` when brotli is installed) variants of the text files. Since a
+changed file gets a new name, ``url_for('static', ...)`` resolves to the
+hashed name and those URLs are served with a far-future, immutable
+``Cache-Control``. Build outputs are named by content, so restarts only
+write files that changed. Files absent at startup (an unbuilt stylesheet)
+keep their plain URL and Flask's default handling.
+"""
+import hashlib
+import mimetypes
+import os
+from flask import current_app, request, send_from_directory
+from app.compression import available_encodings, compress, is_compressible, negotiate_encoding
+
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+class AssetManifest:
+    """Mapping between static filenames and their built, hashed copies."""
+
+    def __init__(self, build_dir):
+        self.build_dir = build_dir
+        self.hashed = {}
+        self.encodings = {}
+
+    def url_name(self, filename):
+        """Return the hashed name for ``filename``, or the name unchanged."""
+        return self.hashed.get(filename, filename)
+
+def _write_once(path, data):
+    """Write ``data`` to ``path`` unless it exists, replacing atomically."""
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _write_variants(path, data, encodings, level, brotli_quality):
+    """Write the precompressed variants of the file at ``path`` holding ``data``.
+
+    Returns:
+        tuple: The encodings with a variant; one that would not be smaller
+        than ``data`` is skipped
+    """
+    available = []
+    for encoding in encodings:
+        variant = path + SUFFIXES[encoding]
+        if not os.path.exists(variant):
+            body = compress(data, encoding, level, brotli_quality)
+            if len(body) >= len(data):
+                continue
+            _write_once(variant, body)
+        available.append(encoding)
+    return tuple(available)
+
+def build_assets(static_folder, build_dir, encodings, level=9, brotli_quality=11):
+    """Hash and precompress every file under ``static_folder``.
+
+    Args:
+        static_folder (str): Source directory
+        build_dir (str): Output directory for hashed files and variants
+        encodings (iterable): Content codings to precompress text files with
+        level (int): gzip compression level
+        brotli_quality (int): brotli quality
+
+    Returns:
+        AssetManifest: The filename mapping and available variants
+    """
+    manifest = AssetManifest(build_dir)
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            path = os.path.join(root, name)
+            filename = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            stem, ext = os.path.splitext(filename)
+            hashed = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+            target = os.path.join(build_dir, hashed)
+            _write_once(target, data)
+
+            if is_compressible(mimetypes.guess_type(filename)[0]):
+                available = _write_variants(target, data, encodings, level, brotli_quality)
+            else:
+                available = ()
+
+            manifest.hashed[filename] = hashed
+            manifest.encodings[hashed] = available
+    return manifest
+
+def serve_static(filename):
+    """Serve a static file, preferring a hashed build and a precompressed variant."""
+    manifest = current_app.extensions['assets']
+    if filename not in manifest.encodings:
+        return current_app.send_static_file(filename)
+
+    encodings = manifest.encodings[filename]
+    encoding = negotiate_encoding(request.accept_encodings, encodings) if encodings else None
+    response = send_from_directory(
+        manifest.build_dir,
+        filename + SUFFIXES[encoding] if encoding else filename,
+        mimetype=mimetypes.guess_type(filename)[0],
+        max_age=current_app.config['ASSETS_MAX_AGE']
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if encodings:
+        response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+def init_assets(flask_app):
+    """Build hashed static assets and route ``url_for('static')`` to them if enabled."""
+    config = flask_app.config
+    if not config['ASSETS_HASHED'] or not flask_app.has_static_folder:
+        return
+
+    manifest = build_assets(flask_app.static_folder, config['ASSETS_BUILD_DIR'], available_encodings())
+    flask_app.extensions['assets'] = manifest
+    flask_app.view_functions['static'] = serve_static
+
+    @flask_app.url_defaults
+    def hashed_static_url(endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = manifest.url_name(values['filename'])
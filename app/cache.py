@@ -0,0 +1,253 @@
+"""Response cache with tag-based invalidation.
+
+Cached entries are keyed by request path plus the current version of every
+tag the entry depends on (``tasks``, ``task:<id>``, ``categories``, ...).
+Mutation handlers bump the versions of the tags they touch, so stale entries
+are never served again and simply age out of the backend. Rendered template
+fragments (``Cache.fragment``) are versioned by the same tags. Requests
+reading from a replica (``app/routing.py``) also key on the replica's change
+cursor, since a lagging replica may not yet hold the tagged versions. Views
+behind ``conditional`` key on their ETag state too: tags are bumped just
+after a commit, and in between a fresh ETag must not be paired with the
+previous body, or an ``If-Match`` write based on it would pass.
+"""
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, g, has_request_context, request
+from markupsafe import Markup
+
+class LRUBackend:
+    """In-process LRU cache with a per-entry TTL and a bounded size."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for ``key`` or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store ``value`` under ``key``, evicting the least recently used entries."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key):
+        """Increment a counter; counters are never evicted."""
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def get_counters(self, keys):
+        """Return the current value of each counter in ``keys``."""
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def clear(self):
+        """Drop every entry and counter."""
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisBackend:
+    """Shared cache backend for multiple workers.
+
+    ``client`` is anything implementing the redis-py ``get``/``set``/
+    ``incr``/``mget``/``scan_iter``/``delete`` calls, so a local stand-in
+    can replace a real server.
+    """
+
+    name = 'redis'
+
+    def __init__(self, client, ttl=60, prefix='todo:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        """Return the cached value for ``key`` or None."""
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value):
+        """Store ``value`` under ``key`` with the configured TTL."""
+        self.client.set(self.prefix + key, value, ex=self.ttl or None)
+
+    def incr(self, key):
+        """Increment a counter."""
+        return self.client.incr(self.prefix + key)
+
+    def get_counters(self, keys):
+        """Return the current value of each counter in ``keys``."""
+        if not keys:
+            return []
+        return [int(value or 0) for value in self.client.mget([self.prefix + key for key in keys])]
+
+    def clear(self):
+        """Drop every key under the prefix."""
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+def create_backend(config):
+    """Build the cache backend selected by ``CACHE_BACKEND``.
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = config['CACHE_BACKEND']
+    if backend in (None, '', 'null'):
+        return None
+    if backend == 'memory':
+        return LRUBackend(config['CACHE_MAX_ENTRIES'], config['CACHE_TTL'])
+    if backend == 'redis':
+        import redis  # pylint: disable=import-outside-toplevel,import-error
+        return RedisBackend(redis.Redis.from_url(config['CACHE_REDIS_URL']), config['CACHE_TTL'])
+    raise ValueError(f'Unknown CACHE_BACKEND: {backend}')
+
+class _CacheState:
+    """Per-application backend and hit/miss counters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def record(self, hit):
+        """Count a cache hit or miss."""
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+class Cache:
+    """Flask extension caching GET responses."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Attach a backend built from the app config."""
+        app.extensions['cache'] = _CacheState(create_backend(app.config))
+
+    @property
+    def state(self):
+        """The cache state of the current application."""
+        return current_app.extensions['cache']
+
+    def cached(self, tags, unless=None):
+        """Cache successful, non-streamed responses of a view.
+
+        Args:
+            tags (callable): Called with the view arguments; returns the tags
+                the response depends on
+            unless (callable): Skip the cache when it returns True
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(**kwargs):
+                state = self.state
+                if state.backend is None or (unless is not None and unless()):
+                    return view(**kwargs)
+
+                key = self._versioned_key('resp:' + request.full_path, tags(**kwargs))
+
+                payload = state.backend.get(key)
+                if payload is not None:
+                    state.record(hit=True)
+                    entry = json.loads(payload)
+                    response = current_app.response_class(entry['body'], headers=entry['headers'])
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                state.record(hit=False)
+                response = current_app.make_response(view(**kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    headers = [(name, value) for name, value in response.headers.items()
+                               if name != 'Content-Length']
+                    state.backend.set(key, json.dumps({
+                        'body': response.get_data(as_text=True),
+                        'headers': headers
+                    }).encode())
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def _versioned_key(self, prefix, tags):
+        """Return ``prefix`` qualified by the current version of every tag."""
+        tags = sorted(tags)
+        versions = self.state.backend.get_counters([f'tag:{tag}' for tag in tags])
+        key = prefix + ':' + ','.join(f'{tag}={version}' for tag, version in zip(tags, versions))
+        if has_request_context():
+            if 'replica_cursor' in g:
+                key += f'@replica={g.replica_cursor}'
+            if 'etag_state' in g:
+                key += f'@state={g.etag_state}'
+        return key
+
+    def fragment(self, name, tags, render):
+        """Return rendered markup, cached until one of ``tags`` is invalidated.
+
+        Args:
+            name (str): Fragment name, unique per page and variant
+            tags (list): Tags the fragment's data depends on
+            render (callable): Builds the markup on a miss
+        """
+        state = self.state
+        if state.backend is None:
+            return Markup(render())
+        key = self._versioned_key('frag:' + name, tags)
+        markup = state.backend.get(key)
+        if markup is not None:
+            state.record(hit=True)
+            return Markup(markup.decode())
+        state.record(hit=False)
+        markup = str(render())
+        state.backend.set(key, markup.encode())
+        return Markup(markup)
+
+    def invalidate(self, *tags):
+        """Bump the version of each tag, orphaning every entry that depends on it."""
+        backend = self.state.backend
+        if backend is None:
+            return
+        for tag in tags:
+            backend.incr(f'tag:{tag}')
+
+    def stats(self):
+        """Return hit/miss counters for the current application."""
+        state = self.state
+        lookups = state.hits + state.misses
+        return {
+            'backend': state.backend.name if state.backend is not None else None,
+            'entries': len(state.backend) if isinstance(state.backend, LRUBackend) else None,
+            'hits': state.hits,
+            'misses': state.misses,
+            'hit_ratio': state.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,143 @@
+"""Change log recording and reading.
+
+Every task and category write appends a ``Change`` row in the same
+transaction: ORM writes are picked up by flush hooks, the bulk endpoints
+call ``record_changes`` themselves. Clients replay the log from a cursor
+with ``changes_since`` to keep a local replica without reloading the full
+dataset, and committed changes are pushed to the event hub (app/events.py).
+"""
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import Session
+from app.extensions import db, events
+from app.models.category import Category
+from app.models.change import DELETE, UPSERT, Change
+from app.models.task import Task
+from app.serialization import CATEGORY_FIELDS, TASK_FIELDS, fetch_dicts, select_fields
+
+ENTITIES = {
+    'task': (Task, TASK_FIELDS),
+    'category': (Category, CATEGORY_FIELDS)
+}
+change_table = Change.__table__
+
+def _entity_name(obj):
+    if isinstance(obj, Task):
+        return 'task'
+    if isinstance(obj, Category):
+        return 'category'
+    return None
+
+def record_changes(session, entity, ids, op=UPSERT):
+    """Append one change row per id to the log in ``session``'s transaction.
+
+    Args:
+        session: Session whose transaction the rows belong to
+        entity (str): ``'task'`` or ``'category'``
+        ids: Ids of the written rows
+        op (str): ``UPSERT`` or ``DELETE``
+    """
+    now = datetime.utcnow()
+    rows = [{'entity': entity, 'entity_id': entity_id, 'op': op, 'created_at': now} for entity_id in ids]
+    if rows:
+        change_ids = session.connection().scalars(
+            insert(change_table).returning(change_table.c.id, sort_by_parameter_order=True), rows
+        ).all()
+        session.info.setdefault('pending_events', []).extend(
+            {'id': change_id, 'entity': entity, 'entity_id': row['entity_id'], 'op': op}
+            for change_id, row in zip(change_ids, rows)
+        )
+
+@event.listens_for(Session, 'after_commit')
+def publish_committed(session):
+    """Push the changes of a committed transaction to event subscribers."""
+    pending = session.info.pop('pending_events', None)
+    # The async app has no event hub
+    if pending and has_app_context() and 'events' in current_app.extensions:
+        events.publish(pending)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_uncommitted(session):
+    """Forget the events of a rolled back transaction."""
+    session.info.pop('pending_events', None)
+
+@event.listens_for(Session, 'before_flush')
+def track_detached_tasks(session, _flush_context, _instances):
+    """Log the tasks a category delete is about to detach.
+
+    Their ids are also kept in ``session.info['detached_tasks']`` so their
+    cached reads are invalidated on commit (see app/counters.py).
+    """
+    category_ids = [obj.id for obj in session.deleted if isinstance(obj, Category)]
+    if category_ids:
+        task_ids = session.connection().scalars(
+            select(Task.id).where(Task.category_id.in_(category_ids))
+        ).all()
+        record_changes(session, 'task', task_ids)
+        session.info.setdefault('detached_tasks', set()).update(task_ids)
+
+@event.listens_for(Session, 'after_flush')
+def track_flush(session, _flush_context):
+    """Log the tasks and categories written by a flush."""
+    written = {}
+    for obj in list(session.new) + [obj for obj in session.dirty if session.is_modified(obj)]:
+        entity = _entity_name(obj)
+        if entity:
+            written.setdefault((entity, UPSERT), []).append(obj.id)
+    for obj in session.deleted:
+        entity = _entity_name(obj)
+        if entity:
+            written.setdefault((entity, DELETE), []).append(obj.id)
+    for (entity, op), ids in written.items():
+        record_changes(session, entity, ids, op)
+
+def current_cursor():
+    """Return the id of the latest change, or 0 when the log is empty."""
+    return db.session.scalar(select(change_table.c.id).order_by(change_table.c.id.desc()).limit(1)) or 0
+
+def changes_since(since, limit, entity=None):
+    """Return the changes after cursor ``since``, collapsed per row.
+
+    Only the latest change of each row within the page is returned, with the
+    row's current data for upserts, so a burst of edits to one task costs one
+    entry.
+
+    Args:
+        since (int): Cursor from a previous call; 0 replays the whole log
+        limit (int): Maximum number of log rows to consume
+        entity (str): Only return changes of this entity
+
+    Returns:
+        tuple: ``(changes, cursor, has_more)``
+    """
+    statement = select(change_table).where(change_table.c.id > since)
+    if entity is not None:
+        statement = statement.where(change_table.c.entity == entity)
+    log = db.session.execute(statement.order_by(change_table.c.id).limit(limit + 1)).all()
+    has_more = len(log) > limit
+    log = log[:limit]
+
+    latest = {}
+    for change in log:
+        latest.pop((change.entity, change.entity_id), None)
+        latest[(change.entity, change.entity_id)] = change
+
+    data = {}
+    for name, (model, fields) in ENTITIES.items():
+        ids = [entity_id for (kind, entity_id), change in latest.items() if kind == name and change.op == UPSERT]
+        if ids:
+            rows = fetch_dicts(select_fields(model, fields).where(model.id.in_(ids)))
+            data.update(((name, row['id']), row) for row in rows)
+
+    changes = []
+    for key, change in latest.items():
+        entry = {'id': change.id, 'entity': change.entity, 'entity_id': change.entity_id, 'op': change.op}
+        if change.op == UPSERT:
+            if key not in data:
+                # Deleted after this page; the tombstone comes later in the log
+                continue
+            entry['data'] = data[key]
+        changes.append(entry)
+    cursor = log[-1].id if log else since
+    return changes, cursor, has_more
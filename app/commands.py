@@ -0,0 +1,97 @@
+"""Flask CLI commands module."""
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app.counters import ensure_counter_columns, rebuild_due_days, reconcile_category_counts
+from app.importer import FORMATS, import_tasks, iter_records
+from app.jobs import Worker
+from app.migrations import current_version, latest_version, schema_ddl, upgrade_database
+from app.search import rebuild_search_index
+
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """Create the task full-text index if missing and rebuild it."""
+    rebuild_search_index()
+    click.echo('Search index rebuilt.')
+
+@click.command('db-upgrade')
+@with_appcontext
+def db_upgrade_command():
+    """Apply pending schema migrations."""
+    applied = upgrade_database()
+    if applied:
+        click.echo(f'Schema upgraded to version {applied[-1]}.')
+    else:
+        click.echo(f'Schema is up to date (version {current_version()} of {latest_version()}).')
+
+@click.command('db-schema')
+@click.option('--dialect', default='postgresql', show_default=True,
+              help='Database URL or dialect name to render the schema for.')
+@with_appcontext
+def db_schema_command(dialect):
+    """Print the DDL that provisions an empty database."""
+    for statement in schema_ddl(dialect):
+        click.echo(statement + ';\n')
+
+@click.command('reconcile-category-counts')
+@with_appcontext
+def reconcile_category_counts_command():
+    """Recompute the per-category task counters from the task table."""
+    ensure_counter_columns()
+    drifted = reconcile_category_counts()
+    click.echo(f'Reconciled task counters; {drifted} categories had drifted.')
+
+@click.command('rebuild-due-days')
+@with_appcontext
+def rebuild_due_days_command():
+    """Recompute the per-day due-date counters from the task table."""
+    days = rebuild_due_days()
+    click.echo(f'Rebuilt due-date counters for {days} days.')
+
+@click.command('jobs-worker')
+@click.option('--threads', default=1, show_default=True, help='Number of worker threads.')
+@click.option('--burst', is_flag=True, help='Exit once the queue is empty.')
+@with_appcontext
+def jobs_worker_command(threads, burst):
+    """Run background jobs from the queue."""
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    worker = Worker(app, threads, app.config['JOBS_POLL_INTERVAL'])
+    click.echo(f'Job worker started with {threads} thread(s).')
+    worker.start(burst=burst)
+    try:
+        worker.join()
+    except KeyboardInterrupt:
+        worker.stop()
+        worker.join()
+    click.echo('Job worker stopped.')
+
+@click.command('import-tasks')
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS),
+              help='Input format; defaults to the file extension.')
+@click.option('--batch-size', type=int, help='Rows per insert batch.')
+@with_appcontext
+def import_tasks_command(source, fmt, batch_size):
+    """Import tasks from a CSV or NDJSON file ('-' reads stdin)."""
+    fmt = fmt or ('csv' if source.name.endswith('.csv') else 'ndjson')
+
+    def progress(report):
+        click.echo(f'{report["imported"]} rows ({report["rows_per_sec"]:.0f} rows/sec)', err=True)
+
+    report = import_tasks(iter_records(source, fmt), batch_size, progress)
+    for error in report['errors']:
+        click.echo(f'line {error["line"]}: {error["error"]}', err=True)
+    click.echo(f'Imported {report["imported"]} tasks, skipped {report["skipped"]}, '
+               f'created {report["categories_created"]} categories in {report["seconds"]}s '
+               f'({report["rows_per_sec"]:.0f} rows/sec).')
+
+def register_commands(flask_app):
+    """Register CLI commands on the application."""
+    flask_app.cli.add_command(db_upgrade_command)
+    flask_app.cli.add_command(db_schema_command)
+    flask_app.cli.add_command(rebuild_search_index_command)
+    flask_app.cli.add_command(reconcile_category_counts_command)
+    flask_app.cli.add_command(rebuild_due_days_command)
+    flask_app.cli.add_command(jobs_worker_command)
+    flask_app.cli.add_command(import_tasks_command)
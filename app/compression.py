@@ -0,0 +1,99 @@
+"""Negotiated gzip/brotli compression of API and page responses.
+
+Bodies of at least ``COMPRESS_MIN_SIZE`` bytes with a text mimetype are
+encoded with the best coding the client accepts: brotli when the optional
+``brotli`` package is installed, otherwise gzip. Streamed responses (NDJSON
+exports, the event stream) and file responses are passed through untouched.
+
+Compressed bodies are kept in a small LRU keyed by the response ETag, or by
+a digest of the body when there is none, so a response that the ETag or the
+response cache already identifies as unchanged is not compressed again. The
+compressed representation carries a weak ETag, as its bytes differ from the
+identity one.
+"""
+import gzip
+import hashlib
+from flask import request
+from app.cache import LRUBackend
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/javascript',
+    'application/json',
+    'image/svg+xml',
+    'text/css',
+    'text/csv',
+    'text/html',
+    'text/javascript',
+    'text/plain'
+})
+
+def available_encodings():
+    """Return the content codings this process can produce, preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def negotiate_encoding(accept_encodings, encodings):
+    """Pick the coding from ``encodings`` the client rates highest, or None.
+
+    Args:
+        accept_encodings (werkzeug.datastructures.Accept): Parsed
+            ``Accept-Encoding`` header
+        encodings (iterable): Codings on offer, preferred first for ties
+    """
+    return accept_encodings.best_match(list(encodings))
+
+def compress(data, encoding, level=6, brotli_quality=5):
+    """Return ``data`` encoded with ``encoding`` ('gzip' or 'br')."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+def is_compressible(mimetype):
+    """Return True if bodies of ``mimetype`` are worth compressing."""
+    return mimetype in COMPRESSIBLE_MIMETYPES
+
+def init_compression(flask_app):
+    """Register the response compression hook on ``flask_app`` if enabled."""
+    config = flask_app.config
+    if not config['COMPRESS_ENABLED']:
+        return
+
+    encodings = available_encodings()
+    min_size = config['COMPRESS_MIN_SIZE']
+    level = config['COMPRESS_LEVEL']
+    brotli_quality = config['COMPRESS_BROTLI_QUALITY']
+    compressed_bodies = LRUBackend(config['COMPRESS_CACHE_ENTRIES'], ttl=0)
+    flask_app.extensions['compression'] = compressed_bodies
+
+    @flask_app.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or not is_compressible(response.mimetype)):
+            return response
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding(request.accept_encodings, encodings)
+        if encoding is None:
+            return response
+
+        etag, _ = response.get_etag()
+        key = f'{encoding}:{etag or hashlib.blake2b(data, digest_size=16).hexdigest()}'
+        body = compressed_bodies.get(key)
+        if body is None:
+            body = compress(data, encoding, level, brotli_quality)
+            compressed_bodies.set(key, body)
+        if len(body) >= len(data):
+            return response
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
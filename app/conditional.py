@@ -0,0 +1,159 @@
+"""Conditional requests with strong ETags.
+
+ETags are derived from cheap version queries (the row ``version``, plus any
+columns written outside the unit of work such as the category counters, or
+a collection-level count, ``max(updated_at)`` and latest change id), so a
+matching ``If-None-Match`` is answered with 304 before any rows are
+serialized.
+
+Writes to a single task or category honour ``If-Match`` with the ETag a GET
+of the resource returned, so a client editing a stale copy gets 412 instead
+of overwriting someone else's change. The row versions are the models'
+``version_id_col``: ORM updates and deletes match on the version and bump
+it, so a write racing another commit between its read and its UPDATE
+raises StaleDataError, which the routes answer with 409.
+"""
+import functools
+import hashlib
+from flask import current_app, g, jsonify, request
+from sqlalchemy import func, select
+from app.extensions import db
+from app.models.change import Change
+
+def collection_version(model):
+    """Return a snapshot identifying the current contents of a table.
+
+    Besides the row count and ``max(updated_at)`` it covers the table's
+    latest change-log entry, which also follows writes that leave
+    ``updated_at`` alone, such as the category counters.
+    """
+    last_change = (
+        select(func.max(Change.id)).where(Change.entity == model.__tablename__).scalar_subquery()
+    )
+    count, last_updated, change_id = db.session.execute(
+        select(func.count(model.id), func.max(model.updated_at), last_change)
+    ).one()
+    return f'{count}:{last_updated.isoformat() if last_updated else ""}:{change_id or 0}'
+
+def row_state(*values):
+    """Return the ETag state of one row from its version and extra column values."""
+    return ':'.join(str(value) for value in values)
+
+def loaded_state(row, *columns):
+    """Return the ``row_state`` of a loaded row, matching ``row_version`` with the same columns."""
+    return row_state(row.version, *(getattr(row, column.key) for column in columns))
+
+def row_version(model, row_id, *columns):
+    """Return a snapshot identifying one row, or None if it does not exist.
+
+    Args:
+        model: Versioned model class
+        row_id (int): Primary key of the row
+        *columns: Columns the snapshot covers besides ``version``, for
+            values Core writes change without bumping it
+    """
+    row = db.session.execute(select(model.version, *columns).where(model.id == row_id)).first()
+    return row_state(*row) if row is not None else None
+
+def stored_versions(model, ids):
+    """Return ``{id: version}`` for the rows of ``model`` among ``ids``."""
+    return dict(db.session.execute(select(model.id, model.version).where(model.id.in_(ids))).all())
+
+def apply_versions(rows, versions):
+    """Give each bulk UPDATE row the version it expects to overwrite.
+
+    The ORM matches bulk updates of versioned models on the version too.
+    Rows naming a ``version`` keep it; the others expect the stored one,
+    advanced past earlier rows for the same id.
+
+    Args:
+        rows (list): UPDATE parameters, each with an ``id``
+        versions (dict): Stored versions from ``stored_versions``
+    """
+    versions = dict(versions)
+    for row in rows:
+        row.setdefault('version', versions[row['id']])
+        versions[row['id']] = row['version'] + 1
+    return rows
+
+def stale_ids(rows, versions):
+    """Return the ids of ``rows`` that ``apply_versions`` could not write.
+
+    These are rows whose task no longer exists, and rows naming a
+    ``version`` other than the one they would overwrite.
+
+    Args:
+        rows (list): UPDATE parameters, each with an ``id``
+        versions (dict): Stored versions from ``stored_versions``
+    """
+    versions = dict(versions)
+    stale = []
+    for row in rows:
+        expected = versions.get(row['id'])
+        version = row.get('version', expected)
+        if expected is None or version != expected:
+            stale.append(row['id'])
+        else:
+            versions[row['id']] = version + 1
+    return stale
+
+def make_etag(state, full_path=None):
+    """Return the ETag of the representation at ``full_path`` (the current request's by default)."""
+    return hashlib.sha1(f'{full_path or request.full_path}|{state}'.encode()).hexdigest()
+
+def resource_etag(state, path=None):
+    """Return the ETag a plain GET of ``path`` (the current request's by default) has at row ``state``."""
+    # full_path of a request without a query string
+    return make_etag(str(state), (path or request.path) + '?')
+
+def if_match_allows(if_match, path, state):
+    """Return True if an ``If-Match`` header allows writing the row at ``path`` in ``state``.
+
+    Framework neutral, for the async routes. A weakly compared match is
+    accepted: responses only carry weak ETags when they were compressed,
+    which does not change the row they describe.
+
+    Args:
+        if_match: The request's parsed ``If-Match`` header
+        path (str): Path of the resource
+        state: The row's version, or its ``row_state`` when its ETag covers
+            more columns
+    """
+    return not if_match or if_match.star_tag or if_match.contains_weak(resource_etag(state, path))
+
+def precondition_failed(state):
+    """Return a 412 response unless ``If-Match`` allows writing the row at ``state``."""
+    if if_match_allows(request.if_match, request.path, state):
+        return None
+    return jsonify({'error': 'Precondition failed'}), 412
+
+def conditional(version, unless=None):
+    """Answer matching ``If-None-Match`` requests with 304 Not Modified.
+
+    Args:
+        version (callable): Called with the view arguments; returns a string
+            that changes whenever the response would, or None to skip
+        unless (callable): Bypass conditional handling when it returns True
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            if unless is not None and unless():
+                return view(**kwargs)
+            state = version(**kwargs)
+            if state is None:
+                return view(**kwargs)
+
+            etag = make_etag(state)
+            g.etag_state = state
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(**kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,238 @@
+"""Denormalized per-category task counters and per-day due-date buckets.
+
+``Category.task_count`` and ``Category.open_task_count``, and the same two
+counts per due day in ``DueDay``, are kept current in the same transaction
+as the task write that changes them: ORM writes are tracked by a
+``before_flush`` hook, and the bulk endpoints, which bypass the unit of
+work, report their changes through the ``track_bulk_*`` helpers.
+Counter moves leave ``Category.updated_at`` alone; they are logged as
+category changes, which is what the collection ETag follows instead.
+Categories whose counters moved, and tasks detached from a deleted category,
+have their cached reads invalidated once the transaction commits. ``reconcile_category_counts`` and ``rebuild_due_days``
+recompute the counters from the task table to repair any drift, e.g. after
+writes made outside the application.
+"""
+from collections import defaultdict
+from flask import has_app_context
+from sqlalchemy import bindparam, case, delete, event, func, insert, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.changes import record_changes
+from app.extensions import cache, db
+from app.models.category import Category
+from app.models.due_day import DueDay
+from app.models.task import COMPLETED_STATUS, Task
+
+category_table = Category.__table__
+due_day_table = DueDay.__table__
+task_table = Task.__table__
+
+# Written by Core UPDATEs that leave ``Category.version`` alone, so a
+# category's ETag covers them too
+COUNTER_COLUMNS = (Category.task_count, Category.open_task_count)
+
+# Dialects that can add to an existing bucket with INSERT ... ON CONFLICT
+UPSERT_DIALECTS = {'sqlite': sqlite, 'postgresql': postgresql}
+
+class CounterDeltas:
+    """Accumulated counter changes per category and per due day."""
+
+    def __init__(self):
+        self.deltas = defaultdict(lambda: [0, 0])
+        self.day_deltas = defaultdict(lambda: [0, 0])
+
+    def add(self, category_id, status, due_date, sign):
+        """Count a task with ``category_id``, ``status`` and ``due_date`` in (+1) or out (-1)."""
+        is_open = status != COMPLETED_STATUS
+        for key, deltas in ((category_id, self.deltas), (due_date and due_date.date(), self.day_deltas)):
+            if key is None:
+                continue
+            delta = deltas[key]
+            delta[0] += sign
+            if is_open:
+                delta[1] += sign
+
+    def move(self, old, new):
+        """Count a task moving from ``old`` to ``new`` (category_id, status, due_date) values."""
+        if old != new:
+            self.add(*old, -1)
+            self.add(*new, 1)
+
+    def apply(self, session):
+        """Apply the accumulated deltas with one executemany UPDATE in ``session``."""
+        rows = [
+            {'category': category_id, 'tasks': tasks, 'open_tasks': open_tasks}
+            for category_id, (tasks, open_tasks) in self.deltas.items()
+            if tasks or open_tasks
+        ]
+        if rows:
+            session.connection().execute(
+                update(category_table)
+                .where(category_table.c.id == bindparam('category'))
+                .values(
+                    task_count=category_table.c.task_count + bindparam('tasks'),
+                    open_task_count=category_table.c.open_task_count + bindparam('open_tasks'),
+                    # Counter moves are not edits of the category
+                    updated_at=category_table.c.updated_at
+                ),
+                rows
+            )
+            category_ids = [row['category'] for row in rows]
+            record_changes(session, 'category', category_ids)
+            session.info.setdefault('counted_categories', set()).update(category_ids)
+        self.deltas.clear()
+
+        day_rows = [
+            {'day': day, 'task_count': tasks, 'open_task_count': open_tasks}
+            for day, (tasks, open_tasks) in self.day_deltas.items()
+            if tasks or open_tasks
+        ]
+        if day_rows:
+            connection = session.connection()
+            statement = UPSERT_DIALECTS[connection.dialect.name].insert(due_day_table)
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=[due_day_table.c.day],
+                set_={
+                    'task_count': due_day_table.c.task_count + statement.excluded.task_count,
+                    'open_task_count': due_day_table.c.open_task_count + statement.excluded.open_task_count
+                }
+            ), day_rows)
+        self.day_deltas.clear()
+
+def _stored_values(connection, task_ids):
+    """Return ``{id: (category_id, status, due_date)}`` as currently stored for ``task_ids``."""
+    if not task_ids:
+        return {}
+    rows = connection.execute(
+        select(task_table.c.id, task_table.c.category_id, task_table.c.status, task_table.c.due_date)
+        .where(task_table.c.id.in_(task_ids))
+    )
+    return {task_id: (category_id, status, due_date) for task_id, category_id, status, due_date in rows}
+
+def _counted_changed(task):
+    attrs = inspect(task).attrs
+    return any(getattr(attrs, name).history.has_changes() for name in ('category_id', 'status', 'due_date'))
+
+@event.listens_for(Session, 'before_flush')
+def track_flush(session, _flush_context, _instances):
+    """Update counters for the tasks written by a flush."""
+    deltas = CounterDeltas()
+    for obj in session.new:
+        if isinstance(obj, Task):
+            deltas.add(obj.category_id, obj.status, obj.due_date, 1)
+
+    changed = [obj for obj in session.dirty if isinstance(obj, Task) and _counted_changed(obj)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Task)]
+    if changed or deleted:
+        stored = _stored_values(session.connection(), [obj.id for obj in changed + deleted])
+    else:
+        stored = {}
+    for obj in changed:
+        if obj.id in stored:
+            deltas.move(stored[obj.id], (obj.category_id, obj.status, obj.due_date))
+    for obj in deleted:
+        if obj.id in stored:
+            deltas.add(*stored[obj.id], -1)
+    deltas.apply(session)
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_counted(session):
+    """Invalidate cached reads of the categories whose counters moved.
+
+    Tasks a category delete detached (collected by the change log's
+    ``track_detached_tasks``) have their cached reads invalidated too.
+    """
+    category_ids = session.info.pop('counted_categories', None)
+    task_ids = session.info.pop('detached_tasks', None)
+    # The async app has no response cache to invalidate
+    if not has_app_context():
+        return
+    if category_ids:
+        cache.invalidate('categories', *(f'category:{category_id}' for category_id in category_ids))
+    if task_ids:
+        cache.invalidate('tasks', *(f'task:{task_id}' for task_id in task_ids))
+
+@event.listens_for(Session, 'after_rollback')
+def discard_counted(session):
+    """Forget counter changes that were rolled back."""
+    session.info.pop('counted_categories', None)
+    session.info.pop('detached_tasks', None)
+
+def track_bulk_insert(rows):
+    """Count tasks about to be bulk inserted from ``rows``."""
+    deltas = CounterDeltas()
+    for row in rows:
+        deltas.add(row.get('category_id'), row.get('status'), row.get('due_date'), 1)
+    deltas.apply(db.session)
+
+def track_bulk_update(rows):
+    """Count changes of tasks about to be bulk updated from ``rows`` (each with ``id``)."""
+    stored = _stored_values(db.session.connection(), [row['id'] for row in rows])
+    deltas = CounterDeltas()
+    for row in rows:
+        if row['id'] in stored:
+            category_id, status, due_date = stored[row['id']]
+            deltas.move(stored[row['id']], (
+                row.get('category_id', category_id), row.get('status', status), row.get('due_date', due_date)
+            ))
+    deltas.apply(db.session)
+
+def track_bulk_delete(task_ids):
+    """Count tasks about to be bulk deleted."""
+    deltas = CounterDeltas()
+    for old in _stored_values(db.session.connection(), list(task_ids)).values():
+        deltas.add(*old, -1)
+    deltas.apply(db.session)
+
+def ensure_counter_columns():
+    """Add the counter columns to a category table created before they existed."""
+    existing = {column['name'] for column in inspect(db.engine).get_columns('category')}
+    for name in ('task_count', 'open_task_count'):
+        if name not in existing:
+            db.session.execute(text(f'ALTER TABLE category ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0'))
+    db.session.commit()
+
+def reconcile_category_counts():
+    """Recompute the counters from the task table.
+
+    Returns:
+        int: Number of categories whose stored counters had drifted
+    """
+    actual = (
+        select(func.count(task_table.c.id))
+        .where(task_table.c.category_id == category_table.c.id)
+        .scalar_subquery()
+    )
+    actual_open = (
+        select(func.count(task_table.c.id))
+        .where(task_table.c.category_id == category_table.c.id, task_table.c.status != COMPLETED_STATUS)
+        .scalar_subquery()
+    )
+    category_ids = db.session.scalars(
+        update(category_table)
+        .where((category_table.c.task_count != actual) | (category_table.c.open_task_count != actual_open))
+        .values(task_count=actual, open_task_count=actual_open, updated_at=category_table.c.updated_at)
+        .returning(category_table.c.id)
+    ).all()
+    record_changes(db.session, 'category', category_ids)
+    db.session.commit()
+    cache.invalidate('categories')
+    return len(category_ids)
+
+def rebuild_due_days():
+    """Recompute the per-day due counters from the task table.
+
+    Returns:
+        int: Number of days with tasks due
+    """
+    day = func.date(task_table.c.due_date)
+    db.session.execute(delete(due_day_table))
+    db.session.execute(insert(due_day_table).from_select(
+        ['day', 'task_count', 'open_task_count'],
+        select(
+            day, func.count(),
+            func.sum(case((task_table.c.status != COMPLETED_STATUS, 1), else_=0))
+        ).where(task_table.c.due_date.is_not(None)).group_by(day)
+    ))
+    db.session.commit()
+    return db.session.scalar(select(func.count()).select_from(due_day_table))
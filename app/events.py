@@ -0,0 +1,158 @@
+"""Server-Sent Events hub for task and category changes.
+
+Every committed change-log row (see app/changes.py) is published to the hub
+as ``{'id', 'entity', 'entity_id', 'op'}``; the id is the change cursor, so
+a subscriber that falls behind or reconnects catches up from the change
+feed instead of the hub buffering for it. Each subscriber has a small
+bounded queue: a subscriber that stops reading is cut off with a ``reset``
+event rather than slowing down publishers or growing memory.
+"""
+import json
+import queue
+import threading
+from flask import current_app
+
+RESET = object()
+
+class Subscription:
+    """Bounded queue of events for one subscriber."""
+
+    def __init__(self, max_pending):
+        self.queue = queue.Queue(max_pending)
+        self.overflowed = False
+
+    def put(self, event):
+        """Queue ``event``; return False if the subscriber has fallen too far behind."""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.overflowed = True
+            return False
+
+    def get(self, timeout):
+        """Return the next event, ``RESET`` after an overflow, or None on timeout."""
+        if self.overflowed:
+            return RESET
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return RESET if self.overflowed else None
+
+class MemoryBroker:
+    """In-process fan-out to the subscribers of one worker."""
+
+    name = 'memory'
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, max_pending):
+        """Register and return a new subscription."""
+        subscription = Subscription(max_pending)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, events):
+        """Deliver ``events`` to every subscriber, dropping those that overflow."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            for event in events:
+                if not subscription.put(event):
+                    self.unsubscribe(subscription)
+                    break
+
+    def subscriber_count(self):
+        """Return the number of live subscriptions."""
+        with self._lock:
+            return len(self._subscribers)
+
+class RedisBroker(MemoryBroker):
+    """Fan-out across workers through a Redis pub/sub channel.
+
+    Events are published to the channel and a listener thread per worker
+    delivers them to the local subscribers. ``client`` is anything
+    implementing the redis-py ``publish``/``pubsub`` calls.
+    """
+
+    name = 'redis'
+
+    def __init__(self, client, channel='todo:events'):
+        super().__init__()
+        self.client = client
+        self.channel = channel
+        self._listener = None
+
+    def subscribe(self, max_pending):
+        """Register a subscription, starting the channel listener on first use."""
+        with self._lock:
+            if self._listener is None:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                self._listener = threading.Thread(target=self._listen, args=(pubsub,), daemon=True)
+                self._listener.start()
+        return super().subscribe(max_pending)
+
+    def _listen(self, pubsub):
+        for message in pubsub.listen():
+            if message.get('type') == 'message':
+                super().publish(json.loads(message['data']))
+
+    def publish(self, events):
+        """Publish ``events`` to every worker."""
+        self.client.publish(self.channel, json.dumps(events))
+
+def create_broker(config):
+    """Build the broker selected by ``EVENTS_BACKEND``.
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = config['EVENTS_BACKEND']
+    if backend == 'memory':
+        return MemoryBroker()
+    if backend == 'redis':
+        import redis  # pylint: disable=import-outside-toplevel,import-error
+        return RedisBroker(redis.Redis.from_url(config['EVENTS_REDIS_URL']))
+    raise ValueError(f'Unknown EVENTS_BACKEND: {backend}')
+
+def format_event(event):
+    """Return ``event`` as an SSE message."""
+    return f'id: {event["id"]}\ndata: {json.dumps(event)}\n\n'
+
+class EventHub:
+    """Flask extension publishing change events to SSE subscribers."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Attach a broker built from the app config."""
+        app.extensions['events'] = create_broker(app.config)
+
+    @property
+    def broker(self):
+        """The broker of the current application."""
+        return current_app.extensions['events']
+
+    def publish(self, events):
+        """Publish a list of change events."""
+        if events:
+            self.broker.publish(events)
+
+    def subscribe(self):
+        """Return a new subscription bounded by ``EVENTS_MAX_PENDING``."""
+        return self.broker.subscribe(current_app.config['EVENTS_MAX_PENDING'])
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription."""
+        self.broker.unsubscribe(subscription)
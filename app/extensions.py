@@ -1,4 +1,9 @@
 """Flask extensions module."""
 from flask_sqlalchemy import SQLAlchemy
+from app.cache import Cache
+from app.events import EventHub
+from app.routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+cache = Cache()
+events = EventHub()
@@ -0,0 +1,181 @@
+"""Opt-in per-request instrumentation.
+
+When ``INSTRUMENTATION_ENABLED`` is set, every request records its SQL
+query count, SQL time, JSON serialization time and total time. Aggregates
+are served in the Prometheus text format at ``METRICS_PATH``, statements
+slower than ``SLOW_QUERY_MS`` are logged, and ``SERVER_TIMING`` adds a
+``Server-Timing`` header to each response. When disabled nothing is
+registered, so the request path is unchanged.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RequestMetrics:
+    """Timings collected for a single request."""
+
+    __slots__ = ('started', 'queries', 'sql_seconds', 'serialize_seconds')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+@dataclass
+class EndpointStats:
+    """Aggregated timings of the requests to one endpoint."""
+
+    duration_buckets: list = field(default_factory=lambda: [0] * len(DURATION_BUCKETS))
+    duration_sum: float = 0.0
+    duration_count: int = 0
+    queries: int = 0
+    sql_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+
+class MetricsRegistry:
+    """Thread-safe aggregates of request metrics, keyed by endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.endpoints = defaultdict(EndpointStats)
+        self.slow_queries = 0
+
+    def observe(self, endpoint, method, status, metrics, duration):
+        """Fold one finished request into the aggregates."""
+        with self.lock:
+            self.requests[(endpoint, method, status)] += 1
+            stats = self.endpoints[endpoint]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    stats.duration_buckets[index] += 1
+            stats.duration_sum += duration
+            stats.duration_count += 1
+            stats.queries += metrics.queries
+            stats.sql_seconds += metrics.sql_seconds
+            stats.serialize_seconds += metrics.serialize_seconds
+
+    def record_slow_query(self):
+        """Count a statement over the slow-query threshold."""
+        with self.lock:
+            self.slow_queries += 1
+
+    def render(self):
+        """Render the aggregates in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            lines.append('# TYPE todo_requests_total counter')
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                labels = f'endpoint="{endpoint}",method="{method}",status="{status}"'
+                lines.append(f'todo_requests_total{{{labels}}} {count}')
+
+            lines.append('# TYPE todo_request_duration_seconds histogram')
+            for endpoint, stats in endpoints:
+                for bound, count in zip(DURATION_BUCKETS, stats.duration_buckets):
+                    lines.append(f'todo_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+                lines.append(f'todo_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} '
+                             f'{stats.duration_count}')
+                lines.append(f'todo_request_duration_seconds_sum{{endpoint="{endpoint}"}} '
+                             f'{stats.duration_sum:.6f}')
+                lines.append(f'todo_request_duration_seconds_count{{endpoint="{endpoint}"}} '
+                             f'{stats.duration_count}')
+
+            for name, attribute, fmt in (
+                ('todo_sql_queries_total', 'queries', '{}'),
+                ('todo_sql_duration_seconds_total', 'sql_seconds', '{:.6f}'),
+                ('todo_serialization_duration_seconds_total', 'serialize_seconds', '{:.6f}')
+            ):
+                lines.append(f'# TYPE {name} counter')
+                for endpoint, stats in endpoints:
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {fmt.format(getattr(stats, attribute))}')
+
+            lines.append('# TYPE todo_slow_queries_total counter')
+            lines.append(f'todo_slow_queries_total {self.slow_queries}')
+        return '\n'.join(lines) + '\n'
+
+def _current():
+    """Return the metrics of the active request, if it is being measured."""
+    if has_request_context():
+        return g.get('request_metrics')
+    return None
+
+def init_instrumentation(flask_app, engines):
+    """Register instrumentation hooks on ``flask_app`` and ``engines`` if enabled.
+
+    Args:
+        flask_app: The application
+        engines: Every engine requests may query, such as the primary and
+            the read replica
+    """
+    config = flask_app.config
+    if not config['INSTRUMENTATION_ENABLED']:
+        return
+
+    registry = MetricsRegistry()
+    flask_app.extensions['metrics'] = registry
+    slow_query_seconds = config['SLOW_QUERY_MS'] / 1000
+    server_timing = config['SERVER_TIMING']
+
+    def before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        metrics = _current()
+        if metrics is not None:
+            metrics.queries += 1
+            metrics.sql_seconds += elapsed
+        if elapsed >= slow_query_seconds:
+            registry.record_slow_query()
+            logger.warning('Slow query (%.1f ms): %s', elapsed * 1000, statement)
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+    json_response = flask_app.json.response
+
+    def timed_json_response(*args, **kwargs):
+        started = time.perf_counter()
+        response = json_response(*args, **kwargs)
+        metrics = _current()
+        if metrics is not None:
+            metrics.serialize_seconds += time.perf_counter() - started
+        return response
+
+    flask_app.json.response = timed_json_response
+
+    @flask_app.before_request
+    def start_request_metrics():
+        g.request_metrics = RequestMetrics()
+
+    @flask_app.after_request
+    def finish_request_metrics(response):
+        metrics = g.pop('request_metrics', None)
+        if metrics is None:
+            return response
+        duration = time.perf_counter() - metrics.started
+        endpoint = request.url_rule.endpoint if request.url_rule else 'unmatched'
+        registry.observe(endpoint, request.method, response.status_code, metrics, duration)
+        if server_timing:
+            response.headers['Server-Timing'] = (
+                f'db;dur={metrics.sql_seconds * 1000:.2f};desc="{metrics.queries} queries", '
+                f'serialize;dur={metrics.serialize_seconds * 1000:.2f}, '
+                f'total;dur={duration * 1000:.2f}'
+            )
+        return response
+
+    def metrics_view():
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+    flask_app.add_url_rule(config['METRICS_PATH'], 'metrics', metrics_view)
@@ -0,0 +1,318 @@
+"""Background job queue backed by the ``job`` table.
+
+Heavy operations are enqueued as ``Job`` rows and executed by a pool of
+worker threads, either inside the web process (``JOBS_WORKER_THREADS``) or in
+a separate ``flask jobs-worker`` process. Workers claim the oldest queued job
+with a single conditional UPDATE, so several workers and processes can share
+one queue. Handlers commit their work in batches of ``JOBS_BATCH_SIZE`` and
+report progress, which also serves as the heartbeat: a running job whose
+heartbeat is older than ``JOBS_STALE_SECONDS`` is assumed to belong to a dead
+worker and is claimed again, up to ``JOBS_MAX_ATTEMPTS`` times, after which
+it is marked failed.
+
+A separate worker process only shares the response cache and the event hub
+with the web workers when both use their Redis backends.
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from flask import current_app, request, jsonify, url_for
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm.exc import StaleDataError
+from app.conditional import apply_versions, stale_ids, stored_versions
+from app.counters import reconcile_category_counts
+from app.extensions import cache, db
+from app.importer import import_tasks as run_import, iter_records
+from app.models.category import Category
+from app.models.job import FAILED, QUEUED, RUNNING, SUCCEEDED, Job
+from app.models.task import Task
+from app.services import commit_bulk_update
+from app.serialization import TASK_FIELDS, fetch_dicts, select_fields
+from app.validation import is_id, parse_task
+
+logger = logging.getLogger(__name__)
+job_table = Job.__table__
+
+HANDLERS = {}
+SUBMITTABLE = set()
+
+def handler(kind, submittable=False):
+    """Register a job handler.
+
+    Args:
+        kind (str): Job kind the handler executes
+        submittable (bool): Allow clients to enqueue the kind directly
+            through ``POST /api/jobs/``
+    """
+    def register(func):
+        HANDLERS[kind] = func
+        if submittable:
+            SUBMITTABLE.add(kind)
+        return func
+    return register
+
+class JobContext:
+    """Payload and progress reporting handed to a running handler."""
+
+    def __init__(self, job_id, payload):
+        self.job_id = job_id
+        self.payload = payload
+
+    def progress(self, done, total=None):
+        """Record progress; also refreshes the job's heartbeat."""
+        values = {'progress': done, 'heartbeat_at': datetime.utcnow()}
+        if total is not None:
+            values['total'] = total
+        db.session.execute(update(job_table).where(job_table.c.id == self.job_id).values(**values))
+        db.session.commit()
+
+def enqueue(kind, payload=None):
+    """Queue a job and return it.
+
+    Raises:
+        ValueError: If no handler is registered for ``kind``
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    job = Job(kind=kind, payload=json.dumps(payload or {}), status=QUEUED)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+def wants_async():
+    """Return True if the client asked for the request to run as a job."""
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+def accepted(job):
+    """Build the 202 response pointing at a queued job."""
+    response = jsonify(job.to_dict())
+    response.status_code = 202
+    response.headers['Location'] = url_for('jobs.get_job', job_id=job.id)
+    return response
+
+def _stale(now):
+    stale_before = now - timedelta(seconds=current_app.config['JOBS_STALE_SECONDS'])
+    return and_(job_table.c.status == RUNNING, job_table.c.heartbeat_at < stale_before)
+
+def _claimable(now):
+    return or_(
+        job_table.c.status == QUEUED,
+        and_(_stale(now), job_table.c.attempts < current_app.config['JOBS_MAX_ATTEMPTS'])
+    )
+
+def claim_next():
+    """Atomically mark the oldest claimable job as running.
+
+    Returns:
+        Job: The claimed job, or None when the queue is empty
+    """
+    now = datetime.utcnow()
+    max_attempts = current_app.config['JOBS_MAX_ATTEMPTS']
+    db.session.execute(
+        update(job_table)
+        .where(_stale(now), job_table.c.attempts >= max_attempts)
+        .values(status=FAILED, error=f'Abandoned after {max_attempts} attempts', finished_at=now)
+    )
+    candidate = (
+        select(job_table.c.id).where(_claimable(now))
+        .order_by(job_table.c.id).limit(1).scalar_subquery()
+    )
+    # Re-checking the condition makes the claim safe against concurrent workers
+    job_id = db.session.scalar(
+        update(job_table)
+        .where(job_table.c.id == candidate, _claimable(now))
+        .values(status=RUNNING, started_at=now, heartbeat_at=now, attempts=job_table.c.attempts + 1)
+        .returning(job_table.c.id)
+    )
+    db.session.commit()
+    return db.session.get(Job, job_id) if job_id is not None else None
+
+def run_job(job):
+    """Execute a claimed job and record its outcome."""
+    job_id = job.id
+    try:
+        result = HANDLERS[job.kind](JobContext(job_id, json.loads(job.payload)))
+        values = {'status': SUCCEEDED, 'result': json.dumps(result)}
+    except Exception as error:  # pylint: disable=broad-except
+        db.session.rollback()
+        logger.exception('Job %s (%s) failed', job_id, job.kind)
+        values = {'status': FAILED, 'error': str(error)}
+    values['finished_at'] = datetime.utcnow()
+    db.session.execute(update(job_table).where(job_table.c.id == job_id).values(**values))
+    db.session.commit()
+
+def run_next():
+    """Claim and execute one job; return False when the queue is empty."""
+    job = claim_next()
+    if job is None:
+        return False
+    run_job(job)
+    return True
+
+class Worker:
+    """Pool of threads executing queued jobs for ``app``."""
+
+    def __init__(self, app, threads=1, poll_interval=1.0):
+        self.app = app
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.stopping = threading.Event()
+        self._threads = []
+
+    def _loop(self, burst):
+        while not self.stopping.is_set():
+            with self.app.app_context():
+                ran = run_next()
+            if not ran:
+                if burst:
+                    return
+                self.stopping.wait(self.poll_interval)
+
+    def start(self, burst=False):
+        """Start the worker threads; with ``burst`` they exit once the queue is empty."""
+        for index in range(self.threads):
+            thread = threading.Thread(target=self._loop, args=(burst,), name=f'job-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Ask the threads to exit after their current job."""
+        self.stopping.set()
+
+    def join(self):
+        """Wait for every thread to exit."""
+        for thread in self._threads:
+            thread.join()
+
+def init_jobs(app):
+    """Start an in-process worker pool when ``JOBS_WORKER_THREADS`` is set."""
+    threads = app.config['JOBS_WORKER_THREADS']
+    if threads > 0:
+        worker = Worker(app, threads, app.config['JOBS_POLL_INTERVAL'])
+        worker.start()
+        app.extensions['jobs_worker'] = worker
+
+def _batches(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+@handler('bulk_update_tasks')
+def bulk_update_tasks(context):
+    """Apply a validated bulk task update in committed batches.
+
+    Every item is checked against the stored versions before the first
+    batch is written, so a job edited from stale tasks fails without
+    writing anything. A conflicting write that lands while the job runs
+    still fails the batch it hits, after the earlier batches were
+    committed; the error reports how many items were applied.
+    """
+    items = context.payload['items']
+    stale = stale_ids(items, stored_versions(Task, [item['id'] for item in items]))
+    if stale:
+        raise ValueError(f'Tasks were modified concurrently: {sorted(set(stale))}')
+    batch_size = current_app.config['JOBS_BATCH_SIZE']
+    done = 0
+    context.progress(done, len(items))
+    for batch in _batches(items, batch_size):
+        now = datetime.utcnow()
+        rows = []
+        for item in batch:
+            fields, error = parse_task(item, partial=True)
+            if error:
+                raise ValueError(error)
+            row = {**fields, 'id': item['id'], 'updated_at': now}
+            if is_id(item.get('version')):
+                row['version'] = item['version']
+            rows.append(row)
+        apply_versions(rows, stored_versions(Task, [row['id'] for row in rows]))
+        try:
+            commit_bulk_update(rows)
+        except StaleDataError as error:
+            raise ValueError(f'Tasks were modified concurrently after {done} of {len(items)} '
+                             'were updated') from error
+        done += len(rows)
+        context.progress(done)
+    return {'updated': done}
+
+@handler('delete_category', submittable=True)
+def delete_category(context):
+    """Detach a category's tasks in committed batches, then delete it.
+
+    An optional ``version`` in the payload is the category version the
+    client expects, checked when the job runs; without it the delete is
+    unconditional.
+    """
+    category_id = context.payload.get('category_id')
+    category = db.session.get(Category, category_id) if is_id(category_id) else None
+    if category is None:
+        raise ValueError('Category not found')
+    version = context.payload.get('version')
+    if version is not None and (not is_id(version) or version != category.version):
+        raise ValueError('Category was modified concurrently')
+    batch_size = current_app.config['JOBS_BATCH_SIZE']
+    total = db.session.scalar(select(db.func.count(Task.id)).where(Task.category_id == category_id))
+    done = 0
+    context.progress(done, total)
+    while True:
+        versions = db.session.execute(
+            select(Task.id, Task.version).where(Task.category_id == category_id).limit(batch_size)
+        ).all()
+        if not versions:
+            break
+        rows = [{'id': task_id, 'version': version, 'category_id': None, 'updated_at': datetime.utcnow()}
+                for task_id, version in versions]
+        commit_bulk_update(rows)
+        done += len(rows)
+        context.progress(done)
+    db.session.delete(db.session.get(Category, category_id))
+    db.session.commit()
+    cache.invalidate('categories', f'category:{category_id}')
+    return {'detached_tasks': done}
+
+@handler('reconcile_category_counts', submittable=True)
+def reconcile_counts(context):
+    """Recompute the per-category task counters."""
+    drifted = reconcile_category_counts()
+    context.progress(1, 1)
+    return {'drifted': drifted}
+
+@handler('export_tasks', submittable=True)
+def export_tasks(context):
+    """Write every task to an NDJSON file under ``JOBS_RESULT_DIR``."""
+    directory = current_app.config['JOBS_RESULT_DIR']
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'tasks-{context.job_id}.ndjson')
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+    dumps = current_app.json.dumps
+    total = db.session.scalar(select(db.func.count(Task.id)))
+    done = 0
+    context.progress(done, total)
+    last_id = 0
+    with open(path, 'w', encoding='utf-8') as output:
+        # Keyset batches rather than one cursor, which a progress commit would close
+        while True:
+            batch = fetch_dicts(
+                select_fields(Task, TASK_FIELDS).where(Task.id > last_id).order_by(Task.id).limit(batch_size)
+            )
+            if not batch:
+                break
+            output.write(''.join(dumps(row) + '\n' for row in batch))
+            last_id = batch[-1]['id']
+            done += len(batch)
+            context.progress(done)
+    return {'file': os.path.basename(path), 'rows': done}
+
+@handler('import_tasks')
+def import_tasks(context):
+    """Import a saved upload, then remove it."""
+    path = os.path.join(current_app.config['JOBS_RESULT_DIR'], context.payload['file'])
+    try:
+        with open(path, 'rb') as source:
+            report = run_import(iter_records(source, context.payload['format']),
+                                progress=lambda report: context.progress(report['imported']))
+    finally:
+        os.remove(path)
+    context.progress(report['imported'], report['imported'])
+    return report
@@ -0,0 +1,66 @@
+"""JSON providers for the Flask application.
+
+Datetimes are encoded as ISO 8601 strings, matching ``to_dict()``, so list
+endpoints can hand raw column values to the encoder instead of calling
+``isoformat()`` per row in Python.
+"""
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+def _default(o):
+    """Encode dates as ISO 8601 and defer everything else to Flask."""
+    if isinstance(o, date):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+class JSONProvider(DefaultJSONProvider):
+    """Standard library provider with ISO 8601 datetimes."""
+
+    default = staticmethod(_default)
+
+class OrjsonProvider(JSONProvider):
+    """Provider encoding with orjson, which handles datetimes natively."""
+
+    def dumps(self, obj, **kwargs):
+        """Serialize ``obj`` to a JSON string."""
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes."""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize the arguments to JSON and wrap them in a response."""
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+
+    def _encode(self, obj):
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        return orjson.dumps(obj, default=self.default, option=option)
+
+def create_json_provider(flask_app):
+    """Build the provider selected by ``JSON_PROVIDER``.
+
+    ``auto`` uses orjson when it is installed and the standard library
+    otherwise.
+
+    Raises:
+        RuntimeError: If ``orjson`` is requested but not installed
+    """
+    name = flask_app.config['JSON_PROVIDER']
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_PROVIDER is orjson but orjson is not installed')
+    if name == 'orjson' or (name == 'auto' and orjson is not None):
+        return OrjsonProvider(flask_app)
+    return JSONProvider(flask_app)
@@ -0,0 +1,136 @@
+"""Task listing helpers shared by the sync and async routes."""
+import base64
+from datetime import date, datetime, timedelta
+from sqlalchemy import and_, or_, tuple_
+from app.models.task import Task
+
+# Longest span, in days, one calendar request may cover
+CALENDAR_MAX_DAYS = 366
+
+def encode_cursor(created_at, task_id):
+    """Encode a (created_at, id) keyset position.
+
+    ``created_at`` may be a datetime or its ISO 8601 form from ``to_dict()``.
+    """
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = f'{created_at}|{task_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    padded = cursor + '=' * (-len(cursor) % 4)
+    created_at, task_id = base64.urlsafe_b64decode(padded).decode().split('|')
+    return datetime.fromisoformat(created_at), int(task_id)
+
+def after_cursor(cursor):
+    """Return the clause selecting tasks after a cursor position.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, task_id = decode_cursor(cursor)
+    return or_(
+        Task.created_at > created_at,
+        and_(Task.created_at == created_at, Task.id > task_id)
+    )
+
+def after_due_cursor(cursor):
+    """Return the clause selecting tasks after a (due_date, id) cursor position.
+
+    The row-value comparison lets the (due_date, id) indexes seek straight
+    to the cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    due_date, task_id = decode_cursor(cursor)
+    return tuple_(Task.due_date, Task.id) > (due_date, task_id)
+
+def calendar_range(args):
+    """Return the ``[start, end)`` dates a calendar request covers.
+
+    The range is given as ``month=YYYY-MM``, ``week=YYYY-Www`` (ISO week) or
+    ``start`` and ``end`` dates, ``end`` exclusive.
+
+    Raises:
+        ValueError: If the range is missing, malformed or too long
+    """
+    if args.get('month'):
+        start = datetime.strptime(args['month'], '%Y-%m').date()
+        end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    elif args.get('week'):
+        year, _, week = args['week'].partition('-W')
+        start = date.fromisocalendar(int(year), int(week), 1)
+        end = start + timedelta(days=7)
+    elif args.get('start') and args.get('end'):
+        start, end = date.fromisoformat(args['start']), date.fromisoformat(args['end'])
+    else:
+        raise ValueError('A month, week or start and end is required')
+    if not start < end <= start + timedelta(days=CALENDAR_MAX_DAYS):
+        raise ValueError('Invalid range')
+    return start, end
+
+def listing_clauses(args):
+    """Parse the filters and cursor of a ``get_tasks`` request.
+
+    Returns:
+        tuple: (clauses, error) where error is a message for a 400 response
+            when a filter value or the cursor is malformed
+    """
+    try:
+        clauses = task_filters(args)
+    except ValueError:
+        return None, 'Invalid filter value'
+    if args.get('cursor'):
+        try:
+            clauses.append(after_cursor(args['cursor']))
+        except ValueError:
+            return None, 'Invalid cursor'
+    return clauses, None
+
+def next_page_headers(rows, limit, args, url_for, *, endpoint, key='created_at'):
+    """Return the headers pointing at the page after ``rows``, or {} on the last page.
+
+    Args:
+        rows (list): Task dicts fetched with a limit of ``limit + 1``
+        limit (int): Page size
+        args: Query-string arguments of the current request
+        url_for (callable): The framework's ``url_for``
+        endpoint (str): Endpoint serving the next page
+        key (str): Field the page is ordered by before ``id``
+    """
+    if len(rows) <= limit:
+        return {}
+    last = rows[limit - 1]
+    cursor = encode_cursor(last[key], last['id'])
+    url = url_for(endpoint, **{**args.to_dict(), 'cursor': cursor})
+    return {'X-Next-Cursor': cursor, 'Link': f'<{url}>; rel="next"'}
+
+def page_limit(args, config):
+    """Return the requested page size clamped to the configured maximum."""
+    limit = args.get('limit', config['TASKS_PAGE_SIZE'], type=int)
+    return max(1, min(limit, config['TASKS_MAX_PAGE_SIZE']))
+
+def task_filters(args):
+    """Build filter clauses for a task listing from query-string arguments.
+
+    Raises:
+        ValueError: If a filter value is malformed
+    """
+    clauses = []
+    if args.get('status'):
+        clauses.append(Task.status == args['status'])
+    if args.get('priority'):
+        clauses.append(Task.priority == args['priority'])
+    if args.get('category_id'):
+        clauses.append(Task.category_id == int(args['category_id']))
+    if args.get('due_after'):
+        clauses.append(Task.due_date >= datetime.fromisoformat(args['due_after']))
+    if args.get('due_before'):
+        clauses.append(Task.due_date < datetime.fromisoformat(args['due_before']))
+    return clauses
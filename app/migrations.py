@@ -0,0 +1,146 @@
+"""Versioned schema migrations.
+
+The schema version is a single row in ``schema_version``, so bringing an
+up-to-date database online costs one query instead of ``create_all``
+inspecting every table on every boot. A database without tables gets the
+current schema from the models and is stamped with the latest version; an
+existing one runs the migrations after its version, each in its own
+transaction.
+
+Migrations only touch the primary database (``bind_key=None``); a read
+replica receives the schema through replication.
+
+Migrations are appended with the next version number and must cope with a
+database created by ``create_all`` before versioning existed (version 0).
+They go through SQLAlchemy constructs rather than SQLite-specific SQL, so the
+same path provisions a PostgreSQL database; ``schema_ddl`` shows the DDL a
+given backend would receive.
+"""
+import logging
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, create_mock_engine, inspect, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from app.counters import ensure_counter_columns, rebuild_due_days, reconcile_category_counts
+from app.extensions import db
+from app.search import rebuild_search_index
+
+logger = logging.getLogger(__name__)
+
+version_table = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+MIGRATIONS = []
+
+def migration(version):
+    """Register a migration; versions must be added in increasing order."""
+    def register(func):
+        if MIGRATIONS and MIGRATIONS[-1][0] >= version:
+            raise ValueError(f'Migration {version} is out of order')
+        MIGRATIONS.append((version, func))
+        return func
+    return register
+
+def latest_version():
+    """Return the version of the newest migration."""
+    return MIGRATIONS[-1][0]
+
+def current_version():
+    """Return the database's schema version; 0 when it predates versioning."""
+    try:
+        with db.engine.connect() as connection:
+            return connection.scalar(select(version_table.c.version)) or 0
+    except DBAPIError:
+        return 0
+
+def _stamp(version):
+    connection = db.session.connection()
+    version_table.create(connection, checkfirst=True)
+    connection.execute(version_table.delete())
+    connection.execute(version_table.insert().values(version=version, applied_at=datetime.utcnow()))
+    db.session.commit()
+
+def schema_ddl(url):
+    """Return the DDL a fresh database at ``url`` receives, without connecting.
+
+    Args:
+        url (str): Database URL, or a bare dialect name such as 'postgresql'
+
+    Returns:
+        list: CREATE statements, in execution order
+    """
+    statements = []
+
+    def record(sql, *_args, **_kwargs):
+        statements.append(str(sql.compile(dialect=engine.dialect)).strip())
+
+    engine = create_mock_engine(make_url(url if '://' in url else url + '://'), record)
+    db.metadata.create_all(engine, checkfirst=False)
+    version_table.create(engine, checkfirst=False)
+    return statements
+
+def upgrade_database():
+    """Bring the database schema up to date.
+
+    Returns:
+        list: Versions of the migrations that were applied
+    """
+    version = current_version()
+    if version >= latest_version():
+        return []
+    if version == 0 and not inspect(db.engine).has_table('task'):
+        db.create_all(bind_key=None)
+        _stamp(latest_version())
+        return [latest_version()]
+
+    applied = []
+    for number, func in MIGRATIONS:
+        if number > version:
+            logger.info('Applying schema migration %s: %s', number, func.__doc__)
+            func()
+            _stamp(number)
+            applied.append(number)
+    return applied
+
+@migration(1)
+def create_missing_tables():
+    """Create tables added since the database was first created."""
+    db.create_all(bind_key=None)
+
+@migration(2)
+def create_missing_indexes():
+    """Create indexes added to existing tables."""
+    connection = db.session.connection()
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    db.session.commit()
+
+@migration(3)
+def add_category_counters():
+    """Add the per-category task counters and fill them in."""
+    ensure_counter_columns()
+    reconcile_category_counts()
+
+@migration(4)
+def create_search_index():
+    """Create the task full-text index and build it."""
+    rebuild_search_index()
+
+@migration(5)
+def add_row_versions():
+    """Add the optimistic concurrency version column to tasks and categories."""
+    for table in ('task', 'category'):
+        if 'version' not in {column['name'] for column in inspect(db.engine).get_columns(table)}:
+            db.session.execute(text(f'ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1'))
+    db.session.commit()
+
+@migration(6)
+def add_due_date_views():
+    """Add the due-date indexes and per-day due counters, and fill them in."""
+    db.create_all(bind_key=None)
+    create_missing_indexes()
+    rebuild_due_days()
@@ -1,5 +1,8 @@
 """Models initialization module."""
 from app.models.category import Category
+from app.models.change import Change
+from app.models.due_day import DueDay
+from app.models.job import Job
 from app.models.task import Task
 
 # Initialize relationships after both models are defined
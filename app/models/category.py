@@ -11,14 +11,31 @@ class Category(db.Model):
     description = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Optimistic concurrency counter (see app/conditional.py)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    __mapper_args__ = {'version_id_col': version}
+    # Denormalized counters maintained by app/counters.py
+    task_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    open_task_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     tasks = db.relationship('Task', backref='category', lazy=True)
 
-    def to_dict(self):
-        """Convert category to dictionary."""
-        return {
+    def to_dict(self, include_tasks=False):
+        """Convert category to dictionary.
+
+        Args:
+            include_tasks (bool): Embed the category's tasks; load them
+                eagerly first to avoid one query per category
+        """
+        data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
+            'task_count': self.task_count,
+            'open_task_count': self.open_task_count,
             'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'updated_at': self.updated_at.isoformat(),
+            'version': self.version
         }
+        if include_tasks:
+            data['tasks'] = [task.to_dict() for task in self.tasks]
+        return data
@@ -0,0 +1,19 @@
+"""Change log model module."""
+from datetime import datetime
+from app.extensions import db
+
+UPSERT = 'upsert'
+DELETE = 'delete'
+
+class Change(db.Model):
+    """Append-only log of task and category writes; the id is the sync cursor."""
+    __tablename__ = 'change'
+    __table_args__ = (
+        db.Index('ix_change_entity_id', 'entity', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,10 @@
+"""Due-date calendar bucket model module."""
+from app.extensions import db
+
+class DueDay(db.Model):
+    """Number of tasks due on each (UTC) day, maintained by app/counters.py."""
+    __tablename__ = 'task_due_day'
+
+    day = db.Column(db.Date, primary_key=True)
+    task_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    open_task_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
@@ -2,9 +2,30 @@
 from datetime import datetime
 from app.extensions import db
 
+COMPLETED_STATUS = 'completed'
+
 class Task(db.Model):
     """Task model class."""
     __tablename__ = 'task'
+    __table_args__ = (
+        # Keyset pagination walks (created_at, id); each filter gets a
+        # composite index with the same suffix so a filtered page is a
+        # single index range scan.
+        db.Index('ix_task_created_at_id', 'created_at', 'id'),
+        db.Index('ix_task_status_created_at_id', 'status', 'created_at', 'id'),
+        db.Index('ix_task_priority_created_at_id', 'priority', 'created_at', 'id'),
+        db.Index('ix_task_category_id_created_at_id', 'category_id', 'created_at', 'id'),
+        db.Index('ix_task_due_date_id', 'due_date', 'id'),
+        # Due-date views walk (due_date, id) over open tasks, or over one
+        # status; the partial index keeps completed tasks out of the range.
+        # Its condition only applies to queries spelling the status literally.
+        db.Index('ix_task_status_due_date_id', 'status', 'due_date', 'id'),
+        db.Index('ix_task_open_due_date_id', 'due_date', 'id',
+                 sqlite_where=db.text(f"status != '{COMPLETED_STATUS}'"),
+                 postgresql_where=db.text(f"status != '{COMPLETED_STATUS}'")),
+        # max(updated_at) is the collection-level ETag version
+        db.Index('ix_task_updated_at', 'updated_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -15,10 +36,18 @@ class Task(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Optimistic concurrency counter (see app/conditional.py)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    __mapper_args__ = {'version_id_col': version}
+
+    def to_dict(self, include_category=False):
+        """Convert task to dictionary.
 
-    def to_dict(self):
-        """Convert task to dictionary."""
-        return {
+        Args:
+            include_category (bool): Embed the related category; load it
+                eagerly first to avoid one query per task
+        """
+        data = {
             'id': self.id,
             'title': self.title,
             'description': self.description,
@@ -27,5 +56,9 @@ class Task(db.Model):
             'status': self.status,
             'category_id': self.category_id,
             'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'updated_at': self.updated_at.isoformat(),
+            'version': self.version
         }
+        if include_category:
+            data['category'] = self.category.to_dict() if self.category else None
+        return data
@@ -0,0 +1,157 @@
+"""Opt-in sampling profiler.
+
+``ProfilerMiddleware`` wraps the WSGI app and, while capture is running,
+profiles a random ``sample_rate`` fraction of requests with cProfile. Each
+sampled request is written as a pstats file to a rotating directory that
+keeps only the newest ``max_files`` captures; open them with ``pstats``,
+snakeviz or gprof2dot. Streamed responses are never captured. Capture is
+started and stopped through the admin endpoints registered by
+``init_profiler``.
+"""
+import cProfile
+import hmac
+import os
+import random
+import re
+import threading
+import time
+from flask import Blueprint, abort, current_app, jsonify, request
+
+def _is_streamed(headers):
+    """Return True if response ``headers`` (lower-cased names) describe a streamed body."""
+    return 'content-length' not in headers or headers.get('content-type', '').startswith('text/event-stream')
+
+class ProfilerMiddleware:
+    """WSGI middleware profiling a sample of requests."""
+
+    def __init__(self, wsgi_app, output_dir, sample_rate=0.01, max_files=100):
+        self.wsgi_app = wsgi_app
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self.running = False
+        # cProfile cannot profile overlapping requests, so only one request
+        # is captured at a time and concurrent ones are skipped
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        if (not self.running or random.random() >= self.sample_rate
+                or environ.get('PATH_INFO', '').startswith(bp.url_prefix)):
+            return self.wsgi_app(environ, start_response)
+        # A non-blocking acquire has no ``with`` form; released below
+        if not self._lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+            return self.wsgi_app(environ, start_response)
+        try:
+            return self._profile(environ, start_response)
+        finally:
+            self._lock.release()
+
+    def _profile(self, environ, start_response):
+        headers = {}
+
+        def capture_start_response(status, response_headers, exc_info=None):
+            headers.update((name.lower(), value) for name, value in response_headers)
+            return start_response(status, response_headers, exc_info)
+
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            app_iter = self.wsgi_app(environ, capture_start_response)
+            # Streamed bodies (SSE, NDJSON exports) are passed through
+            # untouched and not captured: draining them here would hold the
+            # client's response, and the capture lock, until the stream ends
+            if _is_streamed(headers):
+                return app_iter
+            try:
+                body = list(app_iter)
+            finally:
+                if hasattr(app_iter, 'close'):
+                    app_iter.close()
+        finally:
+            profile.disable()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._write(profile, environ, elapsed_ms)
+        return body
+
+    def _write(self, profile, environ, elapsed_ms):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = re.sub(r'[^A-Za-z0-9]+', '_', environ.get('PATH_INFO', '')).strip('_') or 'root'
+        name = f'{time.time():.6f}-{environ.get("REQUEST_METHOD", "GET")}-{path}-{elapsed_ms:.0f}ms.prof'
+        profile.dump_stats(os.path.join(self.output_dir, name))
+        self._rotate()
+
+    def _rotate(self):
+        for name in self.captures()[self.max_files:]:
+            os.remove(os.path.join(self.output_dir, name))
+
+    def captures(self):
+        """Return the capture file names, newest first."""
+        if not os.path.isdir(self.output_dir):
+            return []
+        return sorted((name for name in os.listdir(self.output_dir) if name.endswith('.prof')), reverse=True)
+
+    def status(self):
+        """Return the current capture settings."""
+        return {
+            'running': self.running,
+            'sample_rate': self.sample_rate,
+            'output_dir': self.output_dir,
+            'max_files': self.max_files,
+            'captures': self.captures()
+        }
+
+bp = Blueprint('profiler', __name__, url_prefix='/admin/profiler')
+
+@bp.before_request
+def require_admin():
+    """Allow only requests carrying the configured admin token."""
+    token = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(token.encode(), current_app.config['PROFILER_TOKEN'].encode()):
+        abort(403)
+
+@bp.route('/', methods=['GET'])
+def get_status():
+    """Get the profiler status and the list of captures."""
+    return jsonify(current_app.extensions['profiler'].status())
+
+@bp.route('/start', methods=['POST'])
+def start():
+    """Start sampling, optionally with a new ``sample_rate`` between 0 and 1."""
+    profiler = current_app.extensions['profiler']
+    data = request.get_json(silent=True) or {}
+    if 'sample_rate' in data:
+        rate = data['sample_rate']
+        if not isinstance(rate, (int, float)) or not 0 < rate <= 1:
+            return jsonify({'error': 'sample_rate must be in (0, 1]'}), 400
+        profiler.sample_rate = rate
+    profiler.running = True
+    return jsonify(profiler.status())
+
+@bp.route('/stop', methods=['POST'])
+def stop():
+    """Stop sampling."""
+    profiler = current_app.extensions['profiler']
+    profiler.running = False
+    return jsonify(profiler.status())
+
+def init_profiler(flask_app):
+    """Wrap ``flask_app`` in the profiler middleware if ``PROFILER_ENABLED`` is set.
+
+    Raises:
+        ValueError: If the profiler is enabled without a ``PROFILER_TOKEN``
+    """
+    config = flask_app.config
+    if not config['PROFILER_ENABLED']:
+        return
+    if not config['PROFILER_TOKEN']:
+        raise ValueError('PROFILER_ENABLED requires a PROFILER_TOKEN')
+    profiler = ProfilerMiddleware(
+        flask_app.wsgi_app,
+        config['PROFILER_DIR'],
+        sample_rate=config['PROFILER_SAMPLE_RATE'],
+        max_files=config['PROFILER_MAX_FILES']
+    )
+    flask_app.wsgi_app = profiler
+    flask_app.extensions['profiler'] = profiler
+    flask_app.register_blueprint(bp)
@@ -1,39 +1,86 @@
 """Category routes module."""
 from flask import Blueprint, request, jsonify
 from sqlalchemy.exc import IntegrityError
-from app.extensions import db
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
+from app.conditional import (collection_version, conditional, loaded_state, precondition_failed, resource_etag,
+                             row_version)
+from app.counters import COUNTER_COLUMNS
+from app.extensions import cache, db
+from app.jobs import accepted, enqueue, wants_async
 from app.models.category import Category
+from app.models.task import Task
+from app.routing import prefer_replica
+from app.serialization import CATEGORY_FIELDS, fetch_dicts, select_fields
+from app.streaming import ndjson_response, wants_ndjson
+from app.validation import parse_category, parse_include
 
 bp = Blueprint('categories', __name__, url_prefix='/api/categories')
+bp.before_request(prefer_replica)
+
+def _cache_tags(category_id=None):
+    """Return the cache tags a category read depends on."""
+    tags = ['categories'] if category_id is None else [f'category:{category_id}']
+    if 'tasks' in request.args.get('include', ''):
+        tags.append('tasks')
+    return tags
+
+def _version(category_id=None):
+    """Return the ETag version of a category read."""
+    if category_id is None:
+        version = collection_version(Category)
+    else:
+        version = row_version(Category, category_id, *COUNTER_COLUMNS)
+    if version is not None and 'tasks' in request.args.get('include', ''):
+        version += '|' + collection_version(Task)
+    return version
 
 @bp.route('/', methods=['GET'])
+@conditional(_version, unless=wants_ndjson)
+@cache.cached(_cache_tags, unless=wants_ndjson)
 def get_categories():
-    """Get all categories."""
-    categories = Category.query.all()
-    return jsonify([category.to_dict() for category in categories])
+    """Get all categories, optionally with ``?include=tasks``."""
+    if wants_ndjson():
+        return export_categories()
+    try:
+        include = parse_include(request.args.get('include'), ('tasks',))
+    except ValueError:
+        return jsonify({'error': 'Invalid include'}), 400
+    if 'tasks' in include:
+        categories = Category.query.options(selectinload(Category.tasks)).all()
+        return jsonify([category.to_dict(include_tasks=True) for category in categories])
+    return jsonify(fetch_dicts(select_fields(Category, CATEGORY_FIELDS).order_by(Category.id)))
+
+@bp.route('/export', methods=['GET'])
+def export_categories():
+    """Stream all categories as NDJSON."""
+    return ndjson_response(select_fields(Category, CATEGORY_FIELDS).order_by(Category.id))
 
 @bp.route('/<int:category_id>', methods=['GET'])
+@conditional(_version)
+@cache.cached(_cache_tags)
 def get_category(category_id):
-    """Get a specific category."""
+    """Get a specific category, optionally with ``?include=tasks``."""
+    try:
+        include = parse_include(request.args.get('include'), ('tasks',))
+    except ValueError:
+        return jsonify({'error': 'Invalid include'}), 400
     category = Category.query.get_or_404(category_id)
-    return jsonify(category.to_dict())
+    return jsonify(category.to_dict('tasks' in include))
 
 @bp.route('/', methods=['POST'])
 def create_category():
     """Create a new category."""
-    data = request.get_json()
-    
-    if not data.get('name'):
-        return jsonify({'error': 'Name is required'}), 400
-    
-    category = Category(
-        name=data['name'],
-        description=data.get('description', '')
-    )
-    
+    fields, error = parse_category(request.get_json())
+    if error:
+        return jsonify({'error': error}), 400
+
+    category = Category(**fields)
+
     try:
         db.session.add(category)
         db.session.commit()
+        cache.invalidate('categories')
         return jsonify(category.to_dict()), 201
     except IntegrityError:
         db.session.rollback()
@@ -41,31 +88,63 @@ def create_category():
 
 @bp.route('/<int:category_id>', methods=['PUT'])
 def update_category(category_id):
-    """Update a category."""
+    """Update a category.
+
+    With ``If-Match`` the update only applies to the version of the category
+    that ETag names (412 otherwise); an update racing a concurrent write
+    gets 409.
+    """
     category = Category.query.get_or_404(category_id)
-    data = request.get_json()
-    
-    if 'name' in data:
-        category.name = data['name']
-    if 'description' in data:
-        category.description = data['description']
-    
+    failed = precondition_failed(loaded_state(category, *COUNTER_COLUMNS))
+    if failed:
+        return failed
+    fields, error = parse_category(request.get_json(), partial=True)
+    if error:
+        return jsonify({'error': error}), 400
+
+    for key, value in fields.items():
+        setattr(category, key, value)
+
     try:
         db.session.commit()
-        return jsonify(category.to_dict())
+        cache.invalidate('categories', f'category:{category_id}')
+        response = jsonify(category.to_dict())
+        response.set_etag(resource_etag(loaded_state(category, *COUNTER_COLUMNS)))
+        return response
     except IntegrityError:
         db.session.rollback()
         return jsonify({'error': 'Category name must be unique'}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'error': 'Category was modified concurrently'}), 409
 
 @bp.route('/<int:category_id>', methods=['DELETE'])
 def delete_category(category_id):
-    """Delete a category."""
+    """Delete a category.
+
+    With ``Prefer: respond-async`` its tasks are detached in batches by a
+    background job and the response is 202 pointing at the job. ``If-Match``
+    is honoured like in ``update_category``, and checked again by the job.
+    """
     category = Category.query.get_or_404(category_id)
-    
+    failed = precondition_failed(loaded_state(category, *COUNTER_COLUMNS))
+    if failed:
+        return failed
+    if wants_async():
+        payload = {'category_id': category_id}
+        if request.if_match:
+            # Re-checked by the job, in case the category changes while queued
+            payload['version'] = category.version
+        return accepted(enqueue('delete_category', payload))
+
     try:
         db.session.delete(category)
         db.session.commit()
+        cache.invalidate('categories', f'category:{category_id}')
         return '', 204
     except IntegrityError:
         db.session.rollback()
         return jsonify({'error': 'Cannot delete category with associated tasks'}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'error': 'Category was modified concurrently'}), 409
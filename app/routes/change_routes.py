@@ -0,0 +1,31 @@
+"""Change feed routes module."""
+from flask import Blueprint, current_app, request, jsonify
+from app.changes import ENTITIES, changes_since, current_cursor
+from app.listing import page_limit
+
+bp = Blueprint('changes', __name__, url_prefix='/api/changes')
+
+@bp.route('/', methods=['GET'])
+def get_changes():
+    """Get the task and category changes after ``?since=<cursor>``.
+
+    Without ``since`` no changes are returned, only the current cursor: a
+    client takes it, loads its snapshot, then polls from that cursor. Upserts
+    carry the row's current data; deletes are tombstones with just the id.
+    Pass the returned ``cursor`` as the next ``since``; ``has_more`` means
+    another page is ready right away.
+    """
+    entity = request.args.get('entity')
+    if entity is not None and entity not in ENTITIES:
+        return jsonify({'error': 'Invalid entity'}), 400
+
+    since = request.args.get('since')
+    if since is None:
+        return jsonify({'changes': [], 'cursor': current_cursor(), 'has_more': False})
+    try:
+        since = int(since)
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    changes, cursor, has_more = changes_since(since, page_limit(request.args, current_app.config), entity)
+    return jsonify({'changes': changes, 'cursor': cursor, 'has_more': has_more})
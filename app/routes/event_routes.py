@@ -0,0 +1,59 @@
+"""Server-Sent Events routes module."""
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from app.changes import changes_since
+from app.events import RESET, format_event
+from app.extensions import db, events
+
+bp = Blueprint('events', __name__, url_prefix='/api/events')
+
+@bp.route('/', methods=['GET'])
+def stream_events():
+    """Stream task and category change events as Server-Sent Events.
+
+    A reconnecting client sends ``Last-Event-ID`` and first receives the
+    changes it missed from the change log. Idle streams get a heartbeat
+    comment every ``EVENTS_HEARTBEAT`` seconds; a client that stops reading
+    receives a ``reset`` event and should resync from the change feed.
+    """
+    last_event_id = request.headers.get('Last-Event-ID')
+    if last_event_id is not None:
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+
+    heartbeat = current_app.config['EVENTS_HEARTBEAT']
+    batch_size = current_app.config['TASKS_MAX_PAGE_SIZE']
+    # Subscribe before replaying so no change slips between the two
+    subscription = events.subscribe()
+
+    def generate():
+        try:
+            yield f'retry: {int(heartbeat * 1000)}\n\n'
+            sent = last_event_id
+            has_more = sent is not None
+            while has_more:
+                changes, cursor, has_more = changes_since(sent, batch_size)
+                for change in changes:
+                    change.pop('data', None)
+                    yield format_event(change)
+                sent = cursor
+            # Release the connection; the stream may stay open for hours
+            db.session.remove()
+
+            while True:
+                event = subscription.get(heartbeat)
+                if event is RESET:
+                    yield 'event: reset\ndata: {}\n\n'
+                    return
+                if event is None:
+                    yield ': heartbeat\n\n'
+                elif sent is None or event['id'] > sent:
+                    yield format_event(event)
+        finally:
+            events.unsubscribe(subscription)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
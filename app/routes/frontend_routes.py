@@ -1,8 +1,44 @@
 """Frontend routes module."""
-from flask import Blueprint, render_template
+from flask import Blueprint, current_app, render_template
+from sqlalchemy import select
+from app.changes import current_cursor
+from app.extensions import cache, db
+from app.listing import encode_cursor
+from app.models.category import Category
+from app.models.task import Task
+from app.serialization import CATEGORY_FIELDS, TASK_FIELDS, fetch_dicts, select_fields
 
 bp = Blueprint('frontend', __name__)
 
+def _server_rendered():
+    return current_app.config['FRONTEND_RENDER'] == 'server'
+
+def _tasks_fragment():
+    """Render the first page of tasks plus the data the page script starts from."""
+    # Taken before the snapshot so the page's first sync cannot miss a write
+    change_cursor = current_cursor()
+    limit = current_app.config['TASKS_PAGE_SIZE']
+    task_rows = fetch_dicts(select_fields(Task, TASK_FIELDS).order_by(Task.created_at, Task.id).limit(limit + 1))
+    next_cursor = (encode_cursor(task_rows[limit - 1]['created_at'], task_rows[limit - 1]['id'])
+                   if len(task_rows) > limit else None)
+    category_rows = [dict(row) for row in db.session.execute(
+        select(Category.id, Category.name).order_by(Category.id)).mappings()]
+    return render_template(
+        'components/tasks_fragment.html',
+        tasks=task_rows[:limit],
+        bootstrap={
+            'tasks': task_rows[:limit],
+            'next_cursor': next_cursor,
+            'change_cursor': change_cursor,
+            'categories': category_rows
+        }
+    )
+
+def _categories_fragment():
+    """Render every category card."""
+    category_rows = fetch_dicts(select_fields(Category, CATEGORY_FIELDS).order_by(Category.id))
+    return render_template('components/categories_fragment.html', categories=category_rows)
+
 @bp.route('/')
 def home():
     """Render home page."""
@@ -10,10 +46,21 @@ def home():
 
 @bp.route('/categories')
 def categories():
-    """Render categories page."""
-    return render_template('categories.html')
+    """Render categories page.
+
+    In server-rendered mode the cards are embedded in the page; the rendered
+    fragment is cached until a category changes.
+    """
+    fragment = cache.fragment('categories', ['categories'], _categories_fragment) if _server_rendered() else None
+    return render_template('categories.html', fragment=fragment)
 
 @bp.route('/tasks')
 def tasks():
-    """Render tasks page."""
-    return render_template('tasks.html')
+    """Render tasks page.
+
+    In server-rendered mode the first page of tasks and the category list
+    are embedded in the page; the rendered fragment is cached until a task
+    or category changes.
+    """
+    fragment = cache.fragment('tasks', ['tasks', 'categories'], _tasks_fragment) if _server_rendered() else None
+    return render_template('tasks.html', fragment=fragment)
@@ -0,0 +1,44 @@
+"""Background job routes module."""
+import os
+from flask import Blueprint, current_app, request, jsonify, send_from_directory
+from sqlalchemy import select
+from app.extensions import db
+from app.jobs import SUBMITTABLE, accepted, enqueue
+from app.listing import page_limit
+from app.models.job import SUCCEEDED, Job
+
+bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+@bp.route('/', methods=['GET'])
+def get_jobs():
+    """Get the most recent jobs, optionally filtered by ``?status=``."""
+    statement = select(Job).order_by(Job.id.desc()).limit(page_limit(request.args, current_app.config))
+    if request.args.get('status'):
+        statement = statement.where(Job.status == request.args['status'])
+    return jsonify([job.to_dict() for job in db.session.scalars(statement)])
+
+@bp.route('/', methods=['POST'])
+def create_job():
+    """Queue a job of a client-submittable kind and return 202 with its location."""
+    data = request.get_json(silent=True) or {}
+    if data.get('kind') not in SUBMITTABLE:
+        return jsonify({'error': 'Invalid job kind'}), 400
+    payload = data.get('payload', {})
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Invalid job payload'}), 400
+    return accepted(enqueue(data['kind'], payload))
+
+@bp.route('/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get a job's status and progress."""
+    return jsonify(db.get_or_404(Job, job_id).to_dict())
+
+@bp.route('/<int:job_id>/download', methods=['GET'])
+def download_job_result(job_id):
+    """Download the file written by a finished job."""
+    job = db.get_or_404(Job, job_id)
+    result = job.to_dict()['result'] or {}
+    if job.status != SUCCEEDED or 'file' not in result:
+        return jsonify({'error': 'Job has no file to download'}), 404
+    return send_from_directory(os.path.abspath(current_app.config['JOBS_RESULT_DIR']), result['file'],
+                               as_attachment=True)
@@ -0,0 +1,59 @@
+"""Statistics routes module."""
+from collections import Counter
+from datetime import datetime, timedelta
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy import and_, case, func, select
+from app.extensions import cache, db
+from app.models.task import COMPLETED_STATUS, Task
+
+bp = Blueprint('stats', __name__, url_prefix='/api/stats')
+
+def _count_where(*conditions):
+    """Return an aggregate counting the grouped rows matching all ``conditions``."""
+    return func.sum(case((and_(*conditions), 1), else_=0))
+
+@bp.route('/', methods=['GET'])
+def get_stats():
+    """Get task counts by status, priority, category and due-date bucket.
+
+    All counts come from a single GROUP BY over (status, priority,
+    category_id), folded together in Python, so the task table is scanned
+    once and no rows are sent to the client.
+    """
+    days = request.args.get('due_soon_days', current_app.config['STATS_DUE_SOON_DAYS'], type=int)
+    now = datetime.utcnow()
+    is_open = Task.status != COMPLETED_STATUS
+    overdue = _count_where(is_open, Task.due_date < now)
+    due_soon = _count_where(is_open, Task.due_date >= now, Task.due_date < now + timedelta(days=days))
+    rows = db.session.execute(
+        select(Task.status, Task.priority, Task.category_id, func.count(), overdue, due_soon)
+        .group_by(Task.status, Task.priority, Task.category_id)
+    )
+
+    by_status, by_priority, by_category = Counter(), Counter(), Counter()
+    total = overdue_count = due_soon_count = 0
+    for status, priority, category_id, count, row_overdue, row_due_soon in rows:
+        by_status[status] += count
+        by_priority[priority] += count
+        by_category[category_id] += count
+        total += count
+        overdue_count += row_overdue
+        due_soon_count += row_due_soon
+
+    return jsonify({
+        'total': total,
+        'by_status': dict(by_status),
+        'by_priority': dict(by_priority),
+        'by_category': [
+            {'category_id': category_id, 'count': count}
+            for category_id, count in sorted(by_category.items(), key=lambda item: (item[0] is None, item[0] or 0))
+        ],
+        'overdue': overdue_count,
+        'due_soon': due_soon_count,
+        'due_soon_days': days
+    })
+
+@bp.route('/cache', methods=['GET'])
+def get_cache_stats():
+    """Get response cache hit/miss counters."""
+    return jsonify(cache.stats())
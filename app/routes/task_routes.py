@@ -1,56 +1,237 @@
 """Task routes module."""
-from datetime import datetime
-from flask import Blueprint, request, jsonify
+import os
+import uuid
+from datetime import datetime, timedelta
+from flask import Blueprint, current_app, request, jsonify, url_for
+from sqlalchemy import delete, insert, literal, select
 from sqlalchemy.exc import IntegrityError
-from app.extensions import db
-from app.models.task import Task
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
+from app.changes import record_changes
+from app.conditional import (apply_versions, collection_version, conditional, precondition_failed, resource_etag,
+                             row_version, stored_versions)
+from app.counters import track_bulk_delete, track_bulk_insert
+from app.extensions import cache, db
+from app.importer import FORMATS, import_tasks, iter_records
+from app.jobs import accepted, enqueue, wants_async
+from app.listing import (after_due_cursor, calendar_range, listing_clauses, next_page_headers, page_limit,
+                         task_filters)
+from app.models.change import DELETE
+from app.models.due_day import DueDay
+from app.models.task import COMPLETED_STATUS, Task
 from app.models.category import Category
+from app.routing import prefer_replica
+from app.search import search_tasks
+from app.services import commit_bulk_update
+from app.serialization import TASK_FIELDS, fetch_dicts, select_fields
+from app.streaming import NDJSON_MIMETYPE, ndjson_response, wants_ndjson
+from app.validation import is_id, parse_include, parse_task
 
 bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
+bp.before_request(prefer_replica)
+
+def _cache_tags(task_id=None):
+    """Return the cache tags a task read depends on."""
+    tags = ['tasks'] if task_id is None else [f'task:{task_id}']
+    if 'category' in request.args.get('include', ''):
+        tags.append('categories')
+    return tags
+
+def _version(task_id=None):
+    """Return the ETag version of a task read."""
+    version = collection_version(Task) if task_id is None else row_version(Task, task_id)
+    if version is not None and 'category' in request.args.get('include', ''):
+        version += '|' + collection_version(Category)
+    return version
 
 @bp.route('/', methods=['GET'])
+@conditional(_version, unless=wants_ndjson)
+@cache.cached(_cache_tags, unless=wants_ndjson)
 def get_tasks():
-    """Get all tasks."""
-    tasks = Task.query.all()
-    return jsonify([task.to_dict() for task in tasks])
+    """Get a page of tasks ordered by (created_at, id).
+
+    Supports ``status``, ``priority``, ``category_id``, ``due_after`` and
+    ``due_before`` filters. The cursor for the next page is returned in the
+    ``X-Next-Cursor`` header and passed back as ``?cursor=``. Clients sending
+    ``Accept: application/x-ndjson`` receive the full streamed export instead.
+    ``?include=category`` embeds each task's category.
+    """
+    if wants_ndjson():
+        return export_tasks()
+
+    limit = page_limit(request.args, current_app.config)
+
+    clauses, error = listing_clauses(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        include = parse_include(request.args.get('include'), ('category',))
+    except ValueError:
+        return jsonify({'error': 'Invalid include'}), 400
+
+    if 'category' in include:
+        tasks = [task.to_dict(include_category=True) for task in (
+            Task.query
+            .options(joinedload(Task.category))
+            .filter(*clauses)
+            .order_by(Task.created_at, Task.id)
+            .limit(limit + 1)
+        )]
+    else:
+        tasks = fetch_dicts(
+            select_fields(Task, TASK_FIELDS)
+            .where(*clauses)
+            .order_by(Task.created_at, Task.id)
+            .limit(limit + 1)
+        )
+
+    response = jsonify(tasks[:limit])
+    response.headers.update(next_page_headers(tasks, limit, request.args, url_for, endpoint='tasks.get_tasks'))
+    return response
+
+@bp.route('/export', methods=['GET'])
+def export_tasks():
+    """Stream all tasks matching the listing filters as NDJSON."""
+    try:
+        clauses = task_filters(request.args)
+    except ValueError:
+        return jsonify({'error': 'Invalid filter value'}), 400
+    return ndjson_response(select_fields(Task, TASK_FIELDS).where(*clauses).order_by(Task.id))
+
+@bp.route('/search', methods=['GET'])
+@cache.cached(lambda: ['tasks'])
+def search():
+    """Full-text search over task titles and descriptions.
+
+    Results are ranked best match first and paginated with ``limit`` and
+    ``offset``; the next offset is returned in ``X-Next-Offset``.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Query is required'}), 400
+
+    limit = page_limit(request.args, current_app.config)
+    offset = max(0, request.args.get('offset', 0, type=int))
+
+    tasks = search_tasks(query, limit + 1, offset)
+    response = jsonify([task.to_dict() for task in tasks[:limit]])
+    if len(tasks) > limit:
+        response.headers['X-Next-Offset'] = str(offset + limit)
+    return response
+
+def _due_tasks(*clauses):
+    """Return a page of open tasks matching ``clauses``, ordered by (due_date, id).
+
+    ``?status=`` selects one status instead of every open one. The next
+    page's cursor is returned like in ``get_tasks``.
+    """
+    limit = page_limit(request.args, current_app.config)
+    status = request.args.get('status')
+    # Spelled as a literal so SQLite can match the partial index of open tasks
+    clauses = [*clauses, Task.status == status if status else
+               Task.status != literal(COMPLETED_STATUS, literal_execute=True)]
+    if request.args.get('cursor'):
+        try:
+            clauses.append(after_due_cursor(request.args['cursor']))
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+    tasks = fetch_dicts(
+        select_fields(Task, TASK_FIELDS)
+        .where(*clauses)
+        .order_by(Task.due_date, Task.id)
+        .limit(limit + 1)
+    )
+    response = jsonify(tasks[:limit])
+    response.headers.update(
+        next_page_headers(tasks, limit, request.args, url_for, endpoint=request.endpoint, key='due_date')
+    )
+    return response
+
+@bp.route('/overdue', methods=['GET'])
+def get_overdue_tasks():
+    """Get open tasks past their due date, longest overdue first."""
+    return _due_tasks(Task.due_date < datetime.utcnow())
+
+@bp.route('/upcoming', methods=['GET'])
+def get_upcoming_tasks():
+    """Get open tasks due within the next ``?days=`` days, soonest first."""
+    days = request.args.get('days', current_app.config['UPCOMING_DAYS'], type=int)
+    if not 0 < days <= 366:
+        return jsonify({'error': 'Invalid days'}), 400
+    now = datetime.utcnow()
+    return _due_tasks(Task.due_date >= now, Task.due_date < now + timedelta(days=days))
+
+@bp.route('/calendar', methods=['GET'])
+@cache.cached(lambda: ['tasks'])
+def get_calendar():
+    """Get the number of tasks due on each day of a month, week or date range.
+
+    Counts come from the per-day buckets kept by ``app/counters.py``, so a
+    month costs one primary-key range read of at most 31 rows. Days without
+    tasks are included with zero counts.
+    """
+    try:
+        start, end = calendar_range(request.args)
+    except ValueError:
+        return jsonify({'error': 'Invalid calendar range'}), 400
+
+    buckets = {
+        day: (task_count, open_task_count)
+        for day, task_count, open_task_count in db.session.execute(
+            select(DueDay.day, DueDay.task_count, DueDay.open_task_count)
+            .where(DueDay.day >= start, DueDay.day < end)
+        )
+    }
+    days = []
+    for offset in range((end - start).days):
+        day = start + timedelta(days=offset)
+        task_count, open_task_count = buckets.get(day, (0, 0))
+        days.append({'date': day.isoformat(), 'task_count': task_count, 'open_task_count': open_task_count})
+    return jsonify({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'task_count': sum(day['task_count'] for day in days),
+        'open_task_count': sum(day['open_task_count'] for day in days),
+        'days': days
+    })
 
 @bp.route('/<int:task_id>', methods=['GET'])
+@conditional(_version)
+@cache.cached(_cache_tags)
 def get_task(task_id):
-    """Get a specific task."""
+    """Get a specific task, optionally with ``?include=category``."""
+    try:
+        include = parse_include(request.args.get('include'), ('category',))
+    except ValueError:
+        return jsonify({'error': 'Invalid include'}), 400
     task = Task.query.get_or_404(task_id)
-    return jsonify(task.to_dict())
+    return jsonify(task.to_dict('category' in include))
+
+def _missing_category_ids(category_ids):
+    """Return the given category ids that do not exist, using one IN query."""
+    wanted = {category_id for category_id in category_ids if category_id is not None}
+    if not wanted:
+        return set()
+    found = set(db.session.scalars(select(Category.id).where(Category.id.in_(wanted))))
+    return wanted - found
 
 @bp.route('/', methods=['POST'])
 def create_task():
     """Create a new task."""
-    data = request.get_json()
-
-    if not data.get('title'):
-        return jsonify({'error': 'Title is required'}), 400
-
-    # Validate category_id if provided
-    if data.get('category_id'):
-        category = Category.query.get(data['category_id'])
-        if not category:
-            return jsonify({'error': 'Invalid category ID'}), 400
-
-    task = Task(
-        title=data['title'],
-        description=data.get('description', ''),
-        priority=data.get('priority', 'medium'),
-        status=data.get('status', 'pending'),
-        category_id=data.get('category_id')
-    )
+    fields, error = parse_task(request.get_json())
+    if error:
+        return jsonify({'error': error}), 400
 
-    if data.get('due_date'):
-        try:
-            task.due_date = datetime.fromisoformat(data['due_date'])
-        except ValueError:
-            return jsonify({'error': 'Invalid date format'}), 400
+    if _missing_category_ids([fields['category_id']]):
+        return jsonify({'error': 'Invalid category ID'}), 400
+
+    task = Task(**fields)
 
     try:
         db.session.add(task)
         db.session.commit()
+        cache.invalidate('tasks')
         return jsonify(task.to_dict()), 201
     except IntegrityError:
         db.session.rollback()
@@ -58,37 +239,236 @@ def create_task():
 
 @bp.route('/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
-    """Update a task."""
+    """Update a task.
+
+    With ``If-Match`` the update only applies to the version of the task
+    that ETag names (412 otherwise); an update racing a concurrent write
+    gets 409.
+    """
     task = Task.query.get_or_404(task_id)
-    data = request.get_json()
-
-    if 'title' in data:
-        task.title = data['title']
-    if 'description' in data:
-        task.description = data['description']
-    if 'priority' in data:
-        task.priority = data['priority']
-    if 'status' in data:
-        task.status = data['status']
-    if 'category_id' in data:
-        task.category_id = data['category_id']
-    if 'due_date' in data:
-        try:
-            task.due_date = datetime.fromisoformat(data['due_date']) if data['due_date'] else None
-        except ValueError:
-            return jsonify({'error': 'Invalid date format'}), 400
+    failed = precondition_failed(task.version)
+    if failed:
+        return failed
+    fields, error = parse_task(request.get_json(), partial=True)
+    if error:
+        return jsonify({'error': error}), 400
+
+    if _missing_category_ids([fields.get('category_id')]):
+        return jsonify({'error': 'Invalid category ID'}), 400
+
+    for key, value in fields.items():
+        setattr(task, key, value)
 
     try:
         db.session.commit()
-        return jsonify(task.to_dict())
+        cache.invalidate('tasks', f'task:{task_id}')
+        response = jsonify(task.to_dict())
+        response.set_etag(resource_etag(task.version))
+        return response
     except IntegrityError:
         db.session.rollback()
         return jsonify({'error': 'Invalid category ID'}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'error': 'Task was modified concurrently'}), 409
 
 @bp.route('/<int:task_id>', methods=['DELETE'])
 def delete_task(task_id):
-    """Delete a task."""
+    """Delete a task, honouring ``If-Match`` like ``update_task``."""
     task = Task.query.get_or_404(task_id)
-    db.session.delete(task)
+    failed = precondition_failed(task.version)
+    if failed:
+        return failed
+    try:
+        db.session.delete(task)
+        db.session.commit()
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'error': 'Task was modified concurrently'}), 409
+    cache.invalidate('tasks', f'task:{task_id}')
+    return '', 204
+
+def _bulk_items():
+    """Return the JSON array body of a bulk request, or an error response."""
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({'error': 'Expected a non-empty JSON array'}), 400)
+    if len(items) > current_app.config['BULK_MAX_ITEMS']:
+        return None, (jsonify({'error': 'Too many items'}), 400)
+    return items, None
+
+def _bulk_errors(errors):
+    """Build the response reporting per-item validation errors."""
+    errors.sort(key=lambda item: item['index'])
+    return jsonify({'error': 'Validation failed', 'errors': errors}), 400
+
+def _validate_bulk(items, partial):
+    """Validate every item of a bulk create/update in a single pass.
+
+    Returns:
+        tuple: ``(rows, errors)`` where ``rows`` holds the parsed fields of
+        the valid items and ``errors`` holds ``{'index', 'error'}`` entries
+    """
+    parsed, errors = [], []
+    for index, item in enumerate(items):
+        fields, error = parse_task(item, partial=partial)
+        if not error and partial:
+            if not is_id(item.get('id')):
+                error = 'Task ID is required'
+            else:
+                fields['id'] = item['id']
+        if error:
+            errors.append({'index': index, 'error': error})
+        else:
+            parsed.append((index, fields))
+
+    missing_categories = _missing_category_ids(fields.get('category_id') for _, fields in parsed)
+    versions = stored_versions(Task, {fields['id'] for _, fields in parsed}) if partial else {}
+
+    rows = []
+    for index, fields in parsed:
+        if fields.get('category_id') in missing_categories:
+            errors.append({'index': index, 'error': 'Invalid category ID'})
+        elif partial and fields['id'] not in versions:
+            errors.append({'index': index, 'error': 'Task not found'})
+        else:
+            if partial and is_id(items[index].get('version')):
+                fields['version'] = items[index]['version']
+            rows.append(fields)
+    return apply_versions(rows, versions) if partial else rows, errors
+
+@bp.route('/bulk', methods=['POST'])
+def bulk_create_tasks():
+    """Create many tasks in one transaction.
+
+    The body is a JSON array of task payloads. Nothing is written unless
+    every item is valid; otherwise the per-item errors are returned.
+    """
+    items, error_response = _bulk_items()
+    if error_response:
+        return error_response
+
+    rows, errors = _validate_bulk(items, partial=False)
+    if errors:
+        return _bulk_errors(errors)
+
+    try:
+        track_bulk_insert(rows)
+        tasks = db.session.scalars(insert(Task).returning(Task, sort_by_parameter_order=True), rows).all()
+        record_changes(db.session, 'task', [task.id for task in tasks])
+        db.session.commit()
+        cache.invalidate('tasks')
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Database error'}), 400
+    return jsonify([task.to_dict() for task in tasks]), 201
+
+@bp.route('/bulk', methods=['PATCH'])
+def bulk_update_tasks():
+    """Update many tasks in one transaction.
+
+    The body is a JSON array of partial task payloads, each with an ``id``
+    and optionally the ``version`` it was edited from. Nothing is written
+    unless every item is valid and, with 409 otherwise, every task is still
+    at the expected version. With ``Prefer:
+    respond-async`` the update runs as a background job in batches and the
+    response is 202 pointing at the job.
+    """
+    items, error_response = _bulk_items()
+    if error_response:
+        return error_response
+
+    rows, errors = _validate_bulk(items, partial=True)
+    if errors:
+        return _bulk_errors(errors)
+    if wants_async():
+        return accepted(enqueue('bulk_update_tasks', {'items': items}))
+
+    now = datetime.utcnow()
+    for row in rows:
+        row['updated_at'] = now
+
+    try:
+        commit_bulk_update(rows)
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Database error'}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'error': 'Tasks were modified concurrently'}), 409
+
+    ids = [row['id'] for row in rows]
+    tasks = {task.id: task for task in db.session.scalars(select(Task).where(Task.id.in_(ids)))}
+    return jsonify([tasks[task_id].to_dict() for task_id in ids])
+
+@bp.route('/bulk', methods=['DELETE'])
+def bulk_delete_tasks():
+    """Delete many tasks in one transaction.
+
+    The body is a JSON array of task ids. Nothing is deleted unless every id
+    exists.
+    """
+    ids, error_response = _bulk_items()
+    if error_response:
+        return error_response
+
+    errors = [{'index': index, 'error': 'Task ID is required'}
+              for index, task_id in enumerate(ids) if not is_id(task_id)]
+    found = set(db.session.scalars(select(Task.id).where(Task.id.in_(
+        [task_id for task_id in ids if is_id(task_id)]))))
+    errors.extend({'index': index, 'error': 'Task not found'}
+                  for index, task_id in enumerate(ids) if is_id(task_id) and task_id not in found)
+    if errors:
+        return _bulk_errors(errors)
+
+    track_bulk_delete(found)
+    db.session.execute(delete(Task).where(Task.id.in_(found)))
+    record_changes(db.session, 'task', found, DELETE)
     db.session.commit()
+    cache.invalidate('tasks', *(f'task:{task_id}' for task_id in found))
     return '', 204
+
+def _import_source():
+    """Return ``(format, binary stream)`` of an import upload, or an error response."""
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        if upload is None:
+            return None, None, (jsonify({'error': 'File is required'}), 400)
+        name, mimetype, stream = upload.filename or '', upload.mimetype, upload.stream
+    else:
+        name, mimetype, stream = '', request.mimetype, request.stream
+
+    fmt = request.args.get('format')
+    if fmt is None:
+        if mimetype == 'text/csv' or name.endswith('.csv'):
+            fmt = 'csv'
+        elif mimetype == NDJSON_MIMETYPE or name.endswith(('.ndjson', '.jsonl')):
+            fmt = 'ndjson'
+    if fmt not in FORMATS:
+        return None, None, (jsonify({'error': 'Unsupported import format'}), 400)
+    return fmt, stream, None
+
+@bp.route('/import', methods=['POST'])
+def import_tasks_upload():
+    """Import tasks from an uploaded CSV or NDJSON file.
+
+    The body is either the raw file (``text/csv`` or ``application/x-ndjson``)
+    or a multipart form with a ``file`` field. It is parsed as it streams in
+    and inserted in batches; the response reports the imported and skipped
+    rows and the throughput. With ``Prefer: respond-async`` the upload is
+    saved and imported by a background job instead.
+    """
+    fmt, stream, error_response = _import_source()
+    if error_response:
+        return error_response
+
+    if wants_async():
+        directory = current_app.config['JOBS_RESULT_DIR']
+        os.makedirs(directory, exist_ok=True)
+        name = f'import-{uuid.uuid4().hex}.{fmt}'
+        with open(os.path.join(directory, name), 'wb') as output:
+            while chunk := stream.read(1 << 16):
+                output.write(chunk)
+        return accepted(enqueue('import_tasks', {'file': name, 'format': fmt}))
+
+    return jsonify(import_tasks(iter_records(stream, fmt))), 201
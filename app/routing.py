@@ -0,0 +1,77 @@
+"""Read/write routing between the primary database and a read replica.
+
+When ``SQLALCHEMY_BINDS`` has a ``replica`` entry, ``GET`` requests to the
+task and category APIs read from it while every write, and every read
+after a write in the same session, goes to the primary.
+
+Replicas lag. A request that commits writes hands the client the current
+change-log cursor (``app/changes.py``) in a cookie, and that client's reads
+stay on the primary until the replica's own cursor has caught up, so
+clients always see their own writes. Response cache keys of replica reads
+are qualified by the replica cursor, so data from a lagging replica is never
+cached under a key that up-to-date readers use.
+"""
+from flask import current_app, g, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import UpdateBase, column, func, select, table
+
+REPLICA_BIND = 'replica'
+READ_AFTER_COOKIE = 'read_after'
+
+# A lightweight handle on the change log: this module is imported by
+# app.extensions, before the models exist
+_change_ids = select(func.max(column('id'))).select_from(table('change'))
+
+class RoutingSession(Session):
+    """Session sending reads to the replica once ``use_replica`` is set in its info."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Select the replica for reads, the primary for anything else."""
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info['wrote'] = True
+        if (bind is None and self.info.get('use_replica') and not self.info.get('wrote')
+                and REPLICA_BIND in self._db.engines):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def replica_cursor():
+    """Return the latest change id the replica has applied."""
+    with current_app.extensions['sqlalchemy'].engines[REPLICA_BIND].connect() as connection:
+        return connection.scalar(_change_ids) or 0
+
+def _read_after():
+    """Return the change cursor the client must be able to read, or 0."""
+    try:
+        return int(request.cookies.get(READ_AFTER_COOKIE, 0))
+    except ValueError:
+        return 0
+
+def prefer_replica():
+    """Route a read-only request to the replica unless it lags behind the client."""
+    db = current_app.extensions['sqlalchemy']
+    if request.method not in ('GET', 'HEAD') or REPLICA_BIND not in db.engines:
+        return
+    cursor = replica_cursor()
+    if cursor < _read_after():
+        return
+    db.session.info['use_replica'] = True
+    g.replica_cursor = cursor
+
+def init_routing(flask_app):
+    """Reset routing per request and hand clients that wrote a read-your-writes cookie."""
+    db = flask_app.extensions['sqlalchemy']
+
+    @flask_app.before_request
+    def reset_routing():
+        db.session.info.pop('use_replica', None)
+        db.session.info.pop('wrote', None)
+
+    @flask_app.after_request
+    def set_read_after(response):
+        if REPLICA_BIND in db.engines and db.session.info.get('wrote'):
+            cursor = db.session.scalar(_change_ids) or 0
+            response.set_cookie(
+                READ_AFTER_COOKIE, str(cursor),
+                max_age=current_app.config['READ_AFTER_MAX_AGE'], httponly=True, samesite='Lax'
+            )
+        return response
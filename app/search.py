@@ -0,0 +1,70 @@
+"""Full-text search over tasks.
+
+On SQLite, task titles and descriptions are indexed in an FTS5 external
+content table kept in sync by triggers, so ORM writes, bulk statements and
+raw SQL all update the index. Other databases fall back to LIKE matching.
+"""
+from sqlalchemy import DDL, event, or_, select, text
+from app.extensions import db
+from app.models.task import Task
+
+FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+    "title, description, content='task', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+)
+
+# Title matches weigh more than description matches
+RANK_SQL = text(
+    'SELECT rowid FROM task_fts WHERE task_fts MATCH :query '
+    'ORDER BY bm25(task_fts, 10.0, 1.0) LIMIT :limit OFFSET :offset'
+)
+
+# Create and drop the index alongside the task table on SQLite
+for _statement in FTS_DDL:
+    event.listen(Task.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(Task.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS task_fts').execute_if(dialect='sqlite'))
+
+def rebuild_search_index():
+    """Create the index if missing and rebuild it from the task table."""
+    if db.engine.dialect.name != 'sqlite':
+        return
+    for statement in FTS_DDL:
+        db.session.execute(text(statement))
+    db.session.execute(text("INSERT INTO task_fts(task_fts) VALUES ('rebuild')"))
+    db.session.commit()
+
+def fts_query(query):
+    """Turn free text into an FTS5 query.
+
+    Each term is quoted so user input cannot inject FTS syntax; the last
+    term is a prefix match for search-as-you-type.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    if terms:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+def search_tasks(query, limit, offset=0):
+    """Return tasks matching ``query``, best matches first."""
+    if db.engine.dialect.name == 'sqlite':
+        ids = db.session.scalars(RANK_SQL, {'query': fts_query(query), 'limit': limit, 'offset': offset}).all()
+        tasks = {task.id: task for task in db.session.scalars(select(Task).where(Task.id.in_(ids)))}
+        return [tasks[task_id] for task_id in ids if task_id in tasks]
+
+    pattern = f'%{query}%'
+    return db.session.scalars(
+        select(Task)
+        .where(or_(Task.title.ilike(pattern), Task.description.ilike(pattern)))
+        .order_by(Task.id)
+        .limit(limit)
+        .offset(offset)
+    ).all()
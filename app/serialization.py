@@ -0,0 +1,24 @@
+"""Column-level serialization for list endpoints.
+
+Selecting plain columns skips ORM object hydration and ``to_dict()``; the
+resulting rows are already in the shape of the model's ``to_dict()``.
+"""
+from sqlalchemy import select
+from app.extensions import db
+
+TASK_FIELDS = (
+    'id', 'title', 'description', 'due_date', 'priority', 'status',
+    'category_id', 'created_at', 'updated_at', 'version'
+)
+CATEGORY_FIELDS = (
+    'id', 'name', 'description', 'task_count', 'open_task_count',
+    'created_at', 'updated_at', 'version'
+)
+
+def select_fields(model, fields):
+    """Select the serialized columns of ``model``."""
+    return select(*(getattr(model, name) for name in fields))
+
+def fetch_dicts(statement):
+    """Execute a column select and return its rows as dictionaries."""
+    return [dict(row) for row in db.session.execute(statement).mappings()]
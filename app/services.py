@@ -0,0 +1,24 @@
+"""Write operations shared by the HTTP routes and background jobs."""
+from sqlalchemy import update
+from app.changes import record_changes
+from app.counters import track_bulk_update
+from app.extensions import cache, db
+from app.models.task import Task
+
+def commit_bulk_update(rows):
+    """Apply and commit one bulk task UPDATE with its counters and change log.
+
+    Args:
+        rows (list): UPDATE parameters, each with an ``id`` and the
+            ``version`` it overwrites (see ``apply_versions``)
+
+    Raises:
+        IntegrityError: If a row violates a constraint
+        StaleDataError: If a task is no longer at the expected version;
+            either way the caller rolls the session back
+    """
+    track_bulk_update(rows)
+    db.session.execute(update(Task), rows)
+    record_changes(db.session, 'task', [row['id'] for row in rows])
+    db.session.commit()
+    cache.invalidate('tasks', *(f'task:{row["id"]}' for row in rows))
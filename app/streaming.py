@@ -0,0 +1,26 @@
+"""Streaming response helpers."""
+from flask import Response, current_app, request, stream_with_context
+from app.extensions import db
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_ndjson():
+    """Return True if the client prefers newline-delimited JSON."""
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+def ndjson_response(statement):
+    """Stream the column rows selected by ``statement`` as newline-delimited JSON.
+
+    Rows are fetched in batches of ``EXPORT_BATCH_SIZE`` with ``yield_per`` so
+    memory stays flat regardless of table size, and each batch is written as
+    a single chunk.
+    """
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+    dumps = current_app.json.dumps
+
+    def generate():
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        for batch in result.mappings().partitions():
+            yield ''.join(dumps(dict(row)) + '\n' for row in batch)
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,88 @@
+"""Request payload validation shared by the task and category endpoints."""
+from datetime import datetime
+
+TASK_FIELDS = ('title', 'description', 'priority', 'status', 'category_id', 'due_date')
+CATEGORY_FIELDS = ('name', 'description')
+
+def is_id(value):
+    """Return True if ``value`` is a JSON integer usable as an id or version.
+
+    ``bool`` is a subclass of ``int``, so ``true`` and ``false`` are
+    rejected explicitly.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def parse_task(data, partial=False):
+    """Validate a task payload.
+
+    Args:
+        data (dict): Decoded JSON payload
+        partial (bool): Only return the keys present in ``data``, as for an
+            update; otherwise fill in defaults, as for a create
+
+    Returns:
+        tuple: ``(fields, None)`` on success or ``(None, error_message)``
+    """
+    if not isinstance(data, dict):
+        return None, 'Invalid task payload'
+
+    if partial:
+        fields = {key: data[key] for key in TASK_FIELDS if key in data}
+    else:
+        if not data.get('title'):
+            return None, 'Title is required'
+        fields = {
+            'title': data['title'],
+            'description': data.get('description', ''),
+            'priority': data.get('priority', 'medium'),
+            'status': data.get('status', 'pending'),
+            'category_id': data.get('category_id'),
+            'due_date': data.get('due_date')
+        }
+
+    if 'category_id' in fields:
+        try:
+            fields['category_id'] = int(fields['category_id']) if fields['category_id'] else None
+        except (TypeError, ValueError):
+            return None, 'Invalid category ID'
+
+    if 'due_date' in fields:
+        try:
+            fields['due_date'] = datetime.fromisoformat(fields['due_date']) if fields['due_date'] else None
+        except (TypeError, ValueError):
+            return None, 'Invalid date format'
+
+    return fields, None
+
+def parse_category(data, partial=False):
+    """Validate a category payload.
+
+    Args:
+        data (dict): Decoded JSON payload
+        partial (bool): Only return the keys present in ``data``, as for an
+            update; otherwise fill in defaults, as for a create
+
+    Returns:
+        tuple: ``(fields, None)`` on success or ``(None, error_message)``
+    """
+    if not isinstance(data, dict):
+        return None, 'Invalid category payload'
+    if partial:
+        return {key: data[key] for key in CATEGORY_FIELDS if key in data}, None
+    if not data.get('name'):
+        return None, 'Name is required'
+    return {'name': data['name'], 'description': data.get('description', '')}, None
+
+def parse_include(value, allowed):
+    """Parse a comma-separated ``?include=`` value.
+
+    Returns:
+        set: The requested relations
+
+    Raises:
+        ValueError: If a relation is not in ``allowed``
+    """
+    include = {name.strip() for name in (value or '').split(',') if name.strip()}
+    if not include <= set(allowed):
+        raise ValueError('Invalid include')
+    return include
@@ -0,0 +1,10 @@
+"""ASGI entry point.
+
+Serve the async application with an ASGI server, for example::
+
+    hypercorn asgi:app
+    uvicorn asgi:app --workers 4
+"""
+from app.aio import create_asgi_app
+
+app = create_asgi_app()
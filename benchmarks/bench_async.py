@@ -0,0 +1,63 @@
+"""Compare the sync (WSGI) and async (ASGI) serving modes under load.
+
+Seeds a temporary SQLite file, then runs the same mixed workload (listing,
+single reads and creates) against the threaded Werkzeug server and against
+uvicorn serving ``asgi:app``.
+
+Usage:
+    python -m benchmarks.bench_async [--rows 10000] [--concurrency 32] [--seconds 10]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from app import create_app
+from app.extensions import db
+from app.models.task import Task
+from benchmarks.loadgen import free_port, run_load, start_server
+
+def workload(rows):
+    """Return a request factory mixing reads and writes 8:1:1."""
+    def make_request(index, counter):
+        step = (index + counter) % 10
+        if step == 0:
+            return 'POST', '/api/tasks/', {'title': f'Load {index}-{counter}'}
+        if step == 1:
+            return 'GET', f'/api/tasks/{(index * 7919 + counter) % rows + 1}', None
+        return 'GET', '/api/tasks/?limit=50', None
+    return make_request
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        uri = 'sqlite:///' + os.path.join(directory, 'bench.db')
+        flask_app = create_app({'SQLALCHEMY_DATABASE_URI': uri})
+        with flask_app.app_context():
+            db.create_all()
+            db.session.execute(db.insert(Task), [{'title': f'Task {i}'} for i in range(args.rows)])
+            db.session.commit()
+            db.engine.dispose()
+
+        env = {**os.environ, 'DATABASE_URL': uri, 'CACHE_BACKEND': 'null'}
+        modes = {
+            'sync': lambda port: [sys.executable, '-m', 'flask', '--app', 'app:create_app', 'run',
+                                  '--port', str(port), '--with-threads'],
+            'async': lambda port: [sys.executable, '-m', 'uvicorn', 'asgi:app',
+                                   '--port', str(port), '--log-level', 'warning']
+        }
+        results = {}
+        for mode, command in modes.items():
+            port = free_port()
+            with start_server(command(port), port, env):
+                results[mode] = run_load(f'http://127.0.0.1:{port}', workload(args.rows),
+                                         args.concurrency, args.seconds)
+        print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Measure concurrent read-modify-write throughput under contention.
+
+Writer threads repeatedly read a task, increment the counter kept in its
+title and write it back, spread over a few hot tasks. Three strategies are
+compared on a SQLite file with the production profile:
+
+* ``unconditional``: plain PUT; the row version only catches writes that
+  race between the server's read and its update (409), so increments made
+  between the client's GET and PUT are silently lost
+* ``serialized``: every read-modify-write holds one global lock, standing
+  in for funnelling writes through a single worker
+* ``optimistic``: PUT with ``If-Match``, retrying the cycle on 412/409
+
+Each reports completed increments per second, conflicts (retries) and lost
+updates (increments missing from the final counters).
+
+Usage:
+    python -m benchmarks.bench_concurrency [--writers 8] [--increments 200] [--tasks 4]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from app import create_app
+from app.extensions import db
+from app.migrations import upgrade_database
+
+def fresh_app(directory, name, hot_tasks):
+    """Return an app on a new SQLite file holding ``hot_tasks`` tasks titled '0'."""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, name)})
+    with app.app_context():
+        upgrade_database()
+        db.engine.dispose()
+    client = app.test_client()
+    ids = [client.post('/api/tasks/', json={'title': '0'}).json['id'] for _ in range(hot_tasks)]
+    return app, ids
+
+def increment(client, task_id, mode, lock):
+    """Add one to a task's counter; return the number of conflicts hit."""
+    conflicts = 0
+    while True:
+        if mode == 'serialized':
+            lock.acquire()
+        try:
+            response = client.get(f'/api/tasks/{task_id}')
+            headers = {'If-Match': response.headers['ETag']} if mode == 'optimistic' else {}
+            status = client.put(f'/api/tasks/{task_id}', headers=headers,
+                                json={'title': str(int(response.json['title']) + 1)}).status_code
+        finally:
+            if mode == 'serialized':
+                lock.release()
+        if status == 200:
+            return conflicts
+        if status not in (409, 412):
+            raise RuntimeError(f'Unexpected status {status}')
+        conflicts += 1
+
+def run(mode, writers, increments, hot_tasks, directory):
+    """Run one strategy and return its report."""
+    app, ids = fresh_app(directory, f'{mode}.db', hot_tasks)
+    lock = threading.Lock()
+    conflicts = []
+
+    def writer(seed):
+        client = app.test_client()
+        rng = random.Random(seed)
+        conflicts.append(sum(increment(client, rng.choice(ids), mode, lock) for _ in range(increments)))
+
+    threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    client = app.test_client()
+    applied = sum(int(client.get(f'/api/tasks/{task_id}').json['title']) for task_id in ids)
+    with app.app_context():
+        db.engine.dispose()
+    total = writers * increments
+    return {
+        'increments': total,
+        'seconds': round(seconds, 3),
+        'increments_per_sec': round(total / seconds, 1),
+        'conflicts': sum(conflicts),
+        'lost_updates': total - applied
+    }
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--increments', type=int, default=200)
+    parser.add_argument('--tasks', type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = {mode: run(mode, args.writers, args.increments, args.tasks, directory)
+                  for mode in ('unconditional', 'serialized', 'optimistic')}
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Measure the due-date endpoints on a large task table.
+
+Seeds a SQLite file with the production profile with ``--rows`` tasks whose
+due dates spread over four years around today (a quarter completed, a tenth
+undated), builds the day buckets with ``rebuild_due_days`` and times
+``/overdue``, ``/upcoming`` and ``/calendar`` with the response cache off.
+For comparison the month calendar is also computed by grouping the task
+table directly, which is what the day buckets replace.
+
+Usage:
+    python -m benchmarks.bench_due_dates [--rows 1000000] [--requests 200]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import case, func, insert, select, text
+from app import create_app
+from app.counters import rebuild_due_days
+from app.extensions import db
+from app.migrations import upgrade_database
+from app.models.task import COMPLETED_STATUS, Task
+
+def seed(rows, batch=50000):
+    """Insert ``rows`` synthetic tasks with core executemany."""
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    for start in range(0, rows, batch):
+        db.session.execute(insert(Task), [{
+            'title': f'Task {index}',
+            'status': COMPLETED_STATUS if index % 4 == 0 else ('pending', 'in_progress')[index % 2],
+            'priority': ('low', 'medium', 'high')[index % 3],
+            'due_date': None if index % 10 == 0 else now + timedelta(minutes=rng.randint(-1051200, 1051200)),
+            'created_at': now, 'updated_at': now, 'version': 1
+        } for index in range(start, min(start + batch, rows))])
+    db.session.commit()
+    db.session.execute(text('ANALYZE'))
+
+def timed(call, requests):
+    """Return p50/p95 milliseconds of ``requests`` calls."""
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {'p50_ms': round(statistics.median(samples), 2),
+            'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 2)}
+
+def get(client, url):
+    """Return a GET callable that fails loudly on errors."""
+    def call():
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f'{url}: {response.status_code}')
+    return call
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, 'due.db'),
+            'CACHE_BACKEND': 'null'
+        })
+        client = app.test_client()
+        month = datetime.utcnow().strftime('%Y-%m')
+        with app.app_context():
+            upgrade_database()
+            started = time.perf_counter()
+            seed(args.rows)
+            seed_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            days = rebuild_due_days()
+            rebuild_seconds = time.perf_counter() - started
+
+            first = datetime.strptime(month, '%Y-%m')
+            day = func.date(Task.due_date)
+            grouped = select(day, func.count(), func.sum(case((Task.status != COMPLETED_STATUS, 1), else_=0))) \
+                .where(Task.due_date >= first, Task.due_date < first + timedelta(days=31)).group_by(day)
+            report = {
+                'rows': args.rows,
+                'seed_seconds': round(seed_seconds, 2),
+                'rebuild_due_days': {'days': days, 'seconds': round(rebuild_seconds, 2)},
+                'overdue': timed(get(client, '/api/tasks/overdue'), args.requests),
+                'upcoming': timed(get(client, '/api/tasks/upcoming'), args.requests),
+                'upcoming_in_progress': timed(get(client, '/api/tasks/upcoming?status=in_progress'), args.requests),
+                'calendar_month': timed(get(client, f'/api/tasks/calendar?month={month}'), args.requests),
+                'calendar_year': timed(get(client, f'/api/tasks/calendar?start={first:%Y-%m-%d}'
+                                                   f'&end={first + timedelta(days=366):%Y-%m-%d}'), args.requests),
+                'calendar_month_grouped_from_tasks': timed(
+                    lambda: db.session.execute(grouped).all(), max(args.requests // 10, 1)
+                )
+            }
+            db.engine.dispose()
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Measure the cost of idle /api/events subscribers on the threaded server.
+
+Opens ``--subscribers`` idle SSE streams against a fresh server, then reports
+the server's resident memory and thread count per subscriber, the CPU it
+burns while every stream sits idle (heartbeats only), and how long one task
+write takes to reach every subscriber.
+
+Usage:
+    python -m benchmarks.bench_events [--subscribers 2000] [--idle 10]
+"""
+import argparse
+import http.client
+import json
+import os
+import selectors
+import socket
+import sys
+import tempfile
+import time
+from app import create_app
+from app.extensions import db
+from benchmarks.loadgen import free_port, start_server
+
+def process_stats(pid):
+    """Return ``(rss_kb, threads, cpu_seconds)`` of a process from /proc."""
+    rss = threads = None
+    with open(f'/proc/{pid}/status', encoding='ascii') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                rss = int(line.split()[1])
+            elif line.startswith('Threads:'):
+                threads = int(line.split()[1])
+    with open(f'/proc/{pid}/stat', encoding='ascii') as stat:
+        fields = stat.read().rsplit(')', 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    return rss, threads, cpu
+
+def open_streams(port, count):
+    """Open ``count`` SSE streams and return their sockets once each is subscribed."""
+    selector = selectors.DefaultSelector()
+    streams = []
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(b'GET /api/events/ HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n')
+        streams.append(sock)
+    pending = set(streams)
+    for sock in streams:
+        selector.register(sock, selectors.EVENT_READ)
+    while pending:
+        for key, _ in selector.select(timeout=30):
+            if b'retry:' in key.fileobj.recv(65536):
+                pending.discard(key.fileobj)
+    return selector, streams
+
+def wait_for_event(selector, streams, marker):
+    """Return seconds until every stream has received a chunk containing ``marker``."""
+    started = time.perf_counter()
+    waiting = set(streams)
+    while waiting:
+        for key, _ in selector.select(timeout=30):
+            if key.fileobj in waiting and marker in key.fileobj.recv(65536):
+                waiting.discard(key.fileobj)
+    return time.perf_counter() - started
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--subscribers', type=int, default=2000)
+    parser.add_argument('--idle', type=float, default=10, help='seconds to leave the streams idle')
+    parser.add_argument('--heartbeat', type=float, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        uri = 'sqlite:///' + os.path.join(directory, 'bench.db')
+        with create_app({'SQLALCHEMY_DATABASE_URI': uri}).app_context():
+            db.create_all()
+
+        port = free_port()
+        env = {**os.environ, 'DATABASE_URL': uri, 'EVENTS_HEARTBEAT': str(args.heartbeat)}
+        command = [sys.executable, '-m', 'flask', '--app', 'app:create_app', 'run',
+                   '--port', str(port), '--with-threads']
+        with start_server(command, port, env) as process:
+            base_rss, base_threads, _ = process_stats(process.pid)
+            selector, streams = open_streams(port, args.subscribers)
+            rss, threads, cpu_before = process_stats(process.pid)
+            time.sleep(args.idle)
+            _, _, cpu_after = process_stats(process.pid)
+
+            connection = http.client.HTTPConnection('127.0.0.1', port)
+            connection.request('POST', '/api/tasks/', body=json.dumps({'title': 'Fan-out'}),
+                               headers={'Content-Type': 'application/json'})
+            connection.getresponse().read()
+            fan_out = wait_for_event(selector, streams, b'"op": "upsert"')
+            for sock in streams:
+                sock.close()
+
+    subscribers = args.subscribers
+    print(json.dumps({
+        'subscribers': subscribers,
+        'rss_kb_per_subscriber': round((rss - base_rss) / subscribers, 1),
+        'threads': threads - base_threads,
+        'idle_cpu_percent': round((cpu_after - cpu_before) / args.idle * 100, 2),
+        'fan_out_ms': round(fan_out * 1000, 1)
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Compare bulk import throughput with creating tasks one POST at a time.
+
+Writes a synthetic CSV, then loads it into a fresh SQLite file with
+``import_tasks`` and, for a smaller sample, through ``POST /api/tasks/``
+in a loop (the previous migration path). Both report rows/sec.
+
+Usage:
+    python -m benchmarks.bench_import [--rows 100000] [--post-rows 2000] [--categories 50]
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from app import create_app
+from app.extensions import db
+from app.importer import import_tasks, iter_records
+
+def write_csv(path, rows, categories):
+    """Write ``rows`` synthetic tasks spread over ``categories`` category names."""
+    with open(path, 'w', newline='', encoding='utf-8') as output:
+        writer = csv.writer(output)
+        writer.writerow(['title', 'description', 'priority', 'status', 'due_date', 'category'])
+        for index in range(rows):
+            writer.writerow([
+                f'Task {index}', f'Imported task number {index}', ('low', 'medium', 'high')[index % 3],
+                'completed' if index % 4 == 0 else 'pending', f'2025-{index % 12 + 1:02d}-15T09:00:00',
+                f'Category {index % categories}'
+            ])
+
+def fresh_app(directory, name):
+    """Return an app bound to a new, empty SQLite file."""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, name)})
+    with app.app_context():
+        db.create_all()
+    return app
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--post-rows', type=int, default=2000)
+    parser.add_argument('--categories', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tasks.csv')
+        write_csv(path, args.rows, args.categories)
+
+        app = fresh_app(directory, 'import.db')
+        with app.app_context(), open(path, 'rb') as source:
+            report = import_tasks(iter_records(source, 'csv'))
+
+        app = fresh_app(directory, 'post.db')
+        client = app.test_client()
+        categories = {}
+        with open(path, newline='', encoding='utf-8') as source:
+            records = [row for _, row in zip(range(args.post_rows), csv.DictReader(source))]
+        started = time.perf_counter()
+        for record in records:
+            name = record.pop('category')
+            if name not in categories:
+                categories[name] = client.post('/api/categories/', json={'name': name}).json['id']
+            client.post('/api/tasks/', json={**record, 'category_id': categories[name]})
+        post_seconds = time.perf_counter() - started
+
+    print(json.dumps({
+        'import': {'rows': report['imported'], 'seconds': report['seconds'], 'rows_per_sec': report['rows_per_sec']},
+        'post_loop': {'rows': len(records), 'seconds': round(post_seconds, 3),
+                      'rows_per_sec': round(len(records) / post_seconds, 1)}
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark list serialization paths.
+
+Compares the original ORM + ``to_dict()`` + stdlib ``jsonify`` path with the
+column-tuple path under the stdlib and orjson providers.
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 20000] [--repeat 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from app import create_app
+from app.extensions import db
+from app.json_provider import JSONProvider, OrjsonProvider, orjson
+from app.models.task import Task
+from app.serialization import TASK_FIELDS, fetch_dicts, select_fields
+
+def seed(rows):
+    """Insert ``rows`` tasks in one executemany batch."""
+    start = datetime(2024, 1, 1)
+    db.session.execute(db.insert(Task), [
+        {
+            'title': f'Task {i}',
+            'description': 'Lorem ipsum dolor sit amet',
+            'due_date': start + timedelta(days=i % 90),
+            'priority': ('low', 'medium', 'high')[i % 3],
+            'status': ('pending', 'completed')[i % 2],
+            'created_at': start + timedelta(seconds=i),
+            'updated_at': start + timedelta(seconds=i)
+        }
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+def orm_to_dict():
+    """The original path: hydrate ORM objects and call to_dict() per row."""
+    return [task.to_dict() for task in Task.query.all()]
+
+def column_dicts():
+    """Select plain columns without ORM hydration."""
+    return fetch_dicts(select_fields(Task, TASK_FIELDS))
+
+def best_of(repeat, func):
+    """Return the fastest of ``repeat`` runs of ``func`` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        flask_app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(tmp, 'bench.db'),
+            'CACHE_BACKEND': 'null'
+        })
+        with flask_app.app_context(), flask_app.test_request_context():
+            db.create_all()
+            seed(args.rows)
+
+            providers = [('stdlib', JSONProvider(flask_app))]
+            if orjson is not None:
+                providers.append(('orjson', OrjsonProvider(flask_app)))
+
+            print(f'{args.rows} rows, best of {args.repeat}')
+            baseline = best_of(args.repeat, lambda: providers[0][1].response(orm_to_dict()))
+            print(f'  {"orm + to_dict + stdlib":<28} {baseline:8.1f} ms')
+            for name, provider in providers:
+                elapsed = best_of(args.repeat, lambda p=provider: p.response(column_dicts()))
+                print(f'  {"columns + " + name:<28} {elapsed:8.1f} ms  ({baseline / elapsed:.1f}x)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark concurrent read/write throughput per SQLite profile.
+
+Reader threads page through GET /api/tasks/ while writer threads POST new
+tasks against a file database, once per profile.
+
+Usage:
+    python -m benchmarks.bench_sqlite_concurrency [--readers 8] [--writers 2] [--seconds 5]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from app import create_app
+from app.extensions import db
+from app.models.task import Task
+
+def run(profile, args, directory):
+    """Return (reads, writes, errors) completed in ``args.seconds`` under ``profile``."""
+    flask_app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, f'{profile}.db'),
+        'SQLITE_PROFILE': profile,
+        'CACHE_BACKEND': 'null'
+    })
+    with flask_app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(Task), [{'title': f'Task {i}'} for i in range(args.rows)])
+        db.session.commit()
+
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.seconds
+
+    def worker(kind):
+        client = flask_app.test_client()
+        done = errors = 0
+        while time.monotonic() < deadline:
+            if kind == 'reads':
+                response = client.get('/api/tasks/?limit=50')
+            else:
+                response = client.post('/api/tasks/', json={'title': 'New task'})
+            if response.status_code < 400:
+                done += 1
+            else:
+                errors += 1
+        with lock:
+            counts[kind] += done
+            counts['errors'] += errors
+
+    threads = ([threading.Thread(target=worker, args=('reads',)) for _ in range(args.readers)]
+               + [threading.Thread(target=worker, args=('writes',)) for _ in range(args.writers)])
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    print(f'{args.readers} readers, {args.writers} writers, {args.seconds:g}s, {args.rows} rows')
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in ('default', 'production'):
+            counts = run(profile, args, directory)
+            print(f'  {profile:<11} reads/s {counts["reads"] / args.seconds:8.1f}'
+                  f'  writes/s {counts["writes"] / args.seconds:8.1f}'
+                  f'  errors {counts["errors"]}')
+
+if __name__ == '__main__':
+    main()
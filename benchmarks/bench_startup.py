@@ -0,0 +1,98 @@
+"""Track cold-start and test-fixture costs.
+
+Reports, as medians over ``--runs`` repetitions:
+
+* ``import_ms``: ``import app`` in a fresh interpreter
+* ``create_app_ms``: ``create_app()`` after the import
+* ``boot_create_all_ms`` / ``boot_migrations_ms``: bringing an up-to-date
+  database file online with ``db.create_all()`` versus the versioned
+  migration check
+* ``fixture_create_all_ms`` / ``fixture_template_ms``: preparing an
+  in-memory test database with ``create_all``/``drop_all`` versus copying
+  the template database
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from app import create_app
+from app.extensions import db
+from app.migrations import upgrade_database
+from tests.base import MEMORY_URI, template_database
+
+IMPORT_PROBE = 'import time; started = time.perf_counter(); import app; print(time.perf_counter() - started)'
+CREATE_PROBE = ('import time; from app import create_app; started = time.perf_counter(); create_app(); '
+                'print(time.perf_counter() - started)')
+
+def median_ms(samples):
+    """Return the median of ``samples`` seconds in milliseconds."""
+    return round(statistics.median(samples) * 1000, 2)
+
+def probe(code, runs):
+    """Time ``code`` in ``runs`` fresh interpreters; it prints its own duration."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return median_ms([
+        float(subprocess.run([sys.executable, '-c', code], cwd=root, check=True,
+                             capture_output=True, text=True).stdout)
+        for _ in range(runs)
+    ])
+
+def timed(func, runs):
+    """Return the median duration of ``func()`` over ``runs`` calls."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return median_ms(samples)
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    report = {'import_ms': probe(IMPORT_PROBE, args.runs), 'create_app_ms': probe(CREATE_PROBE, args.runs)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, 'boot.db')})
+        with app.app_context():
+            upgrade_database()
+            # Each boot starts from a fresh pool, as a new process would
+            def boot(init):
+                db.engine.dispose()
+                init()
+            report['boot_create_all_ms'] = timed(lambda: boot(db.create_all), args.runs)
+            report['boot_migrations_ms'] = timed(lambda: boot(upgrade_database), args.runs)
+            db.engine.dispose()
+
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': MEMORY_URI})
+    template = template_database()
+
+    def fixture_create_all():
+        with app.app_context():
+            db.create_all()
+            db.session.remove()
+            db.drop_all()
+
+    def fixture_template():
+        with app.app_context():
+            connection = db.engine.raw_connection()
+            try:
+                template.backup(connection.driver_connection)
+            finally:
+                connection.close()
+
+    report['fixture_create_all_ms'] = timed(fixture_create_all, args.runs)
+    report['fixture_template_ms'] = timed(fixture_template, args.runs)
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
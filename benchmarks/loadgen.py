@@ -0,0 +1,116 @@
+"""Minimal closed-loop HTTP load generator used by the benchmarks."""
+import contextlib
+import http.client
+import json
+import socket
+import subprocess
+import threading
+import time
+from urllib.parse import urlsplit
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(latencies, errors, elapsed):
+    """Summarize latencies in seconds into a JSON-serializable report."""
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2)
+    }
+
+def run_load(base_url, make_request, concurrency, duration):
+    """Drive ``base_url`` with ``concurrency`` keep-alive clients for ``duration`` seconds.
+
+    Args:
+        base_url (str): Server root, e.g. ``http://127.0.0.1:5000``
+        make_request (callable): Called with the worker index and a running
+            counter; returns ``(method, path, body)`` where ``body`` is
+            ``None``, raw ``bytes`` sent as-is, or a value sent as JSON
+        concurrency (int): Number of client threads
+        duration (float): Seconds to run
+
+    Returns:
+        dict: Request count, error count, requests/sec and p50/p95/p99 latency
+    """
+    parts = urlsplit(base_url)
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(index):
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        local, failed, counter = [], 0, 0
+        while time.monotonic() < deadline:
+            method, path, body = make_request(index, counter)
+            counter += 1
+            if body is None or isinstance(body, bytes):
+                payload, headers = body, {}
+            else:
+                payload, headers = json.dumps(body).encode(), {'Content-Type': 'application/json'}
+            started = time.perf_counter()
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    failed += 1
+                else:
+                    local.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, errors[0], time.monotonic() - started)
+
+def free_port():
+    """Return a TCP port that is free on localhost."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@contextlib.contextmanager
+def start_server(command, port, env, timeout=30):
+    """Run a server subprocess for the duration of the ``with`` block.
+
+    Waits until the server accepts connections before yielding the process,
+    and terminates it on exit.
+    """
+    with subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) as process:
+        try:
+            wait_for_port(process, command, port, timeout)
+            yield process
+        finally:
+            process.terminate()
+
+def wait_for_port(process, command, port, timeout):
+    """Block until ``port`` accepts connections or ``process`` exits."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited early: {" ".join(command)}')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Server did not start: {" ".join(command)}')
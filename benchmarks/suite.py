@@ -0,0 +1,234 @@
+"""API load-test and benchmark suite.
+
+Seeds a temporary SQLite file with a configurable volume of tasks and
+categories, serves it from a separate server process and drives every task
+and category endpoint with concurrent keep-alive clients, one endpoint at a
+time. Results (p50/p95/p99 latency, requests/sec, errors and the server's
+peak RSS) are written as JSON and can be compared with a saved baseline.
+
+Usage:
+    python -m benchmarks.suite --rows 100000 --output results.json
+    python -m benchmarks.suite --rows 100000 --baseline results.json --threshold 0.15
+    python -m benchmarks.suite --only tasks.list,tasks.get --env CACHE_BACKEND=null
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert
+from app import create_app
+from app.counters import rebuild_due_days, reconcile_category_counts
+from app.extensions import db
+from app.models.category import Category
+from app.models.task import Task
+from benchmarks.loadgen import free_port, run_load, start_server
+
+SEED_BATCH = 50000
+SPARE_CATEGORIES = 10000
+
+def seed(uri, rows, categories):
+    """Insert ``rows`` tasks spread over ``categories`` plus spare, empty categories.
+
+    Rows go in with Core bulk inserts, which skip the ORM hooks that keep the
+    category counters and per-day due buckets current, so both are rebuilt
+    once seeding is done. Due dates span the year around today so the
+    overdue, upcoming and calendar endpoints all have rows to return.
+    """
+    flask_app = create_app({'SQLALCHEMY_DATABASE_URI': uri})
+    start = datetime(2024, 1, 1)
+    first_due = datetime.combine(date.today(), datetime.min.time()) - timedelta(days=182)
+    with flask_app.app_context():
+        db.create_all()
+        db.session.execute(insert(Category.__table__), [
+            {'name': f'Category {i}', 'description': '', 'created_at': start, 'updated_at': start}
+            for i in range(categories + SPARE_CATEGORIES)
+        ])
+        for offset in range(0, rows, SEED_BATCH):
+            db.session.execute(insert(Task.__table__), [
+                {
+                    'title': f'Task {i} {("report", "groceries", "invoice", "meeting")[i % 4]}',
+                    'description': 'Seeded by the benchmark suite',
+                    'due_date': first_due + timedelta(days=i % 365),
+                    'priority': ('low', 'medium', 'high')[i % 3],
+                    'status': ('pending', 'completed')[i % 2],
+                    'category_id': i % categories + 1,
+                    'created_at': start + timedelta(seconds=i),
+                    'updated_at': start + timedelta(seconds=i)
+                }
+                for i in range(offset, min(rows, offset + SEED_BATCH))
+            ])
+            db.session.commit()
+        reconcile_category_counts()
+        rebuild_due_days()
+        db.engine.dispose()
+
+def scenarios(rows, categories, concurrency):
+    """Return ``{name: make_request}`` covering every task and category endpoint.
+
+    Destructive scenarios work on disjoint id ranges: single deletes walk
+    down from the last task, bulk deletes walk down from the middle and
+    category deletes only touch the spare, empty categories. Job submissions
+    are only queued; the benchmark server runs no worker unless one is
+    configured with ``--env JOBS_WORKER_THREADS=N``.
+    """
+    month = date.today().strftime('%Y-%m')
+    import_body = ''.join(
+        json.dumps({'title': f'Imported {n}', 'priority': 'low'}) + '\n' for n in range(100)).encode()
+
+    def unique(index, counter):
+        return counter * concurrency + index
+
+    def task_id(index, counter):
+        return (index * 7919 + counter * 104729) % rows + 1
+
+    def category_id(index, counter):
+        return (index + counter) % categories + 1
+
+    return {
+        'tasks.list': lambda i, c: ('GET', '/api/tasks/?limit=100', None),
+        'tasks.list_filtered': lambda i, c: (
+            'GET', f'/api/tasks/?limit=100&status=pending&category_id={category_id(i, c)}', None),
+        'tasks.list_include_category': lambda i, c: ('GET', '/api/tasks/?limit=100&include=category', None),
+        'tasks.get': lambda i, c: ('GET', f'/api/tasks/{task_id(i, c)}', None),
+        'tasks.search': lambda i, c: ('GET', '/api/tasks/search?q=invoice&limit=20', None),
+        'tasks.export': lambda i, c: ('GET', f'/api/tasks/export?category_id={category_id(i, c)}', None),
+        'tasks.overdue': lambda i, c: ('GET', '/api/tasks/overdue?limit=100', None),
+        'tasks.upcoming': lambda i, c: ('GET', '/api/tasks/upcoming?days=30&limit=100', None),
+        'tasks.calendar': lambda i, c: ('GET', f'/api/tasks/calendar?month={month}', None),
+        'tasks.create': lambda i, c: ('POST', '/api/tasks/', {'title': f'Bench {i}-{c}'}),
+        'tasks.update': lambda i, c: ('PUT', f'/api/tasks/{task_id(i, c)}', {'status': 'completed'}),
+        'tasks.bulk_create': lambda i, c: (
+            'POST', '/api/tasks/bulk', [{'title': f'Bulk {i}-{c}-{n}'} for n in range(100)]),
+        'tasks.bulk_update': lambda i, c: (
+            'PATCH', '/api/tasks/bulk',
+            [{'id': task_id(i, c * 100 + n), 'priority': 'high'} for n in range(100)]),
+        'tasks.delete': lambda i, c: ('DELETE', f'/api/tasks/{rows - unique(i, c)}', None),
+        'tasks.bulk_delete': lambda i, c: (
+            'DELETE', '/api/tasks/bulk',
+            [rows // 2 - unique(i, c) * 100 - n for n in range(100)]),
+        'tasks.import': lambda i, c: ('POST', '/api/tasks/import?format=ndjson', import_body),
+        'categories.list': lambda i, c: ('GET', '/api/categories/', None),
+        'categories.list_include_tasks': lambda i, c: ('GET', '/api/categories/?include=tasks', None),
+        'categories.get': lambda i, c: ('GET', f'/api/categories/{category_id(i, c)}', None),
+        'categories.export': lambda i, c: ('GET', '/api/categories/export', None),
+        'categories.create': lambda i, c: ('POST', '/api/categories/', {'name': f'Bench {i}-{c}'}),
+        'categories.update': lambda i, c: (
+            'PUT', f'/api/categories/{category_id(i, c)}', {'description': f'Updated {c}'}),
+        'categories.delete': lambda i, c: (
+            'DELETE', f'/api/categories/{categories + 1 + unique(i, c) % SPARE_CATEGORIES}', None),
+        'stats': lambda i, c: ('GET', '/api/stats/', None),
+        'jobs.list': lambda i, c: ('GET', '/api/jobs/?limit=100', None),
+        'jobs.submit': lambda i, c: ('POST', '/api/jobs/', {'kind': 'reconcile_category_counts'}),
+    }
+
+def peak_rss_kb(pid):
+    """Return the peak resident set size of a process in KiB, if the OS exposes it."""
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def compare(results, baseline, threshold):
+    """Print per-endpoint deltas against ``baseline``; return the regressed endpoints."""
+    regressions = []
+    print(f'{"endpoint":<32} {"rps":>10} {"Δrps":>8} {"p95 ms":>10} {"Δp95":>8}')
+    for name, current in results['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if previous is None:
+            print(f'{name:<32} {current["rps"]:>10} {"new":>8} {current["p95_ms"]:>10} {"new":>8}')
+            continue
+        rps_delta = (current['rps'] - previous['rps']) / previous['rps'] if previous['rps'] else 0.0
+        p95_delta = (current['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] if previous['p95_ms'] else 0.0
+        print(f'{name:<32} {current["rps"]:>10} {rps_delta:>+8.1%} {current["p95_ms"]:>10} {p95_delta:>+8.1%}')
+        if rps_delta < -threshold or p95_delta > threshold:
+            regressions.append(name)
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000, help='tasks to seed (10k-1M)')
+    parser.add_argument('--categories', type=int, default=100, help='categories holding the seeded tasks')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5, help='duration per endpoint')
+    parser.add_argument('--mode', choices=('sync', 'async'), default='sync')
+    parser.add_argument('--only', help='comma-separated endpoint names to run')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='config override passed to the server environment')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--baseline', help='JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative rps drop or p95 rise that counts as a regression')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    selected = scenarios(args.rows, args.categories, args.concurrency)
+    if args.only:
+        selected = {name: selected[name] for name in args.only.split(',')}
+    if args.mode == 'async':
+        # The async blueprints only expose CRUD and the paginated listing
+        selected = {name: request for name, request in selected.items()
+                    if name.split('.')[1] in ('list', 'list_filtered', 'get', 'create', 'update', 'delete')}
+
+    with tempfile.TemporaryDirectory() as directory:
+        uri = 'sqlite:///' + os.path.join(directory, 'bench.db')
+        started = time.perf_counter()
+        seed(uri, args.rows, args.categories)
+        seed_seconds = time.perf_counter() - started
+
+        port = free_port()
+        env = {**os.environ, **dict(item.split('=', 1) for item in args.env), 'DATABASE_URL': uri}
+        if args.mode == 'sync':
+            command = [sys.executable, '-m', 'flask', '--app', 'app:create_app', 'run',
+                       '--port', str(port), '--with-threads']
+        else:
+            command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port), '--log-level', 'warning']
+        with start_server(command, port, env) as process:
+            endpoints = {}
+            for name, make_request in selected.items():
+                endpoints[name] = run_load(f'http://127.0.0.1:{port}', make_request, args.concurrency, args.seconds)
+                print(f'{name:<32} {endpoints[name]["rps"]:>8} rps  p99 {endpoints[name]["p99_ms"]} ms',
+                      file=sys.stderr)
+            rss = peak_rss_kb(process.pid)
+
+    results = {
+        'meta': {
+            'rows': args.rows,
+            'categories': args.categories,
+            'concurrency': args.concurrency,
+            'seconds': args.seconds,
+            'mode': args.mode,
+            'env': args.env,
+            'seed_seconds': round(seed_seconds, 2),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.utcnow().isoformat()
+        },
+        'server': {'peak_rss_kb': rss},
+        'endpoints': endpoints
+    }
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(report + '\n')
+    else:
+        print(report)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        if regressions:
+            print(f'Regressed: {", ".join(regressions)}', file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
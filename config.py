@@ -8,4 +8,98 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'app.db')
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Optional read replica (see app/routing.py): GET requests to the task and
+    # category APIs read from it, except for clients whose own writes it has
+    # not applied yet; they are tracked for READ_AFTER_MAX_AGE seconds
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    READ_AFTER_MAX_AGE = int(os.environ.get('READ_AFTER_MAX_AGE', 300))
+
+    # Keyset pagination for GET /api/tasks/
+    TASKS_PAGE_SIZE = int(os.environ.get('TASKS_PAGE_SIZE', 100))
+    TASKS_MAX_PAGE_SIZE = int(os.environ.get('TASKS_MAX_PAGE_SIZE', 1000))
+
+    # Rows fetched per round-trip by the NDJSON export endpoints
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+
+    # Maximum number of items accepted by the /api/tasks/bulk endpoints
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 1000))
+
+    # Window used by /api/stats for the "due soon" bucket
+    STATS_DUE_SOON_DAYS = int(os.environ.get('STATS_DUE_SOON_DAYS', 3))
+
+    # Default window of GET /api/tasks/upcoming, in days
+    UPCOMING_DAYS = int(os.environ.get('UPCOMING_DAYS', 7))
+
+    # Bulk import (flask import-tasks, POST /api/tasks/import): rows per insert
+    # batch and the number of per-row errors kept in the report
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 5000))
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 100))
+
+    # Frontend pages: 'server' embeds the first page of data in the HTML
+    # (fragments cached by data version); 'client' serves empty shells
+    FRONTEND_RENDER = os.environ.get('FRONTEND_RENDER', 'server')
+
+    # Response cache: 'memory' (in-process LRU), 'redis' or 'null'
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_TTL = int(os.environ.get('CACHE_TTL', 60))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+    # Change events pushed over /api/events: 'memory' (one worker) or 'redis'
+    # (fan-out across workers). A subscriber with more than EVENTS_MAX_PENDING
+    # undelivered events is reset; idle streams get a heartbeat comment.
+    EVENTS_BACKEND = os.environ.get('EVENTS_BACKEND', 'memory')
+    EVENTS_REDIS_URL = os.environ.get('EVENTS_REDIS_URL', 'redis://localhost:6379/0')
+    EVENTS_MAX_PENDING = int(os.environ.get('EVENTS_MAX_PENDING', 100))
+    EVENTS_HEARTBEAT = float(os.environ.get('EVENTS_HEARTBEAT', 15))
+
+    # Background jobs (see app/jobs.py). JOBS_WORKER_THREADS > 0 runs a worker
+    # pool inside the web process; otherwise run `flask jobs-worker`.
+    JOBS_WORKER_THREADS = int(os.environ.get('JOBS_WORKER_THREADS', 0))
+    JOBS_POLL_INTERVAL = float(os.environ.get('JOBS_POLL_INTERVAL', 1.0))
+    JOBS_BATCH_SIZE = int(os.environ.get('JOBS_BATCH_SIZE', 500))
+    JOBS_STALE_SECONDS = int(os.environ.get('JOBS_STALE_SECONDS', 300))
+    JOBS_MAX_ATTEMPTS = int(os.environ.get('JOBS_MAX_ATTEMPTS', 3))
+    JOBS_RESULT_DIR = os.environ.get('JOBS_RESULT_DIR') or os.path.join(basedir, 'job_results')
+
+    # Response compression (see app/compression.py): text bodies of at least
+    # COMPRESS_MIN_SIZE bytes are gzip/brotli encoded per Accept-Encoding;
+    # COMPRESS_CACHE_ENTRIES compressed bodies are reused by ETag or digest
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 5))
+    COMPRESS_CACHE_ENTRIES = int(os.environ.get('COMPRESS_CACHE_ENTRIES', 256))
+
+    # Static assets (see app/assets.py): content-hashed copies and precompressed
+    # variants are built into ASSETS_BUILD_DIR at startup and served with a
+    # far-future Cache-Control of ASSETS_MAX_AGE seconds
+    ASSETS_HASHED = os.environ.get('ASSETS_HASHED', 'true').lower() in ('1', 'true', 'yes')
+    ASSETS_BUILD_DIR = os.environ.get('ASSETS_BUILD_DIR') or os.path.join(basedir, 'build', 'static')
+    ASSETS_MAX_AGE = int(os.environ.get('ASSETS_MAX_AGE', 31536000))
+
+    # JSON encoder: 'auto' (orjson when installed), 'orjson' or 'stdlib'
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+
+    # SQLite engine profile ('production' or 'default'); see app/sqlite_profile.py.
+    # SQLITE_PRAGMAS entries override the profile's pragmas.
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+    SQLITE_PRAGMAS = {}
+
+    # Per-request instrumentation (see app/instrumentation.py)
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', '').lower() in ('1', 'true', 'yes')
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', '').lower() in ('1', 'true', 'yes')
+    METRICS_PATH = os.environ.get('METRICS_PATH', '/metrics')
+
+    # Sampling profiler middleware (see app/profiler.py); capture is started
+    # through POST /admin/profiler/start with the PROFILER_TOKEN in an
+    # X-Admin-Token header, which enabling the profiler requires
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', 0.01))
+    PROFILER_DIR = os.environ.get('PROFILER_DIR') or os.path.join(basedir, 'profiles')
+    PROFILER_MAX_FILES = int(os.environ.get('PROFILER_MAX_FILES', 100))
+    PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN', '')
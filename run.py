@@ -1,10 +1,10 @@
 """Application entry point."""
 from app import create_app
-from app.extensions import db
+from app.migrations import upgrade_database
 
 app = create_app()
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
-    app.run(debug=True)
\ No newline at end of file
+        upgrade_database()
+    app.run(debug=True)
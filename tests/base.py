@@ -1,22 +1,61 @@
 """Base test configuration module."""
+import sqlite3
 import unittest
 from app import create_app, db
+from app.migrations import upgrade_database
+
+MEMORY_URI = 'sqlite:///:memory:'
+_template = None
+
+def template_database():
+    """Return an in-memory database holding the migrated schema, built once per run."""
+    global _template  # pylint: disable=global-statement
+    if _template is None:
+        app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': MEMORY_URI})
+        with app.app_context():
+            upgrade_database()
+            _template = sqlite3.connect(':memory:', check_same_thread=False)
+            connection = db.engine.raw_connection()
+            try:
+                connection.driver_connection.backup(_template)
+            finally:
+                connection.close()
+            db.engine.dispose()
+    return _template
 
 class BaseTestCase(unittest.TestCase):
     """Base test class."""
 
+    # Extra settings applied by subclasses before the app is created
+    config_overrides = {}
+
     def setUp(self):
-        """Set up test environment."""
-        self.app = create_app()
-        self.app.config['TESTING'] = True
-        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        """Set up test environment.
+
+        In-memory databases are filled by copying the template database with
+        SQLite's backup API instead of creating the schema for every test.
+        """
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': MEMORY_URI,
+            **self.config_overrides
+        })
         self.client = self.app.test_client()
         self.ctx = self.app.app_context()
         self.ctx.push()
-        db.create_all()
+        if self.app.config['SQLALCHEMY_DATABASE_URI'] == MEMORY_URI:
+            connection = db.engine.raw_connection()
+            try:
+                template_database().backup(connection.driver_connection)
+            finally:
+                connection.close()
+        else:
+            db.create_all(bind_key=None)
 
     def tearDown(self):
         """Clean up test environment."""
         db.session.remove()
-        db.drop_all()
+        if self.app.config['SQLALCHEMY_DATABASE_URI'] != MEMORY_URI:
+            db.drop_all(bind_key=None)
+        db.engine.dispose()
         self.ctx.pop()
@@ -0,0 +1,109 @@
+"""Test module for the async (ASGI) routes."""
+import importlib.util
+import unittest
+from app.extensions import db
+
+ASYNC_AVAILABLE = all(importlib.util.find_spec(name) for name in ('quart', 'aiosqlite'))
+
+@unittest.skipUnless(ASYNC_AVAILABLE, 'async serving dependencies are not installed')
+class TestAsyncRoutes(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the async task and category routes."""
+
+    async def asyncSetUp(self):
+        """Set up test environment."""
+        from app.aio import create_asgi_app  # pylint: disable=import-outside-toplevel
+        self.app = create_asgi_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
+        self.engine = self.app.extensions['async_engine']
+        async with self.engine.begin() as connection:
+            await connection.run_sync(db.metadata.create_all)
+        self.client = self.app.test_client()
+
+    async def asyncTearDown(self):
+        """Clean up test environment."""
+        await self.engine.dispose()
+
+    async def test_task_crud(self):
+        """Test the task lifecycle through the async routes."""
+        response = await self.client.post('/api/categories/', json={'name': 'Work'})
+        self.assertEqual(response.status_code, 201)
+        category_id = (await response.get_json())['id']
+
+        response = await self.client.post('/api/tasks/', json={
+            'title': 'Task', 'category_id': category_id, 'due_date': '2024-06-01T09:00:00'
+        })
+        self.assertEqual(response.status_code, 201)
+        task = await response.get_json()
+        self.assertEqual(task['due_date'], '2024-06-01T09:00:00')
+
+        response = await self.client.put(f'/api/tasks/{task["id"]}', json={'status': 'completed'})
+        self.assertEqual((await response.get_json())['status'], 'completed')
+
+        response = await self.client.get(f'/api/tasks/{task["id"]}')
+        self.assertEqual((await response.get_json())['status'], 'completed')
+
+        response = await self.client.delete(f'/api/tasks/{task["id"]}')
+        self.assertEqual(response.status_code, 204)
+        response = await self.client.get(f'/api/tasks/{task["id"]}')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_if_match(self):
+        """Test the async writes honour If-Match like the sync ones."""
+        task = await (await self.client.post('/api/tasks/', json={'title': 'Task'})).get_json()
+        url = f'/api/tasks/{task["id"]}'
+        etag = (await self.client.get(url)).headers['ETag']
+
+        response = await self.client.put(url, json={'title': 'First'}, headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'], (await self.client.get(url)).headers['ETag'])
+        response = await self.client.put(url, json={'title': 'Second'}, headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual((await self.client.delete(url, headers={'If-Match': etag})).status_code, 412)
+        self.assertEqual((await (await self.client.get(url)).get_json())['title'], 'First')
+
+        category = await (await self.client.post('/api/categories/', json={'name': 'Work'})).get_json()
+        url = f'/api/categories/{category["id"]}'
+        etag = (await self.client.get(url)).headers['ETag']
+        await self.client.post('/api/tasks/', json={'title': 'Other', 'category_id': category['id']})
+        response = await self.client.put(url, json={'name': 'Office'}, headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual((await self.client.delete(url, headers={'If-Match': etag})).status_code, 412)
+
+    async def test_shared_validation(self):
+        """Test the async routes return the same validation errors as the sync ones."""
+        response = await self.client.post('/api/tasks/', json={'description': 'No title'})
+        self.assertEqual((await response.get_json())['error'], 'Title is required')
+        response = await self.client.post('/api/tasks/', json={'title': 'Task', 'category_id': 999})
+        self.assertEqual((await response.get_json())['error'], 'Invalid category ID')
+        response = await self.client.post('/api/categories/', json={})
+        self.assertEqual((await response.get_json())['error'], 'Name is required')
+        await self.client.post('/api/categories/', json={'name': 'Work'})
+        response = await self.client.post('/api/categories/', json={'name': 'Work'})
+        self.assertEqual((await response.get_json())['error'], 'Category name must be unique')
+        response = await self.client.get('/api/tasks/?cursor=bad')
+        self.assertEqual((await response.get_json())['error'], 'Invalid cursor')
+        response = await self.client.get('/api/tasks/?category_id=abc')
+        self.assertEqual((await response.get_json())['error'], 'Invalid filter value')
+
+    async def test_task_pagination(self):
+        """Test keyset pagination through the async listing."""
+        for i in range(3):
+            await self.client.post('/api/tasks/', json={'title': f'Task {i}'})
+        response = await self.client.get('/api/tasks/?limit=2')
+        self.assertEqual(len(await response.get_json()), 2)
+        cursor = response.headers['X-Next-Cursor']
+        response = await self.client.get(f'/api/tasks/?limit=2&cursor={cursor}')
+        self.assertEqual([t['title'] for t in await response.get_json()], ['Task 2'])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    async def test_delete_category_detaches_tasks(self):
+        """Test deleting a category with tasks under asyncio."""
+        category_id = (await (await self.client.post('/api/categories/', json={'name': 'Work'})).get_json())['id']
+        task_id = (await (await self.client.post(
+            '/api/tasks/', json={'title': 'Task', 'category_id': category_id})).get_json())['id']
+        response = await self.client.delete(f'/api/categories/{category_id}')
+        self.assertEqual(response.status_code, 204)
+        response = await self.client.get(f'/api/tasks/{task_id}')
+        self.assertIsNone((await response.get_json())['category_id'])
@@ -0,0 +1,149 @@
+"""Test module for the response cache."""
+import json
+import unittest
+from unittest import mock
+from tests.base import BaseTestCase
+from app.cache import LRUBackend, RedisBackend
+
+class FakeRedis:
+    """Minimal in-memory stand-in for a redis client."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):  # pylint: disable=unused-argument
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def scan_iter(self, pattern):
+        return [key for key in list(self.data) if key.startswith(pattern.rstrip('*'))]
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+class TestLRUBackend(unittest.TestCase):
+    """Test cases for the in-process LRU backend."""
+
+    def test_evicts_least_recently_used(self):
+        """Test size-bounded eviction."""
+        backend = LRUBackend(max_entries=2, ttl=0)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')
+        backend.set('c', 3)
+        self.assertEqual(backend.get('a'), 1)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(len(backend), 2)
+
+    def test_expires_entries(self):
+        """Test entries expire after the TTL."""
+        backend = LRUBackend(max_entries=2, ttl=10)
+        with mock.patch('app.cache.time.monotonic', return_value=100):
+            backend.set('a', 1)
+        with mock.patch('app.cache.time.monotonic', return_value=105):
+            self.assertEqual(backend.get('a'), 1)
+        with mock.patch('app.cache.time.monotonic', return_value=111):
+            self.assertIsNone(backend.get('a'))
+
+    def test_counters_survive_eviction(self):
+        """Test tag versions are not evicted with entries."""
+        backend = LRUBackend(max_entries=1, ttl=0)
+        backend.incr('tag:tasks')
+        backend.set('a', 1)
+        backend.set('b', 2)
+        self.assertEqual(backend.get_counters(['tag:tasks', 'tag:other']), [1, 0])
+
+class TestResponseCache(BaseTestCase):
+    """Test cases for cached read endpoints."""
+
+    def _create_category(self, name):
+        return self.client.post(
+            '/api/categories/',
+            data=json.dumps({'name': name}),
+            content_type='application/json'
+        ).json['id']
+
+    def test_get_is_cached_until_mutation(self):
+        """Test repeated reads hit the cache and writes invalidate it."""
+        category_id = self._create_category('Work')
+        self.assertEqual(self.client.get('/api/categories/').headers['X-Cache'], 'MISS')
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.headers['X-Cache'], 'HIT')
+        self.assertEqual(response.json[0]['name'], 'Work')
+
+        self.client.put(
+            f'/api/categories/{category_id}',
+            data=json.dumps({'name': 'Office'}),
+            content_type='application/json'
+        )
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertEqual(response.json[0]['name'], 'Office')
+
+        stats = self.client.get('/api/stats/cache').json
+        self.assertEqual(stats['backend'], 'memory')
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_invalidation_is_precise(self):
+        """Test a task write leaves unrelated entries cached."""
+        task_id = self.client.post(
+            '/api/tasks/',
+            data=json.dumps({'title': 'Task'}),
+            content_type='application/json'
+        ).json['id']
+        self.client.get(f'/api/tasks/{task_id}')
+        self.client.get('/api/categories/')
+        self.client.post(
+            '/api/tasks/',
+            data=json.dumps({'title': 'Other'}),
+            content_type='application/json'
+        )
+        self.assertEqual(self.client.get(f'/api/tasks/{task_id}').headers['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get('/api/categories/').headers['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get('/api/categories/?include=tasks').headers['X-Cache'], 'MISS')
+
+    def test_category_delete_invalidates_tasks(self):
+        """Test tasks detached by a category delete are not served from cache."""
+        category_id = self._create_category('Work')
+        self.client.post('/api/tasks/', json={'title': 'Alpha', 'category_id': category_id})
+        self.client.get('/api/tasks/search?q=alpha')
+        self.assertEqual(self.client.get('/api/tasks/search?q=alpha').headers['X-Cache'], 'HIT')
+
+        self.client.delete(f'/api/categories/{category_id}')
+        response = self.client.get('/api/tasks/search?q=alpha')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertIsNone(response.json[0]['category_id'])
+
+    def test_cached_response_keeps_headers(self):
+        """Test pagination headers are replayed from the cache."""
+        for title in ('One', 'Two'):
+            self.client.post(
+                '/api/tasks/',
+                data=json.dumps({'title': title}),
+                content_type='application/json'
+            )
+        first = self.client.get('/api/tasks/?limit=1')
+        second = self.client.get('/api/tasks/?limit=1')
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(second.headers['X-Next-Cursor'], first.headers['X-Next-Cursor'])
+        self.assertEqual(second.mimetype, 'application/json')
+
+    def test_shared_backend(self):
+        """Test the shared backend with a local stand-in client."""
+        self.app.extensions['cache'].backend = RedisBackend(FakeRedis())
+        self._create_category('Work')
+        self.assertEqual(self.client.get('/api/categories/').headers['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/categories/').headers['X-Cache'], 'HIT')
+        self._create_category('Home')
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json), 2)
@@ -117,3 +117,39 @@ class TestCategoryRoutes(BaseTestCase):
         # Verify category is deleted
         get_response = self.client.get(f'/api/categories/{category_id}')
         self.assertEqual(get_response.status_code, 404)
+
+    def test_export_categories_ndjson(self):
+        """Test streaming category export as NDJSON."""
+        for name in ('Work', 'Home'):
+            self.client.post(
+                '/api/categories/',
+                data=json.dumps({'name': name}),
+                content_type='application/json'
+            )
+        response = self.client.get('/api/categories/', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Work', 'Home'])
+
+    def test_get_categories_include_tasks(self):
+        """Test embedding tasks in the category listing."""
+        for name in ('Work', 'Home'):
+            response = self.client.post(
+                '/api/categories/',
+                data=json.dumps({'name': name}),
+                content_type='application/json'
+            )
+            self.client.post(
+                '/api/tasks/',
+                data=json.dumps({'title': f'{name} task', 'category_id': response.json['id']}),
+                content_type='application/json'
+            )
+        response = self.client.get('/api/categories/?include=tasks')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['tasks'][0]['title'] for c in response.json], ['Work task', 'Home task'])
+
+        category_id = response.json[0]['id']
+        response = self.client.get(f'/api/categories/{category_id}?include=tasks')
+        self.assertEqual(len(response.json['tasks']), 1)
+        self.assertNotIn('tasks', self.client.get(f'/api/categories/{category_id}').json)
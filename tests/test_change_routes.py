@@ -0,0 +1,73 @@
+"""Test module for the change feed routes."""
+import json
+from tests.base import BaseTestCase
+
+class TestChangeRoutes(BaseTestCase):
+    """Test cases for change feed routes."""
+
+    def _send(self, method, url, data):
+        return getattr(self.client, method)(url, data=json.dumps(data), content_type='application/json')
+
+    def _cursor(self):
+        return self.client.get('/api/changes/').json['cursor']
+
+    def test_cursor_without_since(self):
+        """Test the feed without ``since`` only returns the current cursor."""
+        self.assertEqual(self._cursor(), 0)
+        self._send('post', '/api/tasks/', {'title': 'Task'})
+        response = self.client.get('/api/changes/')
+        self.assertEqual(response.json['changes'], [])
+        self.assertGreater(response.json['cursor'], 0)
+
+    def test_task_writes_and_tombstones(self):
+        """Test upserts carry current data and deletes leave tombstones."""
+        cursor = self._cursor()
+        task_id = self._send('post', '/api/tasks/', {'title': 'Task'}).json['id']
+        self._send('put', f'/api/tasks/{task_id}', {'title': 'Renamed'})
+        other_id = self._send('post', '/api/tasks/', {'title': 'Other'}).json['id']
+        self.client.delete(f'/api/tasks/{other_id}')
+
+        feed = self.client.get(f'/api/changes/?since={cursor}').json
+        self.assertEqual(
+            [(change['entity_id'], change['op']) for change in feed['changes']],
+            [(task_id, 'upsert'), (other_id, 'delete')]
+        )
+        self.assertEqual(feed['changes'][0]['data']['title'], 'Renamed')
+        self.assertNotIn('data', feed['changes'][1])
+
+        self.assertEqual(self.client.get(f'/api/changes/?since={feed["cursor"]}').json['changes'], [])
+
+    def test_bulk_and_category_writes(self):
+        """Test bulk endpoints and category deletes are logged."""
+        category_id = self._send('post', '/api/categories/', {'name': 'Work'}).json['id']
+        cursor = self._cursor()
+        tasks = self._send('post', '/api/tasks/bulk', [
+            {'title': 'A', 'category_id': category_id}, {'title': 'B'}
+        ]).json
+        self._send('delete', '/api/tasks/bulk', [tasks[1]['id']])
+        self.client.delete(f'/api/categories/{category_id}')
+
+        changes = self.client.get(f'/api/changes/?since={cursor}').json['changes']
+        by_row = {(change['entity'], change['entity_id']): change for change in changes}
+        self.assertEqual(by_row[('task', tasks[1]['id'])]['op'], 'delete')
+        self.assertEqual(by_row[('category', category_id)]['op'], 'delete')
+        self.assertIsNone(by_row[('task', tasks[0]['id'])]['data']['category_id'])
+
+    def test_paging_and_entity_filter(self):
+        """Test ``limit`` pages through the log and ``entity`` filters it."""
+        cursor = self._cursor()
+        self._send('post', '/api/categories/', {'name': 'Work'})
+        for title in ('A', 'B', 'C'):
+            self._send('post', '/api/tasks/', {'title': title})
+
+        first = self.client.get(f'/api/changes/?entity=task&since={cursor}&limit=2').json
+        self.assertEqual([change['data']['title'] for change in first['changes']], ['A', 'B'])
+        self.assertTrue(first['has_more'])
+        second = self.client.get(f'/api/changes/?entity=task&since={first["cursor"]}&limit=2').json
+        self.assertEqual([change['data']['title'] for change in second['changes']], ['C'])
+        self.assertFalse(second['has_more'])
+
+    def test_invalid_arguments(self):
+        """Test invalid cursors and entities are rejected."""
+        self.assertEqual(self.client.get('/api/changes/?since=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/changes/?entity=user').status_code, 400)
@@ -0,0 +1,116 @@
+"""Test module for response compression and hashed static assets."""
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from app import compression
+from tests.base import BaseTestCase
+
+class TestCompression(BaseTestCase):
+    """Test cases for negotiated response compression."""
+
+    config_overrides = {'COMPRESS_MIN_SIZE': 200}
+
+    def _create_tasks(self, count):
+        self.client.post('/api/tasks/bulk', data=json.dumps(
+            [{'title': f'Task {i}', 'description': 'Write the quarterly report'} for i in range(count)]
+        ), content_type='application/json')
+
+    def test_gzip_negotiated(self):
+        """Test large JSON bodies are gzipped for clients that accept it."""
+        self._create_tasks(20)
+        plain = self.client.get('/api/tasks/')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertIn('Accept-Encoding', plain.headers['Vary'])
+
+        response = self.client.get('/api/tasks/', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+        self.assertLess(int(response.headers['Content-Length']), len(plain.data))
+        self.assertEqual(response.headers['ETag'], 'W/' + plain.headers['ETag'])
+
+    def test_small_and_refused_bodies_untouched(self):
+        """Test bodies under the threshold and gzip;q=0 stay uncompressed."""
+        response = self.client.get('/api/tasks/', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+        self._create_tasks(20)
+        response = self.client.get('/api/tasks/', headers={'Accept-Encoding': 'gzip;q=0'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_weak_etag_revalidates(self):
+        """Test the weak ETag of a compressed response still yields 304."""
+        self._create_tasks(20)
+        etag = self.client.get('/api/tasks/', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+        response = self.client.get('/api/tasks/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_compressed_body_reused(self):
+        """Test an unchanged response is compressed once."""
+        self._create_tasks(20)
+        with mock.patch('app.compression.compress', wraps=compression.compress) as compress:
+            first = self.client.get('/api/tasks/', headers={'Accept-Encoding': 'gzip'})
+            second = self.client.get('/api/tasks/', headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(compress.call_count, 1)
+            self.assertEqual(first.data, second.data)
+
+            self._create_tasks(1)
+            self.client.get('/api/tasks/', headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(compress.call_count, 2)
+
+    def test_streamed_response_untouched(self):
+        """Test NDJSON streams are not buffered for compression."""
+        self._create_tasks(20)
+        response = self.client.get('/api/tasks/', headers={
+            'Accept': 'application/x-ndjson', 'Accept-Encoding': 'gzip'
+        })
+        self.assertNotIn('Content-Encoding', response.headers)
+
+class TestStaticAssets(BaseTestCase):
+    """Test cases for content-hashed, precompressed static files."""
+
+    def setUp(self):
+        self.build_dir = tempfile.mkdtemp()
+        self.config_overrides = {'ASSETS_BUILD_DIR': self.build_dir}
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.build_dir)
+
+    def test_hashed_url_and_variants(self):
+        """Test url_for points at a hashed copy built with a gzip variant."""
+        with self.app.test_request_context():
+            url = self.app.url_for('static', filename='css/style.css')
+        self.assertRegex(url, r'^/static/css/style\.[0-9a-f]{12}\.css$')
+        built = os.path.join(self.build_dir, url[len('/static/'):])
+        self.assertTrue(os.path.exists(built))
+        self.assertTrue(os.path.exists(built + '.gz'))
+
+    def test_hashed_file_served_immutable(self):
+        """Test hashed URLs get a far-future Cache-Control and precompressed bodies."""
+        with self.app.test_request_context():
+            url = self.app.url_for('static', filename='css/style.css')
+        with open(os.path.join(self.app.static_folder, 'css', 'style.css'), 'rb') as f:
+            source = f.read()
+
+        response = self.client.get(url)
+        self.assertEqual(response.data, source)
+        self.assertEqual(response.mimetype, 'text/css')
+        self.assertIn('immutable', response.headers['Cache-Control'])
+        self.assertIn('max-age=31536000', response.headers['Cache-Control'])
+        response.close()
+
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.data), source)
+        response.close()
+
+    def test_plain_url_still_served(self):
+        """Test the unhashed name keeps working without the immutable header."""
+        response = self.client.get('/static/css/style.css')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('immutable', response.headers.get('Cache-Control', ''))
+        response.close()
@@ -0,0 +1,104 @@
+"""Test module for optimistic concurrency control."""
+import json
+from sqlalchemy import event, text
+from app.extensions import db
+from tests.base import BaseTestCase
+
+class TestOptimisticConcurrency(BaseTestCase):
+    """Test cases for row versions and If-Match writes."""
+
+    def _post(self, url, data):
+        return self.client.post(url, data=json.dumps(data), content_type='application/json')
+
+    def _put(self, url, data, etag=None):
+        headers = {'If-Match': etag} if etag else {}
+        return self.client.put(url, data=json.dumps(data), content_type='application/json', headers=headers)
+
+    def _bump_before_flush(self, table, row_id):
+        """Simulate a concurrent writer committing between our read and our update."""
+        def bump(session, _context, _instances):
+            session.connection().execute(text(f'UPDATE {table} SET version = version + 1 WHERE id = :id'),
+                                         {'id': row_id})
+        event.listen(db.session(), 'before_flush', bump, once=True)
+
+    def test_version_increments(self):
+        """Test every update bumps the version."""
+        task = self._post('/api/tasks/', {'title': 'Task'}).json
+        self.assertEqual(task['version'], 1)
+        self.assertEqual(self._put(f'/api/tasks/{task["id"]}', {'title': 'Renamed'}).json['version'], 2)
+
+    def test_if_match(self):
+        """Test a write with the current ETag succeeds and a stale one gets 412."""
+        task_id = self._post('/api/tasks/', {'title': 'Task'}).json['id']
+        etag = self.client.get(f'/api/tasks/{task_id}').headers['ETag']
+
+        response = self._put(f'/api/tasks/{task_id}', {'title': 'First'}, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'], self.client.get(f'/api/tasks/{task_id}').headers['ETag'])
+
+        response = self._put(f'/api/tasks/{task_id}', {'title': 'Second'}, etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.client.get(f'/api/tasks/{task_id}').json['title'], 'First')
+        self.assertEqual(self.client.delete(f'/api/tasks/{task_id}', headers={'If-Match': etag}).status_code, 412)
+        self.assertEqual(self._put(f'/api/tasks/{task_id}', {'title': 'Third'}, '*').status_code, 200)
+
+    def test_category_if_match(self):
+        """Test categories honour If-Match on update and delete."""
+        category_id = self._post('/api/categories/', {'name': 'Work'}).json['id']
+        etag = self.client.get(f'/api/categories/{category_id}').headers['ETag']
+        self.assertEqual(self._put(f'/api/categories/{category_id}', {'name': 'Office'}, etag).status_code, 200)
+        self.assertEqual(self._put(f'/api/categories/{category_id}', {'name': 'Home'}, etag).status_code, 412)
+        self.assertEqual(
+            self.client.delete(f'/api/categories/{category_id}', headers={'If-Match': etag}).status_code, 412
+        )
+
+    def test_category_etag_follows_counters(self):
+        """Test a task write changes its category's ETag though it leaves the version alone."""
+        category_id = self._post('/api/categories/', {'name': 'Work'}).json['id']
+        etag = self.client.get(f'/api/categories/{category_id}').headers['ETag']
+        self._post('/api/tasks/', {'title': 'Task', 'category_id': category_id})
+
+        response = self.client.get(f'/api/categories/{category_id}', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['task_count'], 1)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(self._put(f'/api/categories/{category_id}', {'name': 'Office'}, etag).status_code, 412)
+
+        response = self._put(f'/api/categories/{category_id}', {'name': 'Office'}, response.headers['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'], self.client.get(f'/api/categories/{category_id}').headers['ETag'])
+
+    def test_concurrent_write_conflicts(self):
+        """Test a write racing another commit gets 409 instead of overwriting it."""
+        task_id = self._post('/api/tasks/', {'title': 'Task'}).json['id']
+        self._bump_before_flush('task', task_id)
+        response = self._put(f'/api/tasks/{task_id}', {'title': 'Lost'})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.get(f'/api/tasks/{task_id}').json['title'], 'Task')
+
+    def test_bulk_update_versions(self):
+        """Test bulk updates bump versions and reject stale item versions."""
+        ids = [task['id'] for task in self.client.post('/api/tasks/bulk', json=[
+            {'title': 'One'}, {'title': 'Two'}
+        ]).json]
+        response = self.client.patch('/api/tasks/bulk', json=[
+            {'id': ids[0], 'status': 'completed'}, {'id': ids[0], 'priority': 'high'}, {'id': ids[1], 'version': 1}
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task['version'] for task in response.json], [3, 3, 2])
+
+        response = self.client.patch('/api/tasks/bulk', json=[
+            {'id': ids[0], 'title': 'Changed'}, {'id': ids[1], 'title': 'Stale', 'version': 1}
+        ])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.get(f'/api/tasks/{ids[0]}').json['title'], 'One')
+
+    def test_cached_body_matches_etag(self):
+        """Test a cached body is not served with the ETag of a newer version."""
+        task_id = self._post('/api/tasks/', {'title': 'Task'}).json['id']
+        self.client.get(f'/api/tasks/{task_id}')
+        # A commit whose cache invalidation has not run yet
+        db.session.execute(text("UPDATE task SET title = 'Renamed', version = 2 WHERE id = :id"), {'id': task_id})
+        db.session.commit()
+        response = self.client.get(f'/api/tasks/{task_id}')
+        self.assertEqual((response.json['title'], response.json['version']), ('Renamed', 2))
@@ -0,0 +1,55 @@
+"""Test module for conditional GET support."""
+import json
+from tests.base import BaseTestCase
+
+class TestConditionalGet(BaseTestCase):
+    """Test cases for ETag / If-None-Match handling."""
+
+    def _post(self, url, data):
+        return self.client.post(url, data=json.dumps(data), content_type='application/json')
+
+    def test_collection_not_modified(self):
+        """Test a repeated collection read with a matching ETag returns 304."""
+        self._post('/api/tasks/', {'title': 'Task'})
+        response = self.client.get('/api/tasks/')
+        etag = response.headers['ETag']
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+
+        response = self.client.get('/api/tasks/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        self._post('/api/tasks/', {'title': 'Other'})
+        response = self.client.get('/api/tasks/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_resource_not_modified(self):
+        """Test single resources change ETag when updated."""
+        category_id = self._post('/api/categories/', {'name': 'Work'}).json['id']
+        etag = self.client.get(f'/api/categories/{category_id}').headers['ETag']
+        response = self.client.get(f'/api/categories/{category_id}', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.client.put(
+            f'/api/categories/{category_id}',
+            data=json.dumps({'name': 'Office'}),
+            content_type='application/json'
+        )
+        response = self.client.get(f'/api/categories/{category_id}', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['name'], 'Office')
+
+    def test_etag_varies_by_query(self):
+        """Test different representations of a resource get different ETags."""
+        self._post('/api/categories/', {'name': 'Work'})
+        plain = self.client.get('/api/categories/').headers['ETag']
+        embedded = self.client.get('/api/categories/?include=tasks').headers['ETag']
+        self.assertNotEqual(plain, embedded)
+
+    def test_missing_resource_has_no_etag(self):
+        """Test 404 responses are not made conditional."""
+        response = self.client.get('/api/tasks/999')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
@@ -0,0 +1,90 @@
+"""Test module for the per-category task counters."""
+import json
+from app.counters import reconcile_category_counts
+from app.extensions import db
+from app.models.category import Category
+from tests.base import BaseTestCase
+
+class TestCategoryCounters(BaseTestCase):
+    """Test cases for the denormalized category counters."""
+
+    def _post(self, url, data, method='post'):
+        return getattr(self.client, method)(url, data=json.dumps(data), content_type='application/json')
+
+    def _category(self, name='Work'):
+        return self._post('/api/categories/', {'name': name}).json['id']
+
+    def _counts(self, category_id):
+        data = self.client.get(f'/api/categories/{category_id}').json
+        return data['task_count'], data['open_task_count']
+
+    def test_create_update_delete(self):
+        """Test counters follow single-task writes."""
+        work, home = self._category('Work'), self._category('Home')
+        task_id = self._post('/api/tasks/', {'title': 'A', 'category_id': work}).json['id']
+        self._post('/api/tasks/', {'title': 'B', 'category_id': work, 'status': 'completed'})
+        self.assertEqual(self._counts(work), (2, 1))
+
+        self._post(f'/api/tasks/{task_id}', {'status': 'completed'}, method='put')
+        self.assertEqual(self._counts(work), (2, 0))
+
+        self._post(f'/api/tasks/{task_id}', {'category_id': home, 'status': 'pending'}, method='put')
+        self.assertEqual(self._counts(work), (1, 0))
+        self.assertEqual(self._counts(home), (1, 1))
+
+        self.client.delete(f'/api/tasks/{task_id}')
+        self.assertEqual(self._counts(home), (0, 0))
+
+    def test_bulk_writes(self):
+        """Test counters follow the bulk endpoints."""
+        work, home = self._category('Work'), self._category('Home')
+        tasks = self._post('/api/tasks/bulk', [
+            {'title': 'A', 'category_id': work},
+            {'title': 'B', 'category_id': work, 'status': 'completed'},
+            {'title': 'C'}
+        ]).json
+        self.assertEqual(self._counts(work), (2, 1))
+
+        self._post('/api/tasks/bulk', [
+            {'id': tasks[0]['id'], 'category_id': home},
+            {'id': tasks[2]['id'], 'category_id': home, 'status': 'completed'}
+        ], method='patch')
+        self.assertEqual(self._counts(work), (1, 0))
+        self.assertEqual(self._counts(home), (2, 1))
+
+        self._post('/api/tasks/bulk', [tasks[0]['id'], tasks[1]['id']], method='delete')
+        self.assertEqual(self._counts(work), (0, 0))
+        self.assertEqual(self._counts(home), (1, 0))
+
+    def test_category_listing_reflects_task_writes(self):
+        """Test a cached category listing is refreshed by task writes."""
+        work = self._category()
+        self.client.get('/api/categories/')
+        self._post('/api/tasks/', {'title': 'A', 'category_id': work})
+        listing = self.client.get('/api/categories/').json
+        self.assertEqual(listing[0]['task_count'], 1)
+
+    def test_task_writes_keep_category_updated_at(self):
+        """Test counter moves leave updated_at alone but still change the listing ETag."""
+        work = self._category()
+        before = self.client.get('/api/categories/')
+        self._post('/api/tasks/', {'title': 'A', 'category_id': work})
+
+        response = self.client.get('/api/categories/', headers={'If-None-Match': before.headers['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json[0]['task_count'], 1)
+        self.assertEqual(response.json[0]['updated_at'], before.json[0]['updated_at'])
+
+    def test_reconcile_repairs_drift(self):
+        """Test reconcile recomputes drifted counters."""
+        work = self._category()
+        self._post('/api/tasks/', {'title': 'A', 'category_id': work})
+        with self.app.app_context():
+            db.session.get(Category, work).task_count = 7
+            db.session.commit()
+            self.assertEqual(reconcile_category_counts(), 1)
+            self.assertEqual(reconcile_category_counts(), 0)
+            self.assertEqual(db.session.get(Category, work).task_count, 1)
+
+        result = self.app.test_cli_runner().invoke(args=['reconcile-category-counts'])
+        self.assertIn('0 categories had drifted', result.output)
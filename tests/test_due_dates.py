@@ -0,0 +1,89 @@
+"""Test module for the due-date views."""
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.counters import rebuild_due_days
+from app.extensions import db
+from app.models.due_day import DueDay
+from tests.base import BaseTestCase
+
+class TestDueDates(BaseTestCase):
+    """Test cases for the overdue, upcoming and calendar endpoints."""
+
+    def _create(self, title, due_date, status='pending'):
+        return self.client.post('/api/tasks/', json={
+            'title': title, 'status': status, 'due_date': due_date.isoformat() if due_date else None
+        }).json['id']
+
+    def _buckets(self):
+        return {day.isoformat(): (total, open_count) for day, total, open_count in db.session.execute(
+            select(DueDay.day, DueDay.task_count, DueDay.open_task_count).where(DueDay.task_count != 0)
+        )}
+
+    def test_overdue(self):
+        """Test overdue lists open past-due tasks, longest overdue first."""
+        now = datetime.utcnow()
+        later = self._create('Later', now - timedelta(days=1))
+        earlier = self._create('Earlier', now - timedelta(days=5))
+        self._create('Done', now - timedelta(days=3), status='completed')
+        self._create('Future', now + timedelta(days=1))
+        self._create('Undated', None)
+
+        response = self.client.get('/api/tasks/overdue')
+        self.assertEqual([task['id'] for task in response.json], [earlier, later])
+        response = self.client.get('/api/tasks/overdue?status=completed')
+        self.assertEqual([task['title'] for task in response.json], ['Done'])
+
+    def test_upcoming_window_and_pages(self):
+        """Test upcoming honours ?days= and pages by (due_date, id)."""
+        now = datetime.utcnow()
+        ids = [self._create(f'Task {day}', now + timedelta(days=day, hours=1)) for day in range(10)]
+
+        self.assertEqual([task['id'] for task in self.client.get('/api/tasks/upcoming').json], ids[:7])
+        response = self.client.get('/api/tasks/upcoming?days=3&limit=2')
+        self.assertEqual([task['id'] for task in response.json], ids[:2])
+        response = self.client.get(f'/api/tasks/upcoming?days=3&limit=2&cursor={response.headers["X-Next-Cursor"]}')
+        self.assertEqual([task['id'] for task in response.json], ids[2:3])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+        self.assertEqual(self.client.get('/api/tasks/upcoming?days=0').status_code, 400)
+        self.assertEqual(self.client.get('/api/tasks/upcoming?cursor=bad').status_code, 400)
+
+    def test_calendar(self):
+        """Test calendar day buckets follow creates, updates and deletes."""
+        first = self._create('One', datetime(2025, 3, 3, 9))
+        self._create('Two', datetime(2025, 3, 3, 17), status='completed')
+        self._create('Three', datetime(2025, 3, 31, 23))
+        self.client.post('/api/tasks/bulk', json=[{'title': 'Four', 'due_date': '2025-04-01T08:00:00'}])
+
+        response = self.client.get('/api/tasks/calendar?month=2025-03').json
+        self.assertEqual((response['start'], response['end']), ('2025-03-01', '2025-04-01'))
+        self.assertEqual(len(response['days']), 31)
+        self.assertEqual(response['days'][2], {'date': '2025-03-03', 'task_count': 2, 'open_task_count': 1})
+        self.assertEqual((response['task_count'], response['open_task_count']), (3, 2))
+
+        self.client.put(f'/api/tasks/{first}', json={'due_date': '2025-03-05T10:00:00'})
+        response = self.client.get('/api/tasks/calendar?week=2025-W10').json
+        self.assertEqual(response['start'], '2025-03-03')
+        self.assertEqual([day['task_count'] for day in response['days']], [1, 0, 1, 0, 0, 0, 0])
+
+        self.client.delete(f'/api/tasks/{first}')
+        response = self.client.get('/api/tasks/calendar?start=2025-03-01&end=2025-04-02').json
+        self.assertEqual((response['task_count'], response['open_task_count']), (3, 2))
+
+    def test_calendar_invalid_range(self):
+        """Test malformed or oversized ranges are rejected."""
+        for query in ('', 'month=2025-13', 'week=2025-W60', 'start=2025-03-02&end=2025-03-01',
+                      'start=2024-01-01&end=2026-01-01'):
+            self.assertEqual(self.client.get(f'/api/tasks/calendar?{query}').status_code, 400)
+
+    def test_rebuild_matches_tracked_buckets(self):
+        """Test incrementally kept buckets equal a rebuild from the task table."""
+        ids = [self._create(f'Task {i}', datetime(2025, 5, 1 + i % 3, 12)) for i in range(6)]
+        self.client.patch('/api/tasks/bulk', json=[
+            {'id': ids[0], 'status': 'completed'}, {'id': ids[1], 'due_date': None},
+            {'id': ids[2], 'due_date': '2025-06-01T00:00:00'}
+        ])
+        self.client.delete('/api/tasks/bulk', json=[ids[3]])
+        tracked = self._buckets()
+        rebuild_due_days()
+        self.assertEqual(self._buckets(), tracked)
@@ -0,0 +1,110 @@
+"""Test module for the Server-Sent Events hub and stream."""
+import json
+import queue
+from app.events import RESET, MemoryBroker, RedisBroker
+from tests.base import BaseTestCase
+
+class FakePubSub:
+    """In-memory stand-in for a redis-py PubSub object."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.channel = None
+
+    def subscribe(self, channel):
+        self.channel = channel
+
+    def listen(self):
+        while True:
+            yield self.messages.get()
+
+class FakeRedis:
+    """In-memory stand-in for the redis-py publish/pubsub calls."""
+
+    def __init__(self):
+        self.messages = queue.Queue()
+
+    def publish(self, channel, data):
+        self.messages.put({'type': 'message', 'channel': channel, 'data': data})
+
+    def pubsub(self, **_options):
+        return FakePubSub(self.messages)
+
+class TestBrokers(BaseTestCase):
+    """Test cases for the event brokers."""
+
+    def test_memory_fan_out(self):
+        """Test every subscriber receives published events."""
+        broker = MemoryBroker()
+        first, second = broker.subscribe(10), broker.subscribe(10)
+        broker.publish([{'id': 1}])
+        self.assertEqual(first.get(0), {'id': 1})
+        self.assertEqual(second.get(0), {'id': 1})
+        self.assertIsNone(first.get(0))
+
+    def test_slow_subscriber_is_reset(self):
+        """Test a subscriber over its queue bound is dropped and reset."""
+        broker = MemoryBroker()
+        slow = broker.subscribe(2)
+        broker.publish([{'id': 1}, {'id': 2}, {'id': 3}])
+        self.assertEqual(broker.subscriber_count(), 0)
+        self.assertIs(slow.get(0), RESET)
+
+    def test_redis_fan_out(self):
+        """Test events published through Redis reach local subscribers."""
+        broker = RedisBroker(FakeRedis())
+        subscription = broker.subscribe(10)
+        broker.publish([{'id': 1}])
+        self.assertEqual(subscription.get(1), {'id': 1})
+
+class TestEventRoutes(BaseTestCase):
+    """Test cases for the /api/events stream."""
+
+    config_overrides = {'EVENTS_HEARTBEAT': 0.01}
+
+    def _post_task(self, title):
+        return self.client.post('/api/tasks/', data=json.dumps({'title': title}),
+                                content_type='application/json').json['id']
+
+    def _messages(self, response):
+        return (chunk.decode() for chunk in response.response)
+
+    def test_live_events_and_heartbeat(self):
+        """Test committed writes are pushed and idle streams get heartbeats."""
+        response = self.client.get('/api/events/')
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        messages = self._messages(response)
+        self.assertTrue(next(messages).startswith('retry:'))
+        self.assertEqual(next(messages), ': heartbeat\n\n')
+
+        task_id = self._post_task('Task')
+        event = json.loads(next(messages).split('data: ')[1])
+        self.assertEqual((event['entity'], event['entity_id'], event['op']), ('task', task_id, 'upsert'))
+        response.close()
+
+    def test_replay_from_last_event_id(self):
+        """Test a reconnecting client receives the changes it missed."""
+        cursor = self.client.get('/api/changes/').json['cursor']
+        task_id = self._post_task('Task')
+        self.client.delete(f'/api/tasks/{task_id}')
+
+        response = self.client.get('/api/events/', headers={'Last-Event-ID': str(cursor)})
+        messages = self._messages(response)
+        next(messages)
+        event = json.loads(next(messages).split('data: ')[1])
+        self.assertEqual((event['entity_id'], event['op']), (task_id, 'delete'))
+        self.assertEqual(next(messages), ': heartbeat\n\n')
+        response.close()
+
+        response = self.client.get('/api/events/', headers={'Last-Event-ID': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_rolled_back_writes_are_not_published(self):
+        """Test failed writes push nothing."""
+        response = self.client.get('/api/events/')
+        messages = self._messages(response)
+        next(messages)
+        self.client.post('/api/tasks/', data=json.dumps({'title': 'Task', 'category_id': 999}),
+                         content_type='application/json')
+        self.assertEqual(next(messages), ': heartbeat\n\n')
+        response.close()
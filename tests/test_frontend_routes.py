@@ -1,5 +1,8 @@
 """Test module for frontend routes."""
+import json
+import re
 from http import HTTPStatus
+from app.extensions import cache
 from tests.base import BaseTestCase
 
 
@@ -74,6 +77,51 @@ class TestFrontendRoutes(BaseTestCase):
             self.assert_template_used('tasks.html')
             self.assertIn(b'taskModal', response.data)
 
+    def _bootstrap(self, response):
+        match = re.search(rb'<script type="application/json" id="tasks-bootstrap">(.*?)</script>', response.data)
+        return json.loads(match.group(1))
+
+    def test_tasks_page_server_rendered(self):
+        """Test the tasks page embeds the first page and the category list."""
+        self.app.config['TASKS_PAGE_SIZE'] = 2
+        with self.app.test_client() as client:
+            category_id = client.post('/api/categories/', json={'name': 'Work'}).json['id']
+            for title in ('First', 'Second', '<Third>'):
+                client.post('/api/tasks/', json={'title': title, 'category_id': category_id})
+            response = client.get('/tasks')
+            self.assertIn(b'First', response.data)
+            self.assertNotIn(b'<Third>', response.data)
+            bootstrap = self._bootstrap(response)
+            self.assertEqual([task['title'] for task in bootstrap['tasks']], ['First', 'Second'])
+            self.assertIsNotNone(bootstrap['next_cursor'])
+            self.assertEqual(bootstrap['categories'], [{'id': category_id, 'name': 'Work'}])
+            next_page = client.get(f'/api/tasks/?limit=2&cursor={bootstrap["next_cursor"]}').json
+            self.assertEqual([task['title'] for task in next_page], ['<Third>'])
+
+    def test_fragments_cached_until_writes(self):
+        """Test rendered fragments are reused until a task or category write."""
+        with self.app.test_client() as client:
+            client.get('/tasks')
+            client.get('/categories')
+            hits = cache.stats()['hits']
+            client.get('/tasks')
+            client.get('/categories')
+            self.assertEqual(cache.stats()['hits'], hits + 2)
+
+            client.post('/api/tasks/', json={'title': 'Fresh task'})
+            self.assertIn(b'Fresh task', client.get('/tasks').data)
+            client.post('/api/categories/', json={'name': 'Fresh category'})
+            self.assertIn(b'Fresh category', client.get('/categories').data)
+
+    def test_client_rendered_mode(self):
+        """Test the client mode serves the empty shells."""
+        self.app.config['FRONTEND_RENDER'] = 'client'
+        with self.app.test_client() as client:
+            client.post('/api/tasks/', json={'title': 'Task'})
+            response = client.get('/tasks')
+            self.assertNotIn(b'id="tasks-bootstrap"', response.data)
+            self.assertIn(b'Tasks will be loaded here', response.data)
+
     def test_invalid_route(self):
         """Test accessing invalid route."""
         with self.app.test_client() as client:
@@ -0,0 +1,80 @@
+"""Test module for bulk task import."""
+import io
+import json
+import os
+import tempfile
+from app.extensions import db
+from app.jobs import run_next
+from app.models.category import Category
+from tests.base import BaseTestCase
+
+CSV = (
+    'title,description,priority,status,due_date,category\n'
+    'Write report,,high,,2024-01-31T12:00:00,Work\n'
+    'Buy milk,Semi-skimmed,,,,Home\n'
+    ',Missing title,,,,Work\n'
+    'Plan trip,,,completed,not-a-date,\n'
+    'Call mum,,low,completed,,Home\n'
+)
+
+class TestImport(BaseTestCase):
+    """Test cases for the bulk importer."""
+
+    config_overrides = {'IMPORT_BATCH_SIZE': 2}
+
+    def test_csv_upload(self):
+        """Test a CSV upload imports valid rows and reports invalid ones."""
+        self.client.post('/api/categories/', data=json.dumps({'name': 'Work'}), content_type='application/json')
+        response = self.client.post('/api/tasks/import', data=CSV, content_type='text/csv')
+        self.assertEqual(response.status_code, 201)
+        report = response.json
+        self.assertEqual((report['imported'], report['skipped'], report['categories_created']), (3, 2, 1))
+        self.assertEqual(report['errors'], [
+            {'line': 3, 'error': 'Title is required'},
+            {'line': 4, 'error': 'Invalid date format'}
+        ])
+        self.assertIn('rows_per_sec', report)
+
+        tasks = {task['title']: task for task in self.client.get('/api/tasks/').json}
+        self.assertEqual(tasks['Buy milk']['priority'], 'medium')
+        self.assertEqual(tasks['Write report']['due_date'], '2024-01-31T12:00:00')
+        categories = {category['name']: category for category in self.client.get('/api/categories/').json}
+        self.assertEqual(tasks['Call mum']['category_id'], categories['Home']['id'])
+        self.assertEqual((categories['Home']['task_count'], categories['Home']['open_task_count']), (2, 1))
+
+    def test_ndjson_multipart_upload(self):
+        """Test an NDJSON file sent as a multipart form."""
+        body = '{"title": "A", "category_id": 42}\nnot json\n\n{"title": "B"}\n'
+        response = self.client.post('/api/tasks/import', data={'file': (io.BytesIO(body.encode()), 'tasks.ndjson')},
+                                    content_type='multipart/form-data')
+        self.assertEqual(response.json['imported'], 1)
+        self.assertEqual([error['error'] for error in response.json['errors']],
+                         ['Invalid category ID', 'Invalid task payload'])
+
+    def test_unsupported_format(self):
+        """Test uploads in other formats are rejected."""
+        response = self.client.post('/api/tasks/import', data='{}', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_async_upload(self):
+        """Test an upload sent with respond-async is imported by a job."""
+        with tempfile.TemporaryDirectory() as directory:
+            self.app.config['JOBS_RESULT_DIR'] = directory
+            response = self.client.post('/api/tasks/import', data=CSV, content_type='text/csv',
+                                        headers={'Prefer': 'respond-async'})
+            self.assertEqual(response.status_code, 202)
+            self.assertTrue(run_next())
+            job = self.client.get(response.headers['Location']).json
+            self.assertEqual((job['status'], job['result']['imported']), ('succeeded', 3))
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_cli_command(self):
+        """Test the import-tasks command."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as source:
+            source.write(CSV)
+        try:
+            result = self.app.test_cli_runner().invoke(args=['import-tasks', source.name])
+        finally:
+            os.remove(source.name)
+        self.assertIn('Imported 3 tasks, skipped 2, created 2 categories', result.output)
+        self.assertEqual(db.session.query(Category).count(), 2)
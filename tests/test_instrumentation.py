@@ -0,0 +1,73 @@
+"""Test module for request instrumentation."""
+import os
+import shutil
+import tempfile
+from app import create_app
+from app.extensions import db
+from tests.base import BaseTestCase
+
+class TestInstrumentation(BaseTestCase):
+    """Test cases for request instrumentation."""
+
+    config_overrides = {
+        'INSTRUMENTATION_ENABLED': True,
+        'SERVER_TIMING': True,
+        'SLOW_QUERY_MS': 0
+    }
+
+    def test_server_timing_header(self):
+        """Test per-request timings are reported in Server-Timing."""
+        response = self.client.get('/api/categories/')
+        timing = response.headers['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('serialize;dur=', timing)
+        self.assertIn('total;dur=', timing)
+        self.assertNotIn('desc="0 queries"', timing)
+
+    def test_metrics_endpoint(self):
+        """Test aggregates are exposed in the Prometheus format."""
+        self.client.post('/api/categories/', json={'name': 'Work'})
+        self.client.get('/api/categories/')
+        with self.assertLogs('app.instrumentation', level='WARNING'):
+            self.client.get('/api/categories/1')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/plain')
+        body = response.get_data(as_text=True)
+        self.assertIn('todo_requests_total{endpoint="categories.get_categories",method="GET",status="200"} 1', body)
+        self.assertIn('todo_request_duration_seconds_count{endpoint="categories.create_category"} 1', body)
+        self.assertIn('todo_sql_queries_total{endpoint="categories.get_category"}', body)
+        self.assertNotIn('todo_slow_queries_total 0\n', body)
+
+    def test_disabled_by_default(self):
+        """Test nothing is registered when instrumentation is off."""
+        app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+        self.assertNotIn('metrics', app.extensions)
+        self.assertNotIn('Server-Timing', app.test_client().get('/').headers)
+        self.assertEqual(app.test_client().get('/metrics').status_code, 404)
+
+class TestReplicaInstrumentation(BaseTestCase):
+    """Test cases for instrumentation of queries routed to the read replica."""
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.primary_path = os.path.join(tmp, 'primary.db')
+        self.config_overrides = {
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + self.primary_path,
+            'SQLALCHEMY_BINDS': {'replica': 'sqlite:///' + os.path.join(tmp, 'replica.db')},
+            'SQLITE_PROFILE': 'default',
+            'INSTRUMENTATION_ENABLED': True,
+            'SERVER_TIMING': True
+        }
+        super().setUp()
+        shutil.copyfile(self.primary_path, os.path.join(tmp, 'replica.db'))
+
+    def tearDown(self):
+        db.engines['replica'].dispose()
+        super().tearDown()
+
+    def test_replica_queries_counted(self):
+        """Test reads served by the replica appear in the query count."""
+        response = self.client.get('/api/categories/')
+        self.assertNotIn('desc="0 queries"', response.headers['Server-Timing'])
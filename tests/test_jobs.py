@@ -0,0 +1,150 @@
+"""Test module for the background job queue."""
+import json
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.jobs import claim_next, run_next
+from app.models.job import Job
+from tests.base import BaseTestCase
+
+class TestJobs(BaseTestCase):
+    """Test cases for background jobs."""
+
+    config_overrides = {'JOBS_BATCH_SIZE': 2}
+
+    def setUp(self):
+        super().setUp()
+        self.result_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.result_dir)
+        self.app.config['JOBS_RESULT_DIR'] = self.result_dir
+
+    def _send(self, method, url, data, headers=None):
+        return getattr(self.client, method)(url, data=json.dumps(data), content_type='application/json',
+                                            headers=headers)
+
+    def _run_all(self):
+        while run_next():
+            pass
+
+    def test_async_bulk_update(self):
+        """Test a bulk update sent with respond-async runs as a job."""
+        tasks = self._send('post', '/api/tasks/bulk', [{'title': f'Task {i}'} for i in range(5)]).json
+        response = self._send('patch', '/api/tasks/bulk',
+                              [{'id': task['id'], 'status': 'completed'} for task in tasks],
+                              headers={'Prefer': 'respond-async'})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json['status'], 'queued')
+        location = response.headers['Location']
+
+        self._run_all()
+        job = self.client.get(location).json
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual((job['progress'], job['total']), (5, 5))
+        self.assertEqual(job['result'], {'updated': 5})
+        statuses = {task['status'] for task in self.client.get('/api/tasks/').json}
+        self.assertEqual(statuses, {'completed'})
+
+    def test_async_bulk_update_stale(self):
+        """Test a bulk update job edited from stale tasks fails without writing any batch."""
+        tasks = self._send('post', '/api/tasks/bulk', [{'title': f'Task {i}'} for i in range(5)]).json
+        items = [{'id': task['id'], 'version': task['version'], 'status': 'completed'} for task in tasks]
+        response = self._send('patch', '/api/tasks/bulk', items, headers={'Prefer': 'respond-async'})
+        self._send('put', f'/api/tasks/{tasks[-1]["id"]}', {'title': 'Renamed'})
+
+        self._run_all()
+        job = self.client.get(response.headers['Location']).json
+        self.assertEqual(job['status'], 'failed')
+        self.assertIn(str(tasks[-1]['id']), job['error'])
+        statuses = {task['status'] for task in self.client.get('/api/tasks/').json}
+        self.assertEqual(statuses, {'pending'})
+
+    def test_async_category_delete(self):
+        """Test a category delete sent with respond-async detaches tasks in batches."""
+        category_id = self._send('post', '/api/categories/', {'name': 'Work'}).json['id']
+        self._send('post', '/api/tasks/bulk', [{'title': f'Task {i}', 'category_id': category_id} for i in range(3)])
+        response = self.client.delete(f'/api/categories/{category_id}', headers={'Prefer': 'respond-async'})
+        self.assertEqual(response.status_code, 202)
+
+        self._run_all()
+        job = self.client.get(response.headers['Location']).json
+        self.assertEqual(job['result'], {'detached_tasks': 3})
+        self.assertEqual(self.client.get(f'/api/categories/{category_id}').status_code, 404)
+        self.assertEqual({task['category_id'] for task in self.client.get('/api/tasks/').json}, {None})
+
+    def test_category_delete_job_checks_version(self):
+        """Test a delete_category job with an expected version fails if the category changed."""
+        category = self._send('post', '/api/categories/', {'name': 'Work'}).json
+        response = self._send('post', '/api/jobs/', {
+            'kind': 'delete_category', 'payload': {'category_id': category['id'], 'version': category['version']}})
+        self._send('put', f'/api/categories/{category["id"]}', {'description': 'Edited'})
+        self._run_all()
+
+        job = self.client.get(f'/api/jobs/{response.json["id"]}').json
+        self.assertEqual((job['status'], job['error']), ('failed', 'Category was modified concurrently'))
+        self.assertEqual(self.client.get(f'/api/categories/{category["id"]}').status_code, 200)
+
+        etag = self.client.get(f'/api/categories/{category["id"]}').headers['ETag']
+        response = self.client.delete(f'/api/categories/{category["id"]}',
+                                      headers={'Prefer': 'respond-async', 'If-Match': etag})
+        self.assertEqual(response.status_code, 202)
+        self._run_all()
+        self.assertEqual(self.client.get(response.headers['Location']).json['status'], 'succeeded')
+        self.assertEqual(self.client.get(f'/api/categories/{category["id"]}').status_code, 404)
+
+    def test_submit_export_and_download(self):
+        """Test a submitted export job writes a downloadable file."""
+        self._send('post', '/api/tasks/bulk', [{'title': 'A'}, {'title': 'B'}, {'title': 'C'}])
+        response = self._send('post', '/api/jobs/', {'kind': 'export_tasks'})
+        self.assertEqual(response.status_code, 202)
+        self._run_all()
+
+        download = self.client.get(f'/api/jobs/{response.json["id"]}/download')
+        self.assertEqual(download.status_code, 200)
+        titles = [json.loads(line)['title'] for line in download.data.decode().splitlines()]
+        self.assertEqual(titles, ['A', 'B', 'C'])
+        download.close()
+
+    def test_failed_job_and_invalid_submissions(self):
+        """Test handler errors fail the job and unknown kinds are rejected."""
+        response = self._send('post', '/api/jobs/', {'kind': 'delete_category', 'payload': {'category_id': 99}})
+        self._run_all()
+        job = self.client.get(f'/api/jobs/{response.json["id"]}').json
+        self.assertEqual((job['status'], job['error']), ('failed', 'Category not found'))
+        self.assertEqual(self.client.get('/api/jobs/?status=failed').json[0]['id'], job['id'])
+
+        self.assertEqual(self._send('post', '/api/jobs/', {'kind': 'bulk_update_tasks'}).status_code, 400)
+        self.assertEqual(self._send('post', '/api/jobs/', {'kind': 'export_tasks', 'payload': []}).status_code, 400)
+        self.assertEqual(self.client.get('/api/jobs/999').status_code, 404)
+
+    def test_stale_running_job_is_reclaimed(self):
+        """Test a job abandoned by a dead worker is claimed again."""
+        job_id = self._send('post', '/api/jobs/', {'kind': 'reconcile_category_counts'}).json['id']
+        self.assertEqual(claim_next().id, job_id)
+        self.assertIsNone(claim_next())
+
+        job = db.session.get(Job, job_id)
+        job.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+        reclaimed = claim_next()
+        self.assertEqual((reclaimed.id, reclaimed.attempts), (job_id, 2))
+
+    def test_exhausted_stale_job_fails(self):
+        """Test a stale job that used up its attempts is marked failed instead of reclaimed."""
+        job_id = self._send('post', '/api/jobs/', {'kind': 'reconcile_category_counts'}).json['id']
+        self.assertEqual(claim_next().id, job_id)
+        job = db.session.get(Job, job_id)
+        job.attempts = max_attempts = self.app.config['JOBS_MAX_ATTEMPTS']
+        job.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+
+        self.assertIsNone(claim_next())
+        job = self.client.get(f'/api/jobs/{job_id}').json
+        self.assertEqual((job['status'], job['error']), ('failed', f'Abandoned after {max_attempts} attempts'))
+
+    def test_worker_command_burst(self):
+        """Test the worker command drains the queue and exits in burst mode."""
+        job_id = self._send('post', '/api/jobs/', {'kind': 'reconcile_category_counts'}).json['id']
+        result = self.app.test_cli_runner().invoke(args=['jobs-worker', '--burst'])
+        self.assertIn('Job worker stopped.', result.output)
+        self.assertEqual(self.client.get(f'/api/jobs/{job_id}').json['status'], 'succeeded')
@@ -0,0 +1,38 @@
+"""Test module for JSON providers and column serialization."""
+import unittest
+from datetime import datetime
+from app import create_app
+from app.json_provider import JSONProvider, OrjsonProvider, orjson
+from app.models.task import Task
+from app.extensions import db
+from tests.base import BaseTestCase
+
+class TestJSONProvider(BaseTestCase):
+    """Test cases for JSON providers."""
+
+    def test_stdlib_provider_encodes_iso_datetimes(self):
+        """Test datetimes are encoded like to_dict() does."""
+        provider = JSONProvider(self.app)
+        self.assertEqual(provider.dumps({'at': datetime(2024, 1, 2, 3, 4, 5, 6)}),
+                         '{"at": "2024-01-02T03:04:05.000006"}')
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_provider_matches_stdlib(self):
+        """Test orjson output decodes to the same value as the stdlib output."""
+        data = {'b': [1, None, 'x'], 'a': datetime(2024, 1, 2, 3, 4, 5, 6), 'c': datetime(2024, 1, 2)}
+        stdlib = JSONProvider(self.app)
+        fast = OrjsonProvider(self.app)
+        self.assertEqual(fast.loads(fast.dumps(data)), stdlib.loads(stdlib.dumps(data)))
+        self.assertIsInstance(self.app.json, OrjsonProvider)
+
+    def test_column_listing_matches_to_dict(self):
+        """Test the column-tuple listing path returns the to_dict() shape."""
+        task = Task(title='Task', due_date=datetime(2024, 5, 1, 12, 30))
+        db.session.add(task)
+        db.session.commit()
+        self.assertEqual(self.client.get('/api/tasks/').json, [task.to_dict()])
+
+    def test_stdlib_provider_selected_by_config(self):
+        """Test JSON_PROVIDER switches the encoder."""
+        app = create_app({'JSON_PROVIDER': 'stdlib', 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+        self.assertIs(type(app.json), JSONProvider)
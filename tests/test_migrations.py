@@ -0,0 +1,82 @@
+"""Test module for versioned schema migrations."""
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import inspect, text
+from app import create_app
+from app.extensions import db
+from app.migrations import current_version, latest_version, schema_ddl, upgrade_database
+
+# Schema written by db.create_all() before versioned migrations existed
+LEGACY_SCHEMA = (
+    'CREATE TABLE category (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL UNIQUE, '
+    'description TEXT, created_at DATETIME, updated_at DATETIME)',
+    'CREATE TABLE task (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, description TEXT, '
+    'due_date DATETIME, priority VARCHAR(20) NOT NULL, status VARCHAR(20) NOT NULL, '
+    'category_id INTEGER REFERENCES category (id), created_at DATETIME, updated_at DATETIME)',
+    "INSERT INTO category VALUES (1, 'Work', '', '2024-01-01 00:00:00', '2024-01-01 00:00:00')",
+    "INSERT INTO task VALUES (1, 'Write report', '', NULL, 'high', 'pending', 1, "
+    "'2024-01-01 00:00:00', '2024-01-01 00:00:00')",
+    "INSERT INTO task VALUES (2, 'File expenses', '', NULL, 'low', 'completed', 1, "
+    "'2024-01-02 00:00:00', '2024-01-02 00:00:00')"
+)
+
+class TestMigrations(unittest.TestCase):
+    """Test cases for schema migrations."""
+
+    def setUp(self):
+        """Create an app on an empty database file."""
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(self.tmp, 'test.db')})
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        """Remove the database file."""
+        db.session.remove()
+        db.engine.dispose()
+        self.ctx.pop()
+
+    def test_fresh_database(self):
+        """Test an empty database gets the current schema and the latest version."""
+        self.assertEqual(current_version(), 0)
+        self.assertEqual(upgrade_database(), [latest_version()])
+        self.assertEqual(current_version(), latest_version())
+        self.assertEqual(upgrade_database(), [])
+        self.assertTrue(inspect(db.engine).has_table('job'))
+
+    def test_legacy_database(self):
+        """Test a database created before versioning is upgraded in place."""
+        for statement in LEGACY_SCHEMA:
+            db.session.execute(text(statement))
+        db.session.commit()
+
+        self.assertEqual(upgrade_database(), list(range(1, latest_version() + 1)))
+        indexes = {index['name'] for index in inspect(db.engine).get_indexes('task')}
+        self.assertIn('ix_task_created_at_id', indexes)
+        counts = db.session.execute(text('SELECT task_count, open_task_count FROM category')).one()
+        self.assertEqual(tuple(counts), (2, 1))
+
+        client = self.app.test_client()
+        self.assertEqual([task['id'] for task in client.get('/api/tasks/search?q=report').json], [1])
+        self.assertEqual(client.get('/api/tasks/').status_code, 200)
+        self.assertEqual(client.put('/api/tasks/1', json={'title': 'Report'}).json['version'], 2)
+
+    def test_cli_command(self):
+        """Test the db-upgrade command."""
+        runner = self.app.test_cli_runner()
+        self.assertIn(f'upgraded to version {latest_version()}', runner.invoke(args=['db-upgrade']).output)
+        self.assertIn('up to date', runner.invoke(args=['db-upgrade']).output)
+
+    def test_postgresql_schema(self):
+        """Test the schema renders for PostgreSQL without the SQLite-only search index."""
+        ddl = '\n'.join(schema_ddl('postgresql'))
+        self.assertIn('id SERIAL NOT NULL', ddl)
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                self.assertIn(f'CREATE INDEX {index.name} ON {table.name}', ddl)
+        self.assertIn('CREATE TABLE schema_version', ddl)
+        self.assertNotIn('fts5', ddl)
+        self.assertIn('fts5', '\n'.join(schema_ddl('sqlite')))
@@ -0,0 +1,70 @@
+"""Test module for the sampling profiler."""
+import os
+import pstats
+import shutil
+import tempfile
+from app import create_app
+from tests.base import BaseTestCase
+
+class TestProfiler(BaseTestCase):
+    """Test cases for the profiler middleware and admin endpoints."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.config_overrides = {
+            'PROFILER_ENABLED': True,
+            'PROFILER_DIR': self.tmp,
+            'PROFILER_SAMPLE_RATE': 1.0,
+            'PROFILER_MAX_FILES': 2,
+            'PROFILER_TOKEN': 'secret'
+        }
+        super().setUp()
+        self.headers = {'X-Admin-Token': 'secret'}
+
+    def test_capture_and_rotation(self):
+        """Test sampled requests are written as pstats files and rotated."""
+        self.client.get('/api/tasks/')
+        self.assertEqual(os.listdir(self.tmp), [])
+
+        response = self.client.post('/admin/profiler/start', headers=self.headers)
+        self.assertTrue(response.json['running'])
+        for _ in range(3):
+            response = self.client.get('/api/tasks/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json, [])
+        self.client.post('/admin/profiler/stop', headers=self.headers)
+
+        captures = self.client.get('/admin/profiler/', headers=self.headers).json['captures']
+        self.assertEqual(len(captures), 2)
+        self.assertTrue(all('GET-api_tasks' in name for name in captures))
+        stats = pstats.Stats(os.path.join(self.tmp, captures[0]))
+        self.assertGreater(stats.total_calls, 0)
+
+    def test_streamed_response_not_captured(self):
+        """Test sampled SSE and NDJSON responses stream through without capture."""
+        self.client.post('/admin/profiler/start', headers=self.headers)
+        response = self.client.get('/api/events/', buffered=False)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        response.close()
+        response = self.client.get('/api/tasks/', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(os.listdir(self.tmp), [])
+
+        self.client.get('/api/tasks/')
+        self.assertEqual(len(os.listdir(self.tmp)), 1)
+
+    def test_admin_requires_token(self):
+        """Test the admin endpoints are guarded."""
+        self.assertEqual(self.client.post('/admin/profiler/start').status_code, 403)
+        self.assertEqual(self.client.post('/admin/profiler/start', headers={'X-Admin-Token': 'guess'}).status_code, 403)
+        response = self.client.post('/admin/profiler/start', headers=self.headers, json={'sample_rate': 2})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/admin/profiler/start', headers=self.headers, json={'sample_rate': 0.5})
+        self.assertEqual(response.json['sample_rate'], 0.5)
+
+    def test_enabled_requires_token(self):
+        """Test the profiler refuses to start without an admin token."""
+        with self.assertRaises(ValueError):
+            create_app({**self.config_overrides, 'PROFILER_TOKEN': ''})
@@ -0,0 +1,74 @@
+"""Test module for read-replica routing."""
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from app.extensions import db
+from app.routing import READ_AFTER_COOKIE
+from tests.base import BaseTestCase
+
+class TestReplicaRouting(BaseTestCase):
+    """Test cases for reads from a SQLite file replica of a file primary."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.primary_path = os.path.join(self.tmp, 'primary.db')
+        self.replica_path = os.path.join(self.tmp, 'replica.db')
+        self.config_overrides = {
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + self.primary_path,
+            'SQLALCHEMY_BINDS': {'replica': 'sqlite:///' + self.replica_path},
+            'SQLITE_PROFILE': 'default'
+        }
+        super().setUp()
+        self.replicate()
+
+    def tearDown(self):
+        db.engines['replica'].dispose()
+        super().tearDown()
+
+    def replicate(self):
+        """Copy the primary onto the replica, standing in for replication."""
+        source = sqlite3.connect(self.primary_path)
+        target = sqlite3.connect(self.replica_path)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+
+    def _post(self, client, url, data):
+        return client.post(url, data=json.dumps(data), content_type='application/json')
+
+    def test_reads_use_replica(self):
+        """Test GETs see replica data until it catches up with the primary."""
+        writer = self.app.test_client()
+        self._post(writer, '/api/categories/', {'name': 'Work'})
+
+        reader = self.app.test_client()
+        self.assertEqual(reader.get('/api/categories/').json, [])
+        self.replicate()
+        self.assertEqual([c['name'] for c in reader.get('/api/categories/').json], ['Work'])
+
+    def test_read_your_writes(self):
+        """Test a client that wrote reads from the primary while the replica lags."""
+        writer = self.app.test_client()
+        response = self._post(writer, '/api/tasks/', {'title': 'Write report'})
+        task_id = response.json['id']
+        self.assertIn(READ_AFTER_COOKIE, response.headers['Set-Cookie'])
+
+        self.assertEqual(writer.get(f'/api/tasks/{task_id}').status_code, 200)
+        self.assertEqual(self.app.test_client().get(f'/api/tasks/{task_id}').status_code, 404)
+
+        self.replicate()
+        self.assertEqual(self.app.test_client().get(f'/api/tasks/{task_id}').status_code, 200)
+
+    def test_lagging_replica_not_cached_for_fresh_readers(self):
+        """Test stale replica responses are not served from cache once it catches up."""
+        self._post(self.app.test_client(), '/api/tasks/', {'title': 'Write report'})
+        reader = self.app.test_client()
+        self.assertEqual(reader.get('/api/tasks/').json, [])
+
+        self.replicate()
+        self.assertEqual(len(reader.get('/api/tasks/').json), 1)
@@ -0,0 +1,69 @@
+"""Test module for task search."""
+import json
+from unittest import mock
+from tests.base import BaseTestCase
+from app.extensions import db
+from app.search import fts_query, rebuild_search_index
+
+class TestSearch(BaseTestCase):
+    """Test cases for full-text task search."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        tasks = [
+            {'title': 'Buy milk', 'description': 'Semi-skimmed from the corner shop'},
+            {'title': 'Write report', 'description': 'Quarterly numbers, mention milk prices'},
+            {'title': 'Call plumber', 'description': 'Kitchen sink is leaking'}
+        ]
+        response = self.client.post('/api/tasks/bulk', data=json.dumps(tasks), content_type='application/json')
+        self.ids = [task['id'] for task in response.json]
+
+    def test_search_ranks_title_matches_first(self):
+        """Test results are ranked with title matches first."""
+        response = self.client.get('/api/tasks/search?q=milk')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t['title'] for t in response.json], ['Buy milk', 'Write report'])
+
+    def test_search_prefix_and_pagination(self):
+        """Test prefix matching and offset pagination."""
+        response = self.client.get('/api/tasks/search?q=mil&limit=1')
+        self.assertEqual(len(response.json), 1)
+        self.assertEqual(response.headers['X-Next-Offset'], '1')
+        response = self.client.get('/api/tasks/search?q=mil&limit=1&offset=1')
+        self.assertEqual(response.json[0]['title'], 'Write report')
+        self.assertNotIn('X-Next-Offset', response.headers)
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """Test the index is kept in sync with task writes."""
+        self.client.put(
+            f'/api/tasks/{self.ids[2]}',
+            data=json.dumps({'title': 'Call electrician'}),
+            content_type='application/json'
+        )
+        self.assertEqual(self.client.get('/api/tasks/search?q=plumber').json, [])
+        self.assertEqual(len(self.client.get('/api/tasks/search?q=electrician').json), 1)
+        self.client.delete(f'/api/tasks/{self.ids[0]}')
+        self.assertEqual([t['title'] for t in self.client.get('/api/tasks/search?q=milk').json], ['Write report'])
+
+    def test_search_requires_query(self):
+        """Test search without a query string."""
+        response = self.client.get('/api/tasks/search?q=')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['error'], 'Query is required')
+
+    def test_fts_query_escapes_syntax(self):
+        """Test user input is quoted rather than parsed as FTS syntax."""
+        self.assertEqual(fts_query('milk OR "x'), '"milk" "OR" """x"*')
+        self.assertEqual(self.client.get('/api/tasks/search?q=NEAR(").').status_code, 200)
+
+    def test_rebuild_search_index(self):
+        """Test rebuilding the index from the task table."""
+        rebuild_search_index()
+        self.assertEqual(len(self.client.get('/api/tasks/search?q=sink').json), 1)
+
+    def test_search_fallback_without_fts(self):
+        """Test the LIKE fallback used for non-SQLite databases."""
+        with mock.patch.object(db.engine.dialect, 'name', 'postgresql'):
+            response = self.client.get('/api/tasks/search?q=MILK')
+        self.assertEqual([t['title'] for t in response.json], ['Buy milk', 'Write report'])
@@ -0,0 +1,47 @@
+"""Test module for SQLite engine profiles."""
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+
+class TestSQLiteProfile(unittest.TestCase):
+    """Test cases for SQLite engine profiles."""
+
+    def setUp(self):
+        """Set up a temporary database directory."""
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.uri = 'sqlite:///' + os.path.join(self.tmp, 'test.db')
+
+    def _pragma(self, flask_app, name):
+        with flask_app.app_context():
+            value = db.session.execute(text(f'PRAGMA {name}')).scalar()
+            db.session.remove()
+            db.engine.dispose()
+            return value
+
+    def test_production_profile(self):
+        """Test the production profile enables WAL and tunes the pool."""
+        flask_app = create_app({'SQLALCHEMY_DATABASE_URI': self.uri, 'SQLITE_PROFILE': 'production'})
+        self.assertEqual(flask_app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'], 10)
+        self.assertEqual(self._pragma(flask_app, 'journal_mode'), 'wal')
+        self.assertEqual(self._pragma(flask_app, 'synchronous'), 1)
+        self.assertEqual(self._pragma(flask_app, 'busy_timeout'), 30000)
+
+    def test_default_profile_and_overrides(self):
+        """Test the default profile keeps SQLite defaults apart from explicit pragmas."""
+        flask_app = create_app({
+            'SQLALCHEMY_DATABASE_URI': self.uri,
+            'SQLITE_PROFILE': 'default',
+            'SQLITE_PRAGMAS': {'cache_size': -2048}
+        })
+        self.assertEqual(self._pragma(flask_app, 'journal_mode'), 'delete')
+        self.assertEqual(self._pragma(flask_app, 'cache_size'), -2048)
+
+    def test_unknown_profile(self):
+        """Test an unknown profile is rejected."""
+        with self.assertRaises(ValueError):
+            create_app({'SQLALCHEMY_DATABASE_URI': self.uri, 'SQLITE_PROFILE': 'fast'})
@@ -0,0 +1,48 @@
+"""Test module for statistics routes."""
+from datetime import datetime, timedelta
+from tests.base import BaseTestCase
+from app.models.category import Category
+from app.models.task import Task
+from app.extensions import db
+
+class TestStatsRoutes(BaseTestCase):
+    """Test cases for statistics routes."""
+
+    def test_get_stats_empty(self):
+        """Test statistics when no tasks exist."""
+        response = self.client.get('/api/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['total'], 0)
+        self.assertEqual(response.json['by_status'], {})
+        self.assertEqual(response.json['by_category'], [])
+        self.assertEqual(response.json['overdue'], 0)
+
+    def test_get_stats(self):
+        """Test statistics grouped by status, priority, category and due date."""
+        category = Category(name='Work')
+        db.session.add(category)
+        db.session.commit()
+        now = datetime.utcnow()
+        db.session.add_all([
+            Task(title='Overdue', due_date=now - timedelta(days=1), category_id=category.id),
+            Task(title='Soon', priority='high', due_date=now + timedelta(days=1), category_id=category.id),
+            Task(title='Later', due_date=now + timedelta(days=30)),
+            Task(title='Done', status='completed', due_date=now - timedelta(days=1))
+        ])
+        db.session.commit()
+
+        response = self.client.get('/api/stats/')
+        self.assertEqual(response.status_code, 200)
+        stats = response.json
+        self.assertEqual(stats['total'], 4)
+        self.assertEqual(stats['by_status'], {'pending': 3, 'completed': 1})
+        self.assertEqual(stats['by_priority'], {'medium': 3, 'high': 1})
+        self.assertEqual(stats['by_category'], [
+            {'category_id': category.id, 'count': 2},
+            {'category_id': None, 'count': 2}
+        ])
+        self.assertEqual(stats['overdue'], 1)
+        self.assertEqual(stats['due_soon'], 1)
+
+        response = self.client.get('/api/stats/?due_soon_days=60')
+        self.assertEqual(response.json['due_soon'], 2)
@@ -1,9 +1,11 @@
 """Test module for task routes."""
 import json
 from datetime import datetime, timedelta
+from sqlalchemy import event
 from tests.base import BaseTestCase
 from app.models.category import Category
-from app.extensions import db
+from app.models.task import Task
+from app.extensions import cache, db
 
 class TestTaskRoutes(BaseTestCase):
     """Test cases for task routes."""
@@ -149,3 +151,194 @@ class TestTaskRoutes(BaseTestCase):
         # Verify task is deleted
         get_response = self.client.get(f'/api/tasks/{task_id}')
         self.assertEqual(get_response.status_code, 404)
+
+    def _create_tasks(self, count, **fields):
+        """Insert tasks directly with increasing created_at values."""
+        start = datetime(2024, 1, 1)
+        for i in range(count):
+            db.session.add(Task(title=f'Task {i}', created_at=start + timedelta(minutes=i), **fields))
+        db.session.commit()
+        cache.invalidate('tasks')
+
+    def test_get_tasks_paginates_with_cursor(self):
+        """Test walking the task listing page by page."""
+        self._create_tasks(5)
+        response = self.client.get('/api/tasks/?limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t['title'] for t in response.json], ['Task 0', 'Task 1'])
+        cursor = response.headers['X-Next-Cursor']
+        self.assertIn('rel="next"', response.headers['Link'])
+
+        titles = []
+        while cursor:
+            response = self.client.get(f'/api/tasks/?limit=2&cursor={cursor}')
+            titles.extend(t['title'] for t in response.json)
+            cursor = response.headers.get('X-Next-Cursor')
+        self.assertEqual(titles, ['Task 2', 'Task 3', 'Task 4'])
+
+    def test_get_tasks_include_category_paginates(self):
+        """Test pages with embedded categories still return a cursor."""
+        self._create_tasks(3, category_id=self.category.id)
+        response = self.client.get('/api/tasks/?limit=2&include=category')
+        self.assertEqual(response.status_code, 200)
+        cursor = response.headers['X-Next-Cursor']
+        response = self.client.get(f'/api/tasks/?limit=2&include=category&cursor={cursor}')
+        self.assertEqual([t['title'] for t in response.json], ['Task 2'])
+
+    def test_get_tasks_filters(self):
+        """Test server-side filtering of the task listing."""
+        self._create_tasks(2, status='completed', category_id=self.category.id)
+        self._create_tasks(3, priority='high', due_date=datetime(2024, 6, 1))
+
+        response = self.client.get('/api/tasks/?status=completed')
+        self.assertEqual(len(response.json), 2)
+        response = self.client.get(f'/api/tasks/?category_id={self.category.id}')
+        self.assertEqual(len(response.json), 2)
+        response = self.client.get('/api/tasks/?priority=high&due_after=2024-05-01&due_before=2024-07-01')
+        self.assertEqual(len(response.json), 3)
+        response = self.client.get('/api/tasks/?due_before=2024-05-01')
+        self.assertEqual(response.json, [])
+
+    def test_get_tasks_invalid_cursor(self):
+        """Test task listing with a malformed cursor or filter."""
+        response = self.client.get('/api/tasks/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['error'], 'Invalid cursor')
+        response = self.client.get('/api/tasks/?due_after=tomorrow')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['error'], 'Invalid filter value')
+
+    def test_export_tasks_ndjson(self):
+        """Test streaming task export as NDJSON."""
+        self._create_tasks(3)
+        self._create_tasks(1, status='completed')
+        response = self.client.get('/api/tasks/export')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual(len(rows), 4)
+
+        response = self.client.get('/api/tasks/?status=completed',
+                                   headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(len(response.data.decode().splitlines()), 1)
+
+    def test_bulk_create_tasks(self):
+        """Test creating many tasks in one request."""
+        data = [
+            {'title': 'First', 'category_id': self.category.id},
+            {'title': 'Second', 'due_date': '2024-06-01T09:00:00'}
+        ]
+        response = self.client.post(
+            '/api/tasks/bulk',
+            data=json.dumps(data),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([t['title'] for t in response.json], ['First', 'Second'])
+        self.assertEqual(response.json[0]['category_id'], self.category.id)
+        self.assertEqual(response.json[1]['due_date'], '2024-06-01T09:00:00')
+        self.assertEqual(Task.query.count(), 2)
+
+    def test_bulk_create_tasks_reports_item_errors(self):
+        """Test bulk creation is rejected as a whole with per-item errors."""
+        data = [
+            {'title': 'Valid'},
+            {'description': 'No title'},
+            {'title': 'Bad category', 'category_id': 999},
+            {'title': 'Bad date', 'due_date': 'soon'}
+        ]
+        response = self.client.post(
+            '/api/tasks/bulk',
+            data=json.dumps(data),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['errors'], [
+            {'index': 1, 'error': 'Title is required'},
+            {'index': 2, 'error': 'Invalid category ID'},
+            {'index': 3, 'error': 'Invalid date format'}
+        ])
+        self.assertEqual(Task.query.count(), 0)
+
+    def test_bulk_update_and_delete_tasks(self):
+        """Test updating and deleting many tasks in one request each."""
+        self._create_tasks(3)
+        ids = [task.id for task in Task.query.order_by(Task.id)]
+
+        response = self.client.patch(
+            '/api/tasks/bulk',
+            data=json.dumps([{'id': ids[0], 'status': 'completed'}, {'id': ids[1], 'title': 'Renamed'}]),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json[0]['status'], 'completed')
+        self.assertEqual(response.json[1]['title'], 'Renamed')
+
+        response = self.client.patch(
+            '/api/tasks/bulk',
+            data=json.dumps([{'id': 999, 'status': 'completed'}]),
+            content_type='application/json'
+        )
+        self.assertEqual(response.json['errors'], [{'index': 0, 'error': 'Task not found'}])
+
+        # JSON booleans are not accepted as task ids
+        response = self.client.patch(
+            '/api/tasks/bulk',
+            data=json.dumps([{'id': True, 'status': 'completed'}]),
+            content_type='application/json'
+        )
+        self.assertEqual(response.json['errors'], [{'index': 0, 'error': 'Task ID is required'}])
+        response = self.client.delete('/api/tasks/bulk', data=json.dumps([True]), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIsNotNone(db.session.get(Task, ids[0]))
+
+        response = self.client.delete(
+            '/api/tasks/bulk',
+            data=json.dumps(ids[:2]),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual([task.id for task in Task.query], ids[2:])
+
+    def _count_queries(self, url):
+        """Return the response for ``url`` and the number of SQL statements it ran."""
+        db.session.expunge_all()
+        statements = []
+        def count_query(*_args):
+            statements.append(1)
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_query)
+        return response, len(statements)
+
+    def test_get_tasks_include_category_constant_queries(self):
+        """Test embedding categories costs a constant number of queries."""
+        other = Category(name='Other Category')
+        db.session.add(other)
+        db.session.commit()
+        category_ids = (self.category.id, other.id)
+        self._create_tasks(2, category_id=category_ids[0])
+        _, small_count = self._count_queries('/api/tasks/?include=category')
+
+        self._create_tasks(5, category_id=category_ids[0])
+        self._create_tasks(5, category_id=category_ids[1])
+        response, large_count = self._count_queries('/api/tasks/?include=category')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), 12)
+        self.assertEqual(response.json[0]['category']['name'], 'Test Category')
+        self.assertEqual(response.json[-1]['category']['name'], 'Other Category')
+        self.assertEqual(small_count, large_count)
+
+    def test_get_task_include_category(self):
+        """Test embedding the category of a single task."""
+        self._create_tasks(1, category_id=self.category.id)
+        task_id = Task.query.first().id
+        response = self.client.get(f'/api/tasks/{task_id}?include=category')
+        self.assertEqual(response.json['category']['id'], self.category.id)
+        response = self.client.get(f'/api/tasks/{task_id}?include=owner')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['error'], 'Invalid include')